@@ -0,0 +1,208 @@
+import json
+import os
+import time
+import numpy as np
+
+SNAPSHOT_DIR = "analytics_snapshot"
+
+# ---------------- EXPORT (row store -> columnar snapshot) ----------------
+# string columns are dictionary encoded: int32 codes (-1 = NULL) + vocabulary in meta.json
+def _encode(values):
+    vocab = sorted({v for v in values if v is not None})
+    index = {v: i for i, v in enumerate(vocab)}
+    codes = np.fromiter((index[v] if v is not None else -1 for v in values), dtype=np.int32, count=len(values))
+    return codes, vocab
+
+def _ints(values, null=-1, dtype=np.int64):
+    return np.fromiter((v if v is not None else null for v in values), dtype=dtype, count=len(values))
+
+def _floats(values):
+    return np.fromiter((v if v is not None else np.nan for v in values), dtype=np.float64, count=len(values))
+
+def export_snapshot(conn, out_dir=SNAPSHOT_DIR):
+    started = time.perf_counter()
+    cur = conn.cursor()
+    # one fact row per track, denormalized with its album and artist
+    tracks = cur.execute("""
+        SELECT t.track_id, t.duration_seconds, t.track_genre,
+               a.album_id, a.release_year, ar.artist_id, ar.name AS artist_name, ar.country
+        FROM Tracks t
+        LEFT JOIN Albums a ON t.album_id = a.album_id
+        LEFT JOIN Artists ar ON a.artist_id = ar.artist_id
+        ORDER BY t.track_id
+    """).fetchall()
+    moods = cur.execute("""
+        SELECT m.track_id, mo.name AS mood, ar.name AS artist_name
+        FROM TrackMoods m
+        JOIN Moods mo ON m.mood_ref = mo.mood_ref
+        JOIN Tracks t ON m.track_id = t.track_id
+        LEFT JOIN Albums a ON t.album_id = a.album_id
+        LEFT JOIN Artists ar ON a.artist_id = ar.artist_id
+        ORDER BY m.track_id
+    """).fetchall()
+
+    # artist names share one vocabulary across tables so codes are comparable
+    artist_codes, artist_vocab = _encode([r["artist_name"] for r in tracks] + [r["artist_name"] for r in moods])
+    genre_codes, genre_vocab = _encode([r["track_genre"] for r in tracks])
+    country_codes, country_vocab = _encode([r["country"] for r in tracks])
+    mood_codes, mood_vocab = _encode([r["mood"] for r in moods])
+
+    columns = {
+        "tracks": {
+            "track_id": _ints([r["track_id"] for r in tracks]),
+            "duration_seconds": _floats([r["duration_seconds"] for r in tracks]),
+            "album_id": _ints([r["album_id"] for r in tracks]),
+            "release_year": _ints([r["release_year"] for r in tracks], dtype=np.int32),
+            "artist_id": _ints([r["artist_id"] for r in tracks]),
+            "artist": artist_codes[:len(tracks)],
+            "genre": genre_codes,
+            "country": country_codes,
+        },
+        "moods": {
+            "track_id": _ints([r["track_id"] for r in moods]),
+            "artist": artist_codes[len(tracks):],
+            "mood": mood_codes,
+        },
+    }
+
+    os.makedirs(out_dir, exist_ok=True)
+    for table, cols in columns.items():
+        for name, arr in cols.items():
+            np.save(os.path.join(out_dir, f"{table}.{name}.npy"), arr)
+
+    meta = {
+        "created_at": time.time(),
+        "export_seconds": time.perf_counter() - started,
+        "rows": {table: len(next(iter(cols.values()))) for table, cols in columns.items()},
+        "columns": {table: list(cols) for table, cols in columns.items()},
+        "vocab": {"artist": artist_vocab, "genre": genre_vocab, "country": country_vocab, "mood": mood_vocab},
+    }
+    # meta.json is written last, so a half-written snapshot is never picked up
+    tmp = os.path.join(out_dir, "meta.json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp, os.path.join(out_dir, "meta.json"))
+    return meta
+
+# ---------------- LOAD ----------------
+class Snapshot:
+    def __init__(self, path=SNAPSHOT_DIR, mmap=True):
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        mode = "r" if mmap else None
+        self.tables = {
+            table: {name: np.load(os.path.join(path, f"{table}.{name}.npy"), mmap_mode=mode) for name in cols}
+            for table, cols in self.meta["columns"].items()
+        }
+
+    def __getitem__(self, table):
+        return self.tables[table]
+
+    def decode(self, column, codes):
+        # dictionary-encoded columns map back to strings, everything else is returned as python values
+        vocab = self.meta["vocab"].get(column)
+        if vocab is None:
+            return [None if v == -1 else v for v in codes.tolist()]
+        return [vocab[c] if c >= 0 else None for c in codes.tolist()]
+
+def snapshot_exists(path=SNAPSHOT_DIR):
+    return os.path.exists(os.path.join(path, "meta.json"))
+
+# ---------------- VECTORIZED QUERY ----------------
+def where(table, **equals):
+    # AND of equality filters, e.g. where(snap["tracks"], release_year=1998)
+    mask = np.ones(len(next(iter(table.values()))), dtype=bool)
+    for col, value in equals.items():
+        mask &= np.asarray(table[col]) == value
+    return mask
+
+def group_by(snap, table, keys, value=None, agg="count", mask=None):
+    cols = snap[table]
+    n = len(cols[keys[0]])
+    mask = np.ones(n, dtype=bool) if mask is None else mask
+    if value is not None and agg != "count":
+        # NULL measures are skipped the same way SQL aggregates skip them
+        vals = np.asarray(cols[value], dtype=np.float64)
+        mask = mask & ~np.isnan(vals)
+        vals = vals[mask]
+
+    # factorize each key, then fold them into one mixed-radix group id
+    uniques, combined = [], np.zeros(int(mask.sum()), dtype=np.int64)
+    for k in keys:
+        uniq, inv = np.unique(np.asarray(cols[k])[mask], return_inverse=True)
+        uniques.append(uniq)
+        combined = combined * len(uniq) + inv
+    groups, gidx = np.unique(combined, return_inverse=True)
+
+    counts = np.bincount(gidx, minlength=len(groups))
+    if agg == "count":
+        result = counts
+    elif agg == "sum":
+        result = np.bincount(gidx, weights=vals, minlength=len(groups))
+    elif agg == "avg":
+        result = np.bincount(gidx, weights=vals, minlength=len(groups)) / counts
+    elif agg in ("min", "max"):
+        fill = np.inf if agg == "min" else -np.inf
+        result = np.full(len(groups), fill)
+        (np.minimum if agg == "min" else np.maximum).at(result, gidx, vals)
+    else:
+        raise ValueError(f"Unknown aggregate: {agg}")
+
+    # unfold group ids back into per-key codes
+    out = {}
+    rem = groups
+    for k, uniq in reversed(list(zip(keys, uniques))):
+        out[k] = snap.decode(k, uniq[rem % len(uniq)])
+        rem = rem // len(uniq)
+    label = agg if value is None or agg == "count" else f"{agg}_{value}"
+    return [dict({k: out[k][i] for k in keys}, **{label: result[i].item()}) for i in range(len(groups))]
+
+# ---------------- CATALOG REPORTS ----------------
+def avg_duration_by_artist_year(snap):
+    return group_by(snap, "tracks", ["artist", "release_year"], value="duration_seconds", agg="avg")
+
+def track_count_by_genre_country(snap):
+    return group_by(snap, "tracks", ["genre", "country"])
+
+def mood_distribution_by_artist(snap, artist=None):
+    mask = None
+    if artist is not None:
+        vocab = snap.meta["vocab"]["artist"]
+        if artist not in vocab:
+            return []
+        mask = where(snap["moods"], artist=vocab.index(artist))
+    return group_by(snap, "moods", ["artist", "mood"], mask=mask)
+
+# equivalent SQL, used by the benchmark and as a cross-check
+SQL_REPORTS = {
+    "avg_duration_by_artist_year": """
+        SELECT ar.name AS artist, a.release_year, AVG(t.duration_seconds) AS avg_duration_seconds
+        FROM Tracks t
+        LEFT JOIN Albums a ON t.album_id = a.album_id
+        LEFT JOIN Artists ar ON a.artist_id = ar.artist_id
+        WHERE t.duration_seconds IS NOT NULL
+        GROUP BY ar.name, a.release_year
+    """,
+    "track_count_by_genre_country": """
+        SELECT t.track_genre AS genre, ar.country, COUNT(*) AS count
+        FROM Tracks t
+        LEFT JOIN Albums a ON t.album_id = a.album_id
+        LEFT JOIN Artists ar ON a.artist_id = ar.artist_id
+        GROUP BY t.track_genre, ar.country
+    """,
+    "mood_distribution_by_artist": """
+        SELECT ar.name AS artist, mo.name AS mood, COUNT(*) AS count
+        FROM TrackMoods m
+        JOIN Moods mo ON m.mood_ref = mo.mood_ref
+        JOIN Tracks t ON m.track_id = t.track_id
+        LEFT JOIN Albums a ON t.album_id = a.album_id
+        LEFT JOIN Artists ar ON a.artist_id = ar.artist_id
+        GROUP BY ar.name, mo.name
+    """,
+}
+
+REPORTS = {
+    "avg_duration_by_artist_year": avg_duration_by_artist_year,
+    "track_count_by_genre_country": track_count_by_genre_country,
+    "mood_distribution_by_artist": mood_distribution_by_artist,
+}
@@ -0,0 +1,52 @@
+import os
+import random
+import sqlite3
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CODES_DIR = os.path.dirname(HERE)
+sys.path.insert(0, CODES_DIR)
+
+import db  # noqa: E402
+
+GENRES = ["Pop", "Rock", "Trip Hop", "Psychedelic", "R&B", "Industrial Metal", "Jazz", "Folk"]
+COUNTRIES = ["Turkey", "Germany", "USA", "UK", "Israel", "France", "Brazil", "Japan"]
+MOODS = ["Dark", "Hypnotic", "Aggressive", "Energetic", "Melancholic", "Nostalgic", "Trippy", "Calm"]
+
+# ---------------- SYNTHETIC CATALOG ----------------
+def build_catalog(path, n_tracks, n_artists=None, tracks_per_album=10, moods_per_track=2, seed=42):
+    rnd = random.Random(seed)
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    db.create_schema(conn)
+    n_albums = max(1, n_tracks // tracks_per_album)
+    n_artists = n_artists or max(1, n_albums // 5)
+    cur = conn.cursor()
+    cur.executemany("INSERT INTO Artists (artist_id, name, country, genre) VALUES (?, ?, ?, ?)",
+                    ((i, f"Artist {i}", rnd.choice(COUNTRIES), rnd.choice(GENRES)) for i in range(1, n_artists + 1)))
+    cur.executemany("INSERT INTO Albums (album_id, title, artist_id, release_year) VALUES (?, ?, ?, ?)",
+                    ((i, f"Album {i}", rnd.randint(1, n_artists), rnd.randint(1960, 2025)) for i in range(1, n_albums + 1)))
+    cur.executemany("INSERT INTO Tracks (track_id, track_title, duration_seconds, album_id, track_genre) VALUES (?, ?, ?, ?, ?)",
+                    ((i, f"Track {i}", rnd.randint(60, 600), rnd.randint(1, n_albums), rnd.choice(GENRES)) for i in range(1, n_tracks + 1)))
+    cur.executemany("INSERT INTO Moods (mood_ref, name, name_norm) VALUES (?, ?, ?)",
+                    ((i, m, m.lower()) for i, m in enumerate(MOODS, 1)))
+    cur.executemany("INSERT INTO TrackMoods (track_id, mood_ref) VALUES (?, ?)",
+                    ((t, m) for t in range(1, n_tracks + 1) for m in rnd.sample(range(1, len(MOODS) + 1), moods_per_track)))
+    conn.commit()
+    return conn
+
+def add_users(conn, n_users, premium_share=0.3, seed=42):
+    # users split between Premium (renewals spread over a year) and Free
+    rnd = random.Random(seed)
+    cur = conn.cursor()
+    cur.executemany("INSERT INTO Users (user_id, f_name, l_name, email) VALUES (?, ?, ?, ?)",
+                    ((i, f"User{i}", f"Last{i}", f"user{i}@example.com") for i in range(1, n_users + 1)))
+    premium = [i for i in range(1, n_users + 1) if rnd.random() < premium_share]
+    premium_set = set(premium)
+    cur.executemany("INSERT INTO Premium (user_id, renewal_date, renewal_due, payment_method) VALUES (?, ?, ?, ?)",
+                    ((i, d, d, "Credit Card") for i in premium for d in [f"2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}"]))
+    cur.executemany("INSERT INTO Free (user_id, ad_frequency, listening_limit) VALUES (?, ?, ?)",
+                    ((i, 5, 100) for i in range(1, n_users + 1) if i not in premium_set))
+    conn.commit()
@@ -0,0 +1,35 @@
+# Compare columnar snapshot group-by against the equivalent SQL aggregates.
+# usage: python benchmarks/bench_analytics.py [n_tracks ...]
+import os
+import sys
+import tempfile
+import time
+
+from _synth import build_catalog
+import analytics
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(sizes):
+    print(f"{'tracks':>10} {'report':<32} {'sql ms':>10} {'numpy ms':>10} {'speedup':>8}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            conn = build_catalog(os.path.join(tmp, "bench.db"), n)
+            snap_dir = os.path.join(tmp, "snapshot")
+            export = timed(lambda: analytics.export_snapshot(conn, snap_dir), repeat=1)
+            snap = analytics.Snapshot(snap_dir)
+            for name, sql in analytics.SQL_REPORTS.items():
+                t_sql = timed(lambda: conn.execute(sql).fetchall())
+                t_np = timed(lambda: analytics.REPORTS[name](snap))
+                print(f"{n:>10} {name:<32} {t_sql * 1e3:>10.2f} {t_np * 1e3:>10.2f} {t_sql / t_np:>7.1f}x")
+            print(f"{n:>10} {'(snapshot export)':<32} {export * 1e3:>10.2f}")
+            conn.close()
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
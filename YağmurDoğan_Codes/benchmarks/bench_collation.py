@@ -0,0 +1,71 @@
+# Sorting 100k Turkish track titles: a Python collation callback (the obvious fix) against
+# the indexed title_key column, for a full ORDER BY, the first page of a picker and a deep
+# keyset page. Byte order (the old, wrong ORDER BY track_title) is shown for reference.
+# usage: python benchmarks/bench_collation.py [tracks]
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from _synth import build_catalog
+
+import collation
+
+WORDS = ["sen", "ağlama", "sarı", "şarkı", "gül", "ırmak", "İstanbul", "çiçek", "öğle", "üzüm", "Doğan", "kış",
+         "yağmur", "göz", "Çanakkale", "Ödül", "ışık", "şeker", "Ilgaz", "deniz", "aşk", "gece", "Ümit", "Sıla"]
+
+def measure(conn, sql, params=(), repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = conn.execute(sql, params).fetchall()
+        times.append(time.perf_counter() - start)
+    return sorted(times)[len(times) // 2], rows
+
+def main(n_tracks=100_000):
+    workdir = tempfile.mkdtemp(prefix="bench_collation_")
+    conn = build_catalog(os.path.join(workdir, "catalog.db"), n_tracks)
+    rnd = random.Random(3)
+    conn.executemany("UPDATE Tracks SET track_title=? WHERE track_id=?",
+                     ((" ".join(rnd.choice(WORDS) for _ in range(rnd.randint(1, 4))).capitalize(), i)
+                      for i in range(1, n_tracks + 1)))
+    conn.commit()
+    start = time.perf_counter()
+    collation.backfill(conn, rebuild=True)
+    print(f"{n_tracks} tracks, locale '{collation.LOCALE}': keys built in {time.perf_counter() - start:.2f}s")
+
+    calls = [0]
+    def callback(a, b):
+        calls[0] += 1
+        ka, kb = collation.sort_key(a), collation.sort_key(b)
+        return (ka > kb) - (ka < kb)
+    conn.create_collation("locale", callback)
+
+    rows = conn.execute("SELECT title_key, track_id FROM Tracks ORDER BY title_key, track_id LIMIT 1 OFFSET ?", (n_tracks // 2,)).fetchone()
+    middle = (rows[0], rows[1])
+    cases = [
+        ("full sort, byte order (wrong)", "SELECT track_title FROM Tracks ORDER BY track_title", ()),
+        ("full sort, collation callback", "SELECT track_title FROM Tracks ORDER BY track_title COLLATE locale", ()),
+        ("full sort, title_key index", "SELECT track_title FROM Tracks ORDER BY title_key, track_id", ()),
+        ("first 50, collation callback", "SELECT track_title FROM Tracks ORDER BY track_title COLLATE locale LIMIT 50", ()),
+        ("first 50, title_key index", "SELECT track_title FROM Tracks ORDER BY title_key, track_id LIMIT 50", ()),
+        ("page at 50%, OFFSET + callback", "SELECT track_title FROM Tracks ORDER BY track_title COLLATE locale LIMIT 50 OFFSET ?", (n_tracks // 2,)),
+        ("page at 50%, keyset on title_key", "SELECT track_title FROM Tracks WHERE (title_key, track_id) > (?, ?) ORDER BY title_key, track_id LIMIT 50", middle),
+    ]
+    print(f"{'query':<36} {'ms':>10} {'callbacks':>10}")
+    results = {}
+    for name, sql, params in cases:
+        calls[0] = 0
+        repeat = 1 if "callback" in name else 3   # a full callback sort takes tens of seconds
+        t, rows = measure(conn, sql, params, repeat)
+        results[name] = [r[0] for r in rows]
+        print(f"{name:<36} {t * 1e3:>10.2f} {calls[0] // repeat:>10}")
+    same = results["full sort, collation callback"] == results["full sort, title_key index"]
+    print(f"callback and title_key orders agree: {same}")
+    conn.close()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
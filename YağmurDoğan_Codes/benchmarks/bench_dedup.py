@@ -0,0 +1,52 @@
+# Build the fuzzy name index over N synthetic artist names and time duplicate lookups.
+# usage: python benchmarks/bench_dedup.py [n_names ...]
+import random
+import sys
+import time
+
+import _synth  # noqa: F401  (puts the code directory on sys.path)
+import dedup
+
+CONSONANTS = "bcdfghjklmnprstvyzçğş"
+VOWELS = "aeiouıöü"
+SYLLABLES = [c + v for c in CONSONANTS for v in VOWELS] + [v + c for c in CONSONANTS for v in VOWELS]
+
+def random_name(rnd):
+    words = [("".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 4)))).title() for _ in range(rnd.randint(1, 3))]
+    return " ".join(words)
+
+def perturb(rnd, name):
+    # typical near-duplicates: case, doubled spaces, one dropped letter
+    choice = rnd.randint(0, 2)
+    if choice == 0:
+        return name.lower()
+    if choice == 1:
+        return name.replace(" ", "  ")
+    i = rnd.randrange(len(name))
+    return name[:i] + name[i + 1:]
+
+def main(sizes, queries=2000):
+    rnd = random.Random(7)
+    print(f"{'names':>10} {'build s':>9} {'p50 us':>9} {'p99 us':>9} {'hit rate':>9}")
+    for n in sizes:
+        names = [random_name(rnd) for _ in range(n)]
+        start = time.perf_counter()
+        index = dedup.NameIndex()
+        index.add_many((i, name, None) for i, name in enumerate(names))
+        build = time.perf_counter() - start
+
+        latencies, hits = [], 0
+        for _ in range(queries):
+            i = rnd.randrange(n)
+            q = perturb(rnd, names[i])
+            start = time.perf_counter()
+            matches = index.similar(q)
+            latencies.append(time.perf_counter() - start)
+            hits += any(m["id"] == i for m in matches)
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2] * 1e6
+        p99 = latencies[int(len(latencies) * 0.99)] * 1e6
+        print(f"{n:>10} {build:>9.2f} {p50:>9.1f} {p99:>9.1f} {hits / queries:>9.1%}")
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
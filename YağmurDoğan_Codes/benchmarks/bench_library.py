@@ -0,0 +1,93 @@
+# Loading a user's whole library: get_playlists_for_user() plus get_tracks_in_playlist()
+# per playlist (before, N+1 connections and joins) against one library.get_library()
+# query (after), with and without a per-playlist track limit, for growing playlist
+# counts; then the same for a batch of users fetched together.
+# usage: python benchmarks/bench_library.py [tracks_per_playlist]
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from _synth import build_catalog
+
+import db
+import library
+
+PLAYLIST_COUNTS = [1, 10, 30, 100, 300, 1000]
+BATCH_USERS = 50          # users of the multi-user case, 20 playlists each
+N_TRACKS = 100_000
+
+def build(path, tracks_per_playlist):
+    conn = build_catalog(path, N_TRACKS)
+    rnd = random.Random(11)
+    users = [(uid, n) for uid, n in enumerate(PLAYLIST_COUNTS, 1)]
+    users += [(len(PLAYLIST_COUNTS) + i, 20) for i in range(1, BATCH_USERS + 1)]
+    conn.executemany("INSERT INTO Users (user_id, f_name) VALUES (?, ?)", ((uid, f"User{uid}") for uid, _ in users))
+    playlist_id = 0
+    for uid, n in users:
+        for _ in range(n):
+            playlist_id += 1
+            conn.execute("INSERT INTO Playlists (playlist_id, playlist_title, user_id) VALUES (?, ?, ?)",
+                         (playlist_id, f"Playlist {playlist_id}", uid))
+            conn.executemany("INSERT INTO PlaylistTracks (playlist_id, track_id, position) VALUES (?, ?, ?)",
+                             ((playlist_id, t, i + 1) for i, t in enumerate(rnd.sample(range(1, N_TRACKS + 1), tracks_per_playlist))))
+    conn.commit()
+    conn.close()
+    return [uid for uid, _ in users[len(PLAYLIST_COUNTS):]]
+
+def before(user_ids):
+    out = []
+    for uid in user_ids:
+        for p in db.get_playlists_for_user(uid):
+            out.append((p["playlist_id"], len(db.get_tracks_in_playlist(p["playlist_id"]))))
+    return out
+
+def after(user_ids, limit=None):
+    return [(p["playlist_id"], len(p["tracks"])) for p in library.get_library(user_ids, track_limit=limit)]
+
+def measure(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return sorted(times)[len(times) // 2], result
+
+def first_playlist(user_ids):
+    # time until the first playlist is ready to draw
+    start = time.perf_counter()
+    stream = library.get_library(user_ids)
+    next(stream)
+    t = time.perf_counter() - start
+    stream.close()
+    return t
+
+def main(tracks_per_playlist=25):
+    workdir = tempfile.mkdtemp(prefix="bench_library_")
+    path = os.path.join(workdir, "catalog.db")
+    batch = build(path, tracks_per_playlist)
+    db.DB_PATH = path
+    db.init_db()
+    print(f"{N_TRACKS} tracks, {tracks_per_playlist} tracks per playlist")
+
+    print(f"{'playlists':>9} {'before ms':>10} {'after ms':>9} {'speedup':>8} {'limit 10 ms':>12} {'first ms':>9}")
+    for uid, n in enumerate(PLAYLIST_COUNTS, 1):
+        repeat = 3 if n >= 300 else 7
+        t_before, expected = measure(lambda: before([uid]), repeat)
+        t_after, got = measure(lambda: after([uid]), repeat)
+        assert got == expected
+        t_limit, _ = measure(lambda: after([uid], 10), repeat)
+        print(f"{n:>9} {t_before * 1e3:>10.1f} {t_after * 1e3:>9.1f} {t_before / t_after:>7.1f}x "
+              f"{t_limit * 1e3:>12.1f} {first_playlist([uid]) * 1e3:>9.2f}")
+
+    t_before, expected = measure(lambda: before(batch), 3)
+    t_after, got = measure(lambda: after(batch), 3)
+    assert got == expected
+    print(f"{BATCH_USERS} users x 20 playlists: before {t_before * 1e3:.0f} ms, one get_library call "
+          f"{t_after * 1e3:.0f} ms ({t_before / t_after:.1f}x)")
+    shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 25)
@@ -0,0 +1,81 @@
+# Boolean mood filters over a large catalog: one SQL self-join/EXISTS query per filter
+# (before) against the in-memory bitmap index (after), plus the index's build time, size
+# and the cost of keeping it current on add_track_mood/delete_track_mood.
+# usage: python benchmarks/bench_moods.py [tracks]
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from _synth import build_catalog
+
+import moodindex
+
+QUERIES = {
+    "Dark": ("SELECT m.track_id FROM TrackMoods m WHERE m.mood_ref = 1", ),
+    "Dark AND Hypnotic": ("""
+        SELECT a.track_id FROM TrackMoods a JOIN TrackMoods b ON a.track_id = b.track_id
+        WHERE a.mood_ref = 1 AND b.mood_ref = 2
+    """, ),
+    "Dark AND Hypnotic NOT Aggressive": ("""
+        SELECT a.track_id FROM TrackMoods a JOIN TrackMoods b ON a.track_id = b.track_id
+        WHERE a.mood_ref = 1 AND b.mood_ref = 2
+        AND NOT EXISTS (SELECT 1 FROM TrackMoods c WHERE c.track_id = a.track_id AND c.mood_ref = 3)
+    """, ),
+    "(Dark OR Trippy) AND NOT Calm": ("""
+        SELECT DISTINCT m.track_id FROM TrackMoods m WHERE m.mood_ref IN (1, 7)
+        AND NOT EXISTS (SELECT 1 FROM TrackMoods c WHERE c.track_id = m.track_id AND c.mood_ref = 8)
+    """, ),
+    "NOT Dark": ("""
+        SELECT t.track_id FROM Tracks t
+        WHERE NOT EXISTS (SELECT 1 FROM TrackMoods c WHERE c.track_id = t.track_id AND c.mood_ref = 1)
+    """, ),
+}
+
+def median(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return sorted(times)[len(times) // 2], result
+
+def main(n_tracks=2_000_000):
+    workdir = tempfile.mkdtemp(prefix="bench_moods_")
+    start = time.perf_counter()
+    conn = build_catalog(os.path.join(workdir, "catalog.db"), n_tracks, moods_per_track=3)
+    # MOODS in _synth are interned in order: 1 Dark, 2 Hypnotic, 3 Aggressive, 7 Trippy, 8 Calm
+    conn.execute("ANALYZE")
+    rows = conn.execute("SELECT COUNT(*) FROM TrackMoods").fetchone()[0]
+    print(f"{n_tracks} tracks, {rows} TrackMoods rows (built in {time.perf_counter() - start:.0f}s)")
+
+    start = time.perf_counter()
+    index = moodindex.get_index(conn)
+    print(f"index built in {time.perf_counter() - start:.2f}s, {index.nbytes() / 2**20:.1f} MB "
+          f"(TrackMoods as (mood, track) int64 pairs would be {rows * 16 / 2**20:.1f} MB)")
+
+    print(f"{'query':<34} {'matches':>9} {'SQL ms':>9} {'bitmap ms':>10} {'+ ids ms':>9}")
+    for text, (sql,) in QUERIES.items():
+        t_sql, found = median(lambda: conn.execute(sql).fetchall(), 3)
+        t_bitmap, bitmap = median(lambda: index.query(text), 21)
+        t_ids, ids = median(lambda: index.query(text).to_array(), 21)
+        assert sorted(r[0] for r in found) == ids.tolist(), text
+        print(f"{text:<34} {len(ids):>9} {t_sql * 1e3:>9.1f} {t_bitmap * 1e3:>10.2f} {t_ids * 1e3:>9.2f}")
+
+    # index upkeep on writes, as add_track_mood / delete_track_mood do it
+    ops = 10_000
+    start = time.perf_counter()
+    for t in range(1, ops + 1):
+        index.add(t * 97 % n_tracks + 1, 5)
+    add = (time.perf_counter() - start) / ops
+    start = time.perf_counter()
+    for t in range(1, ops + 1):
+        index.remove(t * 97 % n_tracks + 1, 5)
+    remove = (time.perf_counter() - start) / ops
+    print(f"index upkeep: add {add * 1e6:.1f} us, remove {remove * 1e6:.1f} us per mood assignment")
+    conn.close()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000)
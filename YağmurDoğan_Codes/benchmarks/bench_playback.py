@@ -0,0 +1,108 @@
+# Time and memory to the first track of a playlist: get_tracks_in_playlist()[0] (before)
+# against PlaybackQueue(...).current() in order and shuffled (after), for growing
+# playlists, plus the latency of skipping to the next track once prefetch has run and
+# of seeking to a random ordinal once the first one has collected the anchors.
+# usage: python benchmarks/bench_playback.py
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from _synth import build_catalog
+
+import db
+from playback import PlaybackQueue
+
+SIZES = [100, 1_000, 10_000, 100_000]
+
+def build(path):
+    conn = build_catalog(path, max(SIZES))
+    rnd = random.Random(7)
+    conn.execute("INSERT INTO Users (user_id, f_name) VALUES (1, 'Bench')")
+    for playlist_id, size in enumerate(SIZES, 1):
+        conn.execute("INSERT INTO Playlists (playlist_id, playlist_title, user_id) VALUES (?, ?, 1)", (playlist_id, f"{size} tracks"))
+        tracks = rnd.sample(range(1, max(SIZES) + 1), size)
+        conn.executemany("INSERT INTO PlaylistTracks (playlist_id, track_id, position) VALUES (?, ?, ?)",
+                         ((playlist_id, t, i + 1) for i, t in enumerate(tracks)))
+    conn.commit()
+    conn.close()
+
+def before(playlist_id):
+    return db.get_tracks_in_playlist(playlist_id)[0], None
+
+def after(playlist_id, shuffle=False):
+    q = PlaybackQueue(playlist_id, shuffle=shuffle, seed=1)
+    return q.current(), q
+
+CASES = {
+    "before": before,
+    "queue": after,
+    "queue shuffle": lambda p: after(p, shuffle=True),
+}
+
+def measure(fn, playlist_id, repeat=5):
+    # the queue is closed outside the timed part: closing waits for the prefetch thread
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _, q = fn(playlist_id)
+        times.append(time.perf_counter() - start)
+        if q:
+            q.close()
+    tracemalloc.start()
+    _, q = fn(playlist_id)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    if q:
+        q.close()
+    return sorted(times)[len(times) // 2], peak
+
+def skip_latency(playlist_id, shuffle, skips=200):
+    times = []
+    with PlaybackQueue(playlist_id, shuffle=shuffle, seed=1) as q:
+        for _ in range(skips):
+            q.upcoming()   # let the prefetch for this position finish, like a playing track would
+            start = time.perf_counter()
+            q.skip(1)
+            times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2], times[int(len(times) * 0.95)]
+
+def seek_latency(playlist_id, size, seeks=200):
+    rnd = random.Random(3)
+    times = []
+    with PlaybackQueue(playlist_id, seed=1, prefetch=0) as q:
+        q.seek(size - 1)
+        for _ in range(seeks):
+            i = rnd.randrange(size)
+            start = time.perf_counter()
+            q.seek(i)
+            times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2]
+
+def main():
+    workdir = tempfile.mkdtemp(prefix="bench_playback_")
+    path = os.path.join(workdir, "catalog.db")
+    build(path)
+    db.DB_PATH = path
+    db.init_db()
+
+    print(f"{'tracks':>8} {'case':<14} {'first track ms':>15} {'peak KB':>9} {'skip p50 ms':>12} {'skip p95 ms':>12} {'seek p50 ms':>12}")
+    for playlist_id, size in enumerate(SIZES, 1):
+        for case, fn in CASES.items():
+            t, peak = measure(fn, playlist_id)
+            skip = ""
+            if case != "before":
+                p50, p95 = skip_latency(playlist_id, case.endswith("shuffle"))
+                skip = f"{p50 * 1e3:>12.3f} {p95 * 1e3:>12.3f}"
+                if case == "queue":
+                    skip += f" {seek_latency(playlist_id, size) * 1e3:>12.3f}"
+            print(f"{size:>8} {case:<14} {t * 1e3:>15.2f} {peak / 1024:>9.0f} {skip}")
+    shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+# Per-interaction (rerun) latency of the Streamlit app, before and after the page split.
+# "before" re-creates what the single-file script did on every rerun: run init_db()
+# and compile every page's code, then render the selected one.
+# usage: python benchmarks/bench_rerun.py [reruns]
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from _synth import CODES_DIR
+from streamlit.testing.v1 import AppTest
+
+APP = os.path.join(CODES_DIR, "YağmurDoğan_Code.py")
+
+LEGACY = f"""
+import importlib, inspect, sys
+sys.path.insert(0, {CODES_DIR!r})
+import streamlit as st
+import db
+from views import PAGES
+
+st.set_page_config(page_title="Music Streaming CMS (Full CRUD)", layout="wide")
+st.title("🎵 Music Streaming Content Management — FULL CRUD")
+db.init_db()
+for name in PAGES.values():
+    compile(inspect.getsource(importlib.import_module(name)), name, "exec")
+menu = st.sidebar.selectbox("Menu", list(PAGES))
+importlib.import_module(PAGES[menu]).render()
+"""
+
+def measure(make_app, page, reruns):
+    start = time.perf_counter()
+    at = make_app().run()
+    first = time.perf_counter() - start
+    at.sidebar.selectbox[0].select(page).run()
+    times = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+    assert not at.exception, at.exception
+    times.sort()
+    return first, times[len(times) // 2]
+
+def main(reruns=20):
+    from views import PAGES
+    workdir = tempfile.mkdtemp(prefix="bench_rerun_")
+    shutil.copy(os.path.join(CODES_DIR, "music_streaming.db"), workdir)
+    os.chdir(workdir)
+    apps = {
+        "before": lambda: AppTest.from_string(LEGACY, default_timeout=60),
+        "after": lambda: AppTest.from_file(APP, default_timeout=60),
+    }
+    print(f"{'page':<30} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    for page in PAGES:
+        result = {name: measure(make, page, reruns) for name, make in apps.items()}
+        b, a = result["before"][1] * 1e3, result["after"][1] * 1e3
+        print(f"{page:<30} {b:>10.2f} {a:>10.2f} {b / a:>7.2f}x")
+    os.chdir(CODES_DIR)
+    shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
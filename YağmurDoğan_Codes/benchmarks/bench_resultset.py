@@ -0,0 +1,120 @@
+# Listing pages on a 100k-row catalog: sqlite3.Row -> dict -> st.table (before) against
+# ResultSet -> Arrow -> st.dataframe (after).
+# "payload" is the fetch plus the Arrow IPC bytes Streamlit builds for the browser;
+# "render" runs the element inside a Streamlit script with AppTest.
+# Peak memory is measured in a fresh process per case: tracemalloc for Python objects
+# plus Arrow's memory pool for column buffers.
+# usage: python benchmarks/bench_resultset.py [tracks]
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from _synth import CODES_DIR, build_catalog
+import pyarrow as pa
+from streamlit import dataframe_util
+from streamlit.testing.v1 import AppTest
+
+import db
+from resultset import ResultSet
+
+QUERIES = {
+    "Tracks": "SELECT * FROM Tracks",
+    "JOIN": """
+        SELECT t.track_id, t.track_title, t.duration_seconds, t.track_genre,
+               a.album_id, a.title AS album_title, ar.artist_id, ar.name AS artist_name
+        FROM Tracks t
+        LEFT JOIN Albums a ON t.album_id = a.album_id
+        LEFT JOIN Artists ar ON a.artist_id = ar.artist_id
+        ORDER BY ar.name, a.release_year
+    """,
+}
+
+RENDER = f"""
+import sys
+sys.path.insert(0, {CODES_DIR!r})
+import streamlit as st
+import db
+db.DB_PATH = {{path!r}}
+if {{columnar}}:
+    st.dataframe(db.fetch_all("Tracks", columnar=True).to_frame(), hide_index=True)
+else:
+    st.table([dict(r) for r in db.fetch_all("Tracks")])
+"""
+
+def before(conn, sql):
+    rows = conn.execute(sql).fetchall()
+    return dataframe_util.convert_anything_to_arrow_bytes([dict(r) for r in rows])
+
+def after(conn, sql):
+    rs = ResultSet.from_cursor(conn.execute(sql))
+    return dataframe_util.convert_anything_to_arrow_bytes(rs.to_frame())
+
+CASES = {"before": before, "after": after}
+
+def _connect(path):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def _peak(path, case, query):
+    conn = _connect(path)
+    pool = pa.default_memory_pool()
+    arrow_start = pool.bytes_allocated()
+    tracemalloc.start()
+    CASES[case](conn, QUERIES[query])
+    py_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    conn.close()
+    return py_peak, pool.max_memory() - arrow_start
+
+def peak_memory(path, case, query):
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        return pool.apply(_peak, (path, case, query))
+
+def payload_time(path, case, query, repeat=5):
+    conn = _connect(path)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        CASES[case](conn, QUERIES[query])
+        times.append(time.perf_counter() - start)
+    conn.close()
+    return sorted(times)[len(times) // 2]
+
+def render_time(path, columnar, repeat=3):
+    at = AppTest.from_string(RENDER.format(path=path, columnar=columnar), default_timeout=600)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+    assert not at.exception, at.exception
+    return sorted(times)[len(times) // 2]
+
+def main(n_tracks=100_000):
+    workdir = tempfile.mkdtemp(prefix="bench_resultset_")
+    path = os.path.join(workdir, "catalog.db")
+    build_catalog(path, n_tracks).close()
+    print(f"{n_tracks} tracks, sqlite {sqlite3.sqlite_version}, pyarrow {pa.__version__}")
+
+    print(f"{'query':<8} {'case':<7} {'payload ms':>11} {'py peak MB':>11} {'arrow peak MB':>14}")
+    for query in QUERIES:
+        for case in CASES:
+            t = payload_time(path, case, query)
+            py_peak, arrow_peak = peak_memory(path, case, query)
+            print(f"{query:<8} {case:<7} {t * 1e3:>11.1f} {py_peak / 2**20:>11.1f} {arrow_peak / 2**20:>14.1f}")
+
+    db.DB_PATH = path
+    b = render_time(path, False)
+    a = render_time(path, True)
+    print(f"Tracks page render: st.table {b * 1e3:.0f} ms, st.dataframe(ResultSet) {a * 1e3:.0f} ms ({b / a:.1f}x)")
+    shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,25 @@
+# Throughput of the batch tier engine: nightly renewals and bulk Free -> Premium moves.
+# usage: python benchmarks/bench_tiers.py [n_users ...]
+import os
+import sys
+import tempfile
+from datetime import date
+
+from _synth import add_users, build_catalog
+import tiers
+
+def main(sizes):
+    print(f"{'users':>10} {'job':<22} {'rows':>9} {'chunks':>7} {'seconds':>8} {'rows/s':>10}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            conn = build_catalog(os.path.join(tmp, "bench.db"), 10)
+            add_users(conn, n)
+            for result in (tiers.renew_due(conn, date(2025, 6, 30)),
+                           tiers.upgrade_to_premium(conn),
+                           tiers.downgrade_to_free(conn, range(1, n + 1, 2))):
+                print(f"{n:>10} {result['job']:<22} {result['processed']:>9} {result['chunks']:>7} "
+                      f"{result['elapsed_seconds']:>8.2f} {result['rows_per_second']:>10.0f}")
+            conn.close()
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000])
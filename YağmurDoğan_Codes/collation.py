@@ -0,0 +1,158 @@
+import os
+import sys
+import unicodedata
+
+# SQLite compares TEXT byte by byte, which puts "Şarkı" before "Sarı" and "Ç" after "Z".
+# Instead of a Python collation callback (one interpreter call per comparison), every
+# sortable name gets a BLOB sort key computed once on write; keys compare correctly with
+# plain memcmp, so ORDER BY and range pagination run straight off an index.
+#
+# a key has three levels, each a string of weights encoded as UTF-8 (which keeps code
+# point order under byte comparison), separated by 0x00:
+#   primary    letters in the locale's alphabet order, accents and case ignored
+#   secondary  accents ("Dogan" < "Doğan" in the root locale)
+#   tertiary   case (lower before upper)
+
+LOCALE = os.environ.get("SORT_LOCALE", "tr")
+KEY_VERSION = "2"   # bumped when sort_key changes; stored keys are rebuilt on the next start
+
+# ---------------- LOCALE RULES ----------------
+LOCALES = {}
+
+def register_locale(name, alphabet, lower=None):
+    # alphabet: the letters in sorting order; letters missing from it sort by their base
+    # letter after accents are stripped. lower: locale-specific lower-casing.
+    LOCALES[name] = {
+        "letters": {c: 0x70 + i for i, c in enumerate(alphabet)},
+        "lower": dict(lower or {}),
+        "memo": {},
+    }
+
+register_locale("root", "abcdefghijklmnopqrstuvwxyz")
+# Turkish: ç ğ ı ö ş ü are letters of their own, and I/İ lower-case to ı/i
+register_locale("tr", "abcçdefgğhıijklmnoöpqrsştuüvwxyz", lower={"I": "ı", "İ": "i"})
+
+# letters without a decomposition, sorted as their ASCII spelling plus an accent
+_FOLD = {"ß": "ss", "æ": "ae", "œ": "oe", "ø": "o", "đ": "d", "ł": "l", "ı": "i", "þ": "th"}
+_FOLD_MARK = 0x30
+_MARKS = {m: i + 2 for i, m in enumerate("\u0301\u0300\u0302\u0303\u0308\u030a\u0327\u030c\u0306\u0307\u0328\u0304\u030b")}
+
+def _primary(c, letters):
+    if c in letters:
+        return letters[c]
+    if c.isspace():
+        return 0x01
+    if "!" <= c <= "~" and not c.isalnum():
+        return ord(c) - 0x1F            # ASCII punctuation: 0x02..0x5F
+    if "0" <= c <= "9":
+        return 0x60 + ord(c) - 0x30
+    w = 0x1000 + ord(c)                 # everything else after the alphabet, by code point
+    if w >= 0xD800:
+        w += 0x800                      # step over the surrogates, which UTF-8 cannot encode
+    return min(w, 0x10FFFF)
+
+def _mark(m):
+    return _MARKS.get(m, 0x40 + ord(m) % 0x100)
+
+def _weights(ch, rules):
+    # (primary, secondary, tertiary) weight strings for one character, memoized per locale
+    letters = rules["letters"]
+    lower = rules["lower"].get(ch)
+    if lower is None:
+        lower = ch.lower()
+    case = 2 if lower != ch else 1
+    out = []
+    for c in lower:
+        if c in letters:
+            out.append([letters[c], 1, case])
+            continue
+        d = unicodedata.normalize("NFD", c)
+        base, marks = d[0], d[1:]
+        if unicodedata.combining(base):
+            if out:
+                out[-1][1] = _mark(base)    # e.g. the dot that 'İ'.lower() leaves behind
+            continue
+        secondary = _mark(marks[0]) if marks else 1
+        if base in _FOLD:
+            secondary, base = max(secondary, _FOLD_MARK), _FOLD[base]
+        for b in base:
+            out.append([_primary(b, letters), secondary, case])
+    weights = tuple("".join(chr(e[level]) for e in out) for level in range(3))
+    rules["memo"][ch] = weights
+    return weights
+
+def sort_key(*parts, locale=None):
+    # several parts (first and last name) are joined with a space. NFC first: tags and
+    # macOS file names often arrive decomposed ("g" + U+0306), which would otherwise be
+    # weighed as a plain "g" followed by a mark instead of as "ğ"
+    rules = LOCALES[locale or LOCALE]
+    memo = rules["memo"]
+    text = unicodedata.normalize("NFC", " ".join(p for p in parts if p))
+    weights = [memo.get(ch) or _weights(ch, rules) for ch in text]
+    return "\0".join(["".join([w[0] for w in weights]), "".join([w[1] for w in weights]),
+                      "".join([w[2] for w in weights])]).encode("utf-8")
+
+# ---------------- KEY COLUMNS ----------------
+# table -> (id column, key column, source columns)
+SORT_KEYS = {
+    "Artists": ("artist_id", "name_key", ("name",)),
+    "Albums": ("album_id", "title_key", ("title",)),
+    "Tracks": ("track_id", "title_key", ("track_title",)),
+    "Users": ("user_id", "name_key", ("f_name", "l_name")),
+}
+
+def backfill(conn, rebuild=False, chunk_size=1000):
+    # fills keys that are missing (rows written by other tools) and rebuilds every key
+    # when the configured locale or the key version differs from the stored keys'
+    config = dict(conn.execute("SELECT key, value FROM CollationConfig").fetchall())
+    rebuild = rebuild or ("locale" in config and (config["locale"] != LOCALE or config.get("key_version") != KEY_VERSION))
+    done = 0
+    for table, (id_col, key_col, sources) in SORT_KEYS.items():
+        where = "" if rebuild else f"WHERE {key_col} IS NULL"
+        last = None
+        while True:
+            # keyset by id so a rebuild never revisits rows
+            cond = (f"{where} {'AND' if where else 'WHERE'} {id_col} > ?" if last is not None else where)
+            rows = conn.execute(f"SELECT {id_col}, {', '.join(sources)} FROM {table} {cond} ORDER BY {id_col} LIMIT ?",
+                                ((last,) if last is not None else ()) + (chunk_size,)).fetchall()
+            if not rows:
+                break
+            conn.executemany(f"UPDATE {table} SET {key_col}=? WHERE {id_col}=?", [(sort_key(*r[1:]), r[0]) for r in rows])
+            conn.commit()
+            done += len(rows)
+            last = rows[-1][0]
+    conn.executemany("INSERT OR REPLACE INTO CollationConfig (key, value) VALUES (?, ?)",
+                     [("locale", LOCALE), ("key_version", KEY_VERSION)])
+    conn.commit()
+    return done
+
+# ---------------- PAGINATION ----------------
+def page(conn, table, after=None, limit=50, columns="*"):
+    # rows in locale order; pass the last row's (key, id) back as `after` for the next page
+    id_col, key_col, _ = SORT_KEYS[table]
+    if after is None:
+        return conn.execute(f"SELECT {columns}, {key_col} AS _sort_key FROM {table} ORDER BY {key_col}, {id_col} LIMIT ?",
+                            (limit,)).fetchall()
+    return conn.execute(f"SELECT {columns}, {key_col} AS _sort_key FROM {table} WHERE ({key_col}, {id_col}) > (?, ?) "
+                        f"ORDER BY {key_col}, {id_col} LIMIT ?", tuple(after) + (limit,)).fetchall()
+
+# ---------------- CLI ----------------
+# python collation.py rebuild [--db path] | key <text> [locale]
+# SORT_LOCALE=root python collation.py rebuild switches the stored keys to another locale
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args[:1] == ["key"] and len(args) >= 2:
+        print(sort_key(args[1], locale=args[2] if len(args) > 2 else None).hex(" "))
+        sys.exit(0)
+    import db
+    if "--db" in args:
+        i = args.index("--db")
+        db.DB_PATH = args[i + 1]
+        del args[i:i + 2]
+    if args[:1] != ["rebuild"]:
+        print("usage: collation.py rebuild [--db path] | key <text> [locale]")
+        sys.exit(1)
+    db.init_db()
+    conn = db.get_conn()
+    print(f"{backfill(conn, rebuild=True)} keys rebuilt for locale '{LOCALE}'")
+    conn.close()
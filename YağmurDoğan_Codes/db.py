@@ -0,0 +1,800 @@
+import sqlite3
+import threading
+from datetime import datetime
+import collation
+import dedup
+import moodindex
+import sharding
+from resultset import ResultSet
+
+DB_PATH = "music_streaming.db"
+
+# ---------------- DB HELPERS ----------------
+def get_conn():
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, timeout=10)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def _rows(cur, columnar):
+    # columnar=True returns a ResultSet for st.dataframe instead of a list of sqlite3.Row
+    return ResultSet.from_cursor(cur) if columnar else cur.fetchall()
+
+# ---------------- INIT / SCHEMA ----------------
+def init_db():
+    conn = get_conn()
+    cur = conn.cursor()
+    create_schema(conn)
+
+    # seed only if Artists is empty
+    cur.execute("SELECT COUNT(*) as c FROM Artists")
+    if cur.fetchone()["c"] == 0:
+        seed_data(conn=conn)
+        collation.backfill(conn)
+
+    conn.commit()
+    conn.close()
+
+def create_schema(conn):
+    cur = conn.cursor()
+
+    # auto_vacuum only takes effect before the first table is created, so new databases
+    # start out incremental and maintenance.incremental_vacuum can shrink them in place
+    cur.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+    # create tables if not exist (ER diagram compliant)
+    cur.executescript("""
+    PRAGMA foreign_keys = ON;
+
+    CREATE TABLE IF NOT EXISTS Artists (
+        artist_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        country TEXT,
+        genre TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS ArtistSocialLinks (
+        social_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        artist_id INTEGER,
+        platform TEXT,
+        social_link TEXT,
+        FOREIGN KEY(artist_id) REFERENCES Artists(artist_id) ON DELETE CASCADE
+    );
+
+    CREATE TABLE IF NOT EXISTS Albums (
+        album_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        artist_id INTEGER,
+        release_year INTEGER,
+        FOREIGN KEY (artist_id) REFERENCES Artists(artist_id) ON DELETE SET NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS Tracks (
+        track_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        track_title TEXT NOT NULL,
+        duration_seconds INTEGER,
+        album_id INTEGER,
+        track_genre TEXT,
+        FOREIGN KEY (album_id) REFERENCES Albums(album_id) ON DELETE SET NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS Moods (
+        mood_ref INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        name_norm TEXT NOT NULL UNIQUE
+    );
+
+    CREATE TABLE IF NOT EXISTS TrackMoods (
+        mood_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        track_id INTEGER,
+        mood_ref INTEGER NOT NULL,
+        UNIQUE (track_id, mood_ref),
+        FOREIGN KEY(track_id) REFERENCES Tracks(track_id) ON DELETE CASCADE,
+        FOREIGN KEY(mood_ref) REFERENCES Moods(mood_ref)
+    );
+
+    CREATE TABLE IF NOT EXISTS Users (
+        user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        f_name TEXT,
+        l_name TEXT,
+        email TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS Premium (
+        user_id INTEGER PRIMARY KEY,
+        renewal_date TEXT,
+        renewal_due TEXT,
+        payment_method TEXT,
+        FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE
+    );
+
+    CREATE TABLE IF NOT EXISTS Free (
+        user_id INTEGER PRIMARY KEY,
+        ad_frequency INTEGER,
+        listening_limit INTEGER,
+        FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE
+    );
+
+    CREATE TABLE IF NOT EXISTS Playlists (
+        playlist_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        playlist_title TEXT NOT NULL,
+        user_id INTEGER,
+        creation_date TEXT,
+        FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE
+    );
+    CREATE INDEX IF NOT EXISTS idx_playlists_user ON Playlists(user_id);
+
+    CREATE TABLE IF NOT EXISTS PlaylistTracks (
+        playlist_id INTEGER,
+        track_id INTEGER,
+        position INTEGER,
+        PRIMARY KEY (playlist_id, track_id),
+        FOREIGN KEY (playlist_id) REFERENCES Playlists(playlist_id) ON DELETE CASCADE,
+        FOREIGN KEY (track_id) REFERENCES Tracks(track_id) ON DELETE CASCADE
+    );
+    CREATE INDEX IF NOT EXISTS idx_playlist_tracks_position ON PlaylistTracks(playlist_id, position, track_id);
+
+    CREATE TABLE IF NOT EXISTS ShardConfig (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS PlaylistShards (
+        playlist_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        shard INTEGER
+    );
+    CREATE INDEX IF NOT EXISTS idx_playlist_shards_user ON PlaylistShards(user_id);
+    CREATE INDEX IF NOT EXISTS idx_playlist_shards_shard ON PlaylistShards(shard);
+
+    CREATE TABLE IF NOT EXISTS IndexVersions (
+        name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS ScannedFiles (
+        path TEXT PRIMARY KEY,
+        mtime REAL,
+        size INTEGER,
+        track_id INTEGER,
+        FOREIGN KEY (track_id) REFERENCES Tracks(track_id) ON DELETE SET NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS CollationConfig (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS MaintenanceLog (
+        log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        task TEXT NOT NULL,
+        started_at TEXT,
+        duration_seconds REAL,
+        status TEXT,
+        detail TEXT
+    );
+    """)
+    migrate(conn)
+
+# ---------------- MIGRATIONS ----------------
+# columns added after the first release; CREATE TABLE IF NOT EXISTS does not touch old files
+def _add_column(conn, table, column, decl):
+    cols = [r[1] for r in conn.execute(f"PRAGMA table_info({table})")]
+    if column in cols:
+        return False
+    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+    return True
+
+def migrate(conn):
+    # Premium.renewal_due: renewal_date normalized to YYYY-MM-DD so due dates can be range-scanned
+    if _add_column(conn, "Premium", "renewal_due", "TEXT"):
+        rows = conn.execute("SELECT user_id, renewal_date FROM Premium").fetchall()
+        conn.executemany("UPDATE Premium SET renewal_due=? WHERE user_id=?",
+                         [(normalize_date(r[1]), r[0]) for r in rows])
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_premium_renewal_due ON Premium(renewal_due, user_id)")
+
+    # locale-aware sort keys (see collation.py), indexed for ORDER BY and range pagination
+    for table, (id_col, key_col, _) in collation.SORT_KEYS.items():
+        _add_column(conn, table, key_col, "BLOB")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table.lower()}_{key_col} ON {table}({key_col})")
+    collation.backfill(conn)
+
+    # TrackMoods.mood (free text) -> Moods dimension + TrackMoods.mood_ref
+    if "mood" in [r[1] for r in conn.execute("PRAGMA table_info(TrackMoods)")]:
+        _migrate_moods(conn)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_trackmoods_mood ON TrackMoods(mood_ref, track_id)")
+    conn.commit()
+
+def _migrate_moods(conn):
+    # rebuilds the table: spellings of one mood on one track collapse into the oldest row
+    rows = conn.execute("SELECT mood_id, track_id, mood FROM TrackMoods "
+                        "WHERE TRIM(COALESCE(mood, '')) != '' AND track_id IN (SELECT track_id FROM Tracks) ORDER BY mood_id").fetchall()
+    refs = {}
+    for r in rows:
+        norm = moodindex.normalize(r[2])
+        if norm not in refs:
+            refs[norm] = moodindex.intern(conn, r[2])
+    conn.execute("""
+        CREATE TABLE TrackMoods_new (
+            mood_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            track_id INTEGER,
+            mood_ref INTEGER NOT NULL,
+            UNIQUE (track_id, mood_ref),
+            FOREIGN KEY(track_id) REFERENCES Tracks(track_id) ON DELETE CASCADE,
+            FOREIGN KEY(mood_ref) REFERENCES Moods(mood_ref)
+        )
+    """)
+    conn.executemany("INSERT OR IGNORE INTO TrackMoods_new (mood_id, track_id, mood_ref) VALUES (?, ?, ?)",
+                     [(r[0], r[1], refs[moodindex.normalize(r[2])]) for r in rows])
+    conn.execute("DROP TABLE TrackMoods")
+    conn.execute("ALTER TABLE TrackMoods_new RENAME TO TrackMoods")
+    conn.commit()
+    moodindex.drop_index(conn)
+
+# ---------------- DATES ----------------
+_DATE_FORMATS = ["%Y-%m-%d", "%Y/%m/%d", "%d.%m.%Y", "%d/%m/%Y", "%d-%m-%Y", "%d %B %Y", "%d %b %Y", "%B %d, %Y", "%b %d, %Y"]
+
+def normalize_date(value):
+    # free-form renewal dates -> "YYYY-MM-DD" (day-first for ambiguous dd/mm forms); None if unparseable
+    if value is None:
+        return None
+    text = str(value).strip()
+    try:
+        return datetime.fromisoformat(text).date().isoformat()
+    except ValueError:
+        pass
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+# init_db() runs the whole schema script and the seed check; the app only needs
+# that once per process and database file, not on every Streamlit rerun
+_initialized = set()
+_init_lock = threading.Lock()
+
+def ensure_db():
+    with _init_lock:
+        if DB_PATH not in _initialized:
+            init_db()
+            _initialized.add(DB_PATH)
+
+def seed_data(conn):
+    cur = conn.cursor()
+
+    # Artists
+    artists = [
+        ("Rammstein", "Germany", "Industrial Metal"),
+        ("Justin Bieber", "USA", "R&B"),
+        ("Sezen Aksu", "Turkey", "Pop"),
+        ("Massive Attack", "UK", "Trip Hop"),
+        ("Astrix", "Israel", "Psychedelic")
+    ]
+    cur.executemany("INSERT INTO Artists (name, country, genre) VALUES (?, ?, ?)", artists)
+
+    # Artist social links
+    socials = [
+        (1, "Instagram", "@rammstein"),
+        (1, "Website", "rammstein.de"),
+        (2, "Instagram", "@justinbieber"),
+        (3, "Instagram", "@sezenaksu"),
+        (4, "YouTube", "massiveattack.com"),
+        (5, "SoundCloud", "soundcloud.com/astrix")
+    ]
+    cur.executemany("INSERT INTO ArtistSocialLinks (artist_id, platform, social_link) VALUES (?, ?, ?)", socials)
+
+    # Albums
+    albums = [
+        ("Made In Germany 1995-2011", 1, 2011),
+        ("Purpose", 2, 2015),
+        ("Sen Ağlama", 3, 1984),
+        ("Mezzanine", 4, 1998),
+        ("He.art", 5, 2016)
+    ]
+    cur.executemany("INSERT INTO Albums (title, artist_id, release_year) VALUES (?, ?, ?)", albums)
+
+    # Tracks
+    tracks = [
+        ("Ich Will", 240, 1, "Industrial Metal"),
+        ("Company", 208, 2, "R&B"),
+        ("Geri Dön", 260, 3, "Pop"),
+        ("Angel", 324, 4, "Trip Hop"),
+        ("Deep Jungle Walk", 556, 5, "Psychedelic")
+    ]
+    cur.executemany("INSERT INTO Tracks (track_title, duration_seconds, album_id, track_genre) VALUES (?, ?, ?, ?)", tracks)
+
+    # Track moods (multivalued)
+    moods = [
+        (1, "Aggressive"), (1, "Energetic"),
+        (2, "Melancholic"),
+        (3, "Nostalgic"),
+        (4, "Dark"), (4, "Hypnotic"),
+        (5, "Trippy")
+    ]
+    cur.executemany("INSERT INTO TrackMoods (track_id, mood_ref) VALUES (?, ?)", [(t, moodindex.intern(conn, m)) for t, m in moods])
+
+    # Users (f_name, l_name, email)
+    users = [
+        ("Yağmur", "Doğan", "yagmur@example.com"),
+        ("Ali", "Vatansever", "ali@example.com"),
+        ("Nehir", "Kara", "nehir@example.com"),
+        ("Huseyn", "Terzi", "huseyn@example.com"),
+        ("Zeynep", "Sarı", "zeynep@example.com")
+    ]
+    cur.executemany("INSERT INTO Users (f_name, l_name, email) VALUES (?, ?, ?)", users)
+
+    # Premium (must reference existing user_id)
+    premium = [
+        (1, "2025-01-01", "Credit Card"),
+        (3, "2025-02-03", "Credit Card")
+    ]
+    cur.executemany("INSERT INTO Premium (user_id, renewal_date, renewal_due, payment_method) VALUES (?, ?, ?, ?)",
+                    [(u, d, normalize_date(d), p) for u, d, p in premium])
+
+    # Free
+    free = [
+        (2, 5, 100),
+        (4, 10, 50),
+        (5, 3, 30)
+    ]
+    cur.executemany("INSERT INTO Free (user_id, ad_frequency, listening_limit) VALUES (?, ?, ?)", free)
+
+    # Playlists
+    now = datetime.utcnow().isoformat()
+    playlists = [
+        ("Chill Vibes", 1, now),
+        ("Workout Mix", 2, now),
+        ("Study Focus", 1, now),
+        ("Turkish Pop", 3, now),
+        ("Electro Nights", 4, now)
+    ]
+    cur.executemany("INSERT INTO Playlists (playlist_title, user_id, creation_date) VALUES (?, ?, ?)", playlists)
+
+    # PlaylistTracks
+    playlist_tracks = [
+        (1, 1, 1),
+        (1, 5, 2),  
+        (2, 4, 1),  
+        (3, 3, 1),  
+        (4, 2, 1)
+    ]
+    cur.executemany("INSERT INTO PlaylistTracks (playlist_id, track_id, position) VALUES (?, ?, ?)", playlist_tracks)
+
+    conn.commit()
+
+# ---------------- CRUD: Artists & Socials ----------------
+def _columns(conn, table):
+    # SELECT * without the sort-key BLOBs, which are not for display
+    key_col = collation.SORT_KEYS.get(table, (None, None))[1]
+    return ", ".join(r[1] for r in conn.execute(f"PRAGMA table_info({table})") if r[1] != key_col)
+
+def fetch_all(table, columnar=False):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(f"SELECT {_columns(conn, table)} FROM {table}")
+    rows = _rows(cur, columnar)
+    conn.close()
+    return rows
+
+# Artists CRUD
+def add_artist(name, country, genre):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("INSERT INTO Artists (name, country, genre, name_key) VALUES (?, ?, ?, ?)", (name, country, genre, collation.sort_key(name)))
+    dedup.on_insert(conn, "artist", cur.lastrowid, name)
+    conn.commit()
+    conn.close()
+
+def update_artist(artist_id, name, country, genre):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("UPDATE Artists SET name=?, country=?, genre=?, name_key=? WHERE artist_id=?", (name, country, genre, collation.sort_key(name), artist_id))
+    dedup.on_update(conn, "artist", artist_id, name)
+    conn.commit()
+    conn.close()
+
+def delete_artist(artist_id):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("DELETE FROM Artists WHERE artist_id=?", (artist_id,))
+    dedup.on_delete(conn, "artist", artist_id)
+    conn.commit()
+    conn.close()
+
+# ArtistSocialLinks CRUD
+def add_artist_social(artist_id, platform, social_link):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("INSERT INTO ArtistSocialLinks (artist_id, platform, social_link) VALUES (?, ?, ?)", (artist_id, platform, social_link))
+    conn.commit()
+    conn.close()
+
+def get_all_artist_socials(columnar=False):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT s.social_id, a.artist_id, a.name AS artist_name, s.platform, s.social_link
+        FROM ArtistSocialLinks s
+        JOIN Artists a ON s.artist_id = a.artist_id
+        ORDER BY a.name_key
+    """)
+    rows = _rows(cur, columnar)
+    conn.close()
+    return rows
+
+def update_artist_social(social_id, platform, social_link):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("UPDATE ArtistSocialLinks SET platform=?, social_link=? WHERE social_id=?", (platform, social_link, social_id))
+    conn.commit()
+    conn.close()
+
+def delete_artist_social(social_id):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("DELETE FROM ArtistSocialLinks WHERE social_id=?", (social_id,))
+    conn.commit()
+    conn.close()
+
+# ---------------- CRUD: Albums ----------------
+def add_album(title, artist_id, release_year):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("INSERT INTO Albums (title, artist_id, release_year, title_key) VALUES (?, ?, ?, ?)", (title, artist_id if artist_id else None, release_year, collation.sort_key(title)))
+    dedup.on_insert(conn, "album", cur.lastrowid, title, artist_id or None)
+    conn.commit()
+    conn.close()
+
+def update_album(album_id, title, artist_id, release_year):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("UPDATE Albums SET title=?, artist_id=?, release_year=?, title_key=? WHERE album_id=?", (title, artist_id if artist_id else None, release_year, collation.sort_key(title), album_id))
+    dedup.on_update(conn, "album", album_id, title, artist_id or None)
+    conn.commit()
+    conn.close()
+
+def delete_album(album_id):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("DELETE FROM Albums WHERE album_id=?", (album_id,))
+    dedup.on_delete(conn, "album", album_id)
+    conn.commit()
+    conn.close()
+
+# ---------------- CRUD: Tracks & Moods ----------------
+def add_track(track_title, duration_seconds, album_id, track_genre):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("INSERT INTO Tracks (track_title, duration_seconds, album_id, track_genre, title_key) VALUES (?, ?, ?, ?, ?)", (track_title, duration_seconds, album_id if album_id else None, track_genre, collation.sort_key(track_title)))
+    dedup.on_insert(conn, "track", cur.lastrowid, track_title, album_id or None)
+    moodindex.on_add_track(conn, cur.lastrowid)
+    conn.commit()
+    conn.close()
+
+def update_track(track_id, track_title, duration_seconds, album_id, track_genre):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("UPDATE Tracks SET track_title=?, duration_seconds=?, album_id=?, track_genre=?, title_key=? WHERE track_id=?", (track_title, duration_seconds, album_id if album_id else None, track_genre, collation.sort_key(track_title), track_id))
+    dedup.on_update(conn, "track", track_id, track_title, album_id or None)
+    conn.commit()
+    conn.close()
+
+def delete_track(track_id):
+    conn = get_conn()
+    delete_tracks(conn, [track_id])
+    conn.close()
+
+def delete_tracks(conn, track_ids):
+    # shared by delete_track and the scanner's prune: a track goes with its moods, its
+    # playlist entries (in every shard file) and its entries in the in-memory indexes
+    params = [(t,) for t in track_ids]
+    conn.executemany("DELETE FROM Tracks WHERE track_id=?", params)
+    conn.executemany("DELETE FROM TrackMoods WHERE track_id=?", params)
+    conn.executemany("DELETE FROM PlaylistTracks WHERE track_id=?", params)
+    dedup.on_delete_many(conn, "track", track_ids)
+    moodindex.on_delete_tracks(conn, track_ids)
+    conn.commit()
+    if sharding.shard_count(conn):
+        sharding.delete_tracks_everywhere(conn, track_ids)
+
+# Track moods CRUD
+# moods are interned (see moodindex.py): "Dark" and "dark" are the same Moods row
+def add_track_mood(track_id, mood):
+    conn = get_conn()
+    cur = conn.cursor()
+    ref = moodindex.intern(conn, mood)
+    # a mood the track already has is left as it is
+    cur.execute("INSERT OR IGNORE INTO TrackMoods (track_id, mood_ref) VALUES (?, ?)", (track_id, ref))
+    moodindex.on_add(conn, track_id, ref, mood)
+    conn.commit()
+    conn.close()
+
+def get_all_track_moods(columnar=False):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT m.mood_id, t.track_id, t.track_title, mo.name AS mood
+        FROM TrackMoods m
+        JOIN Tracks t ON m.track_id = t.track_id
+        JOIN Moods mo ON m.mood_ref = mo.mood_ref
+        ORDER BY t.title_key
+    """)
+    rows = _rows(cur, columnar)
+    conn.close()
+    return rows
+
+def update_track_mood(mood_id, mood):
+    conn = get_conn()
+    cur = conn.cursor()
+    old = cur.execute("SELECT track_id, mood_ref FROM TrackMoods WHERE mood_id=?", (mood_id,)).fetchone()
+    if old is None:
+        conn.close()
+        return
+    ref = moodindex.intern(conn, mood)
+    if cur.execute("SELECT 1 FROM TrackMoods WHERE track_id=? AND mood_ref=? AND mood_id!=?", (old["track_id"], ref, mood_id)).fetchone():
+        # the track already has the new mood: this row became a duplicate
+        cur.execute("DELETE FROM TrackMoods WHERE mood_id=?", (mood_id,))
+    else:
+        cur.execute("UPDATE TrackMoods SET mood_ref=? WHERE mood_id=?", (ref, mood_id))
+    moodindex.on_remove(conn, old["track_id"], old["mood_ref"])
+    moodindex.on_add(conn, old["track_id"], ref, mood)
+    conn.commit()
+    conn.close()
+
+def delete_track_mood(mood_id):
+    conn = get_conn()
+    cur = conn.cursor()
+    old = cur.execute("SELECT track_id, mood_ref FROM TrackMoods WHERE mood_id=?", (mood_id,)).fetchone()
+    cur.execute("DELETE FROM TrackMoods WHERE mood_id=?", (mood_id,))
+    if old is not None:
+        moodindex.on_remove(conn, old["track_id"], old["mood_ref"])
+    conn.commit()
+    conn.close()
+
+def find_tracks_by_moods(expression, limit=100, columnar=False):
+    # boolean mood query ("Dark AND Hypnotic NOT Aggressive") answered from the bitmap index;
+    # returns (total matches, the first `limit` tracks by id)
+    node = moodindex.parse(expression)   # a bad query fails before a connection is opened
+    conn = get_conn()
+    ids = moodindex.query(conn, node).to_array()
+    cur = conn.cursor()
+    cur.execute(f"""
+        SELECT t.track_id, t.track_title, a.title AS album_title, ar.name AS artist_name, t.track_genre
+        FROM Tracks t
+        LEFT JOIN Albums a ON t.album_id = a.album_id
+        LEFT JOIN Artists ar ON a.artist_id = ar.artist_id
+        WHERE t.track_id IN ({",".join("?" * len(ids[:limit]))})
+        ORDER BY t.track_id
+    """, [int(i) for i in ids[:limit]])
+    rows = _rows(cur, columnar)
+    conn.close()
+    return len(ids), rows
+
+def get_moods():
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("SELECT mood_ref, name FROM Moods ORDER BY name_norm")
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+# ---------------- CRUD: Users, Premium, Free ----------------
+def add_user(f_name, l_name, email):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("INSERT INTO Users (f_name, l_name, email, name_key) VALUES (?, ?, ?, ?)", (f_name, l_name, email, collation.sort_key(f_name, l_name)))
+    conn.commit()
+    conn.close()
+
+def get_all_users(columnar=False):
+    return fetch_all("Users", columnar)
+
+def update_user(user_id, f_name, l_name, email):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("UPDATE Users SET f_name=?, l_name=?, email=?, name_key=? WHERE user_id=?", (f_name, l_name, email, collation.sort_key(f_name, l_name), user_id))
+    conn.commit()
+    conn.close()
+
+def delete_user(user_id):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("DELETE FROM Users WHERE user_id=?", (user_id,))
+    conn.commit()
+    if sharding.shard_count(conn):
+        sharding.delete_user_playlists(conn, user_id)
+    conn.close()
+
+# Premium
+def add_premium(user_id, renewal_date, payment_method):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("INSERT INTO Premium (user_id, renewal_date, renewal_due, payment_method) VALUES (?, ?, ?, ?)", (user_id, renewal_date, normalize_date(renewal_date), payment_method))
+    conn.commit()
+    conn.close()
+
+def get_all_premium(columnar=False):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT p.user_id, u.f_name, u.l_name, p.renewal_date, p.renewal_due, p.payment_method
+        FROM Premium p JOIN Users u ON p.user_id = u.user_id
+    """)
+    rows = _rows(cur, columnar)
+    conn.close()
+    return rows
+
+def update_premium(user_id, renewal_date, payment_method):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("UPDATE Premium SET renewal_date=?, renewal_due=?, payment_method=? WHERE user_id=?", (renewal_date, normalize_date(renewal_date), payment_method, user_id))
+    conn.commit()
+    conn.close()
+
+def delete_premium(user_id):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("DELETE FROM Premium WHERE user_id=?", (user_id,))
+    conn.commit()
+    conn.close()
+
+# Free
+def add_free(user_id, ad_frequency, listening_limit):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("INSERT INTO Free (user_id, ad_frequency, listening_limit) VALUES (?, ?, ?)", (user_id, ad_frequency, listening_limit))
+    conn.commit()
+    conn.close()
+
+def get_all_free(columnar=False):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT f.user_id, u.f_name, u.l_name, f.ad_frequency, f.listening_limit
+        FROM Free f JOIN Users u ON f.user_id = u.user_id
+    """)
+    rows = _rows(cur, columnar)
+    conn.close()
+    return rows
+
+def update_free(user_id, ad_frequency, listening_limit):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("UPDATE Free SET ad_frequency=?, listening_limit=? WHERE user_id=?", (ad_frequency, listening_limit, user_id))
+    conn.commit()
+    conn.close()
+
+def delete_free(user_id):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("DELETE FROM Free WHERE user_id=?", (user_id,))
+    conn.commit()
+    conn.close()
+
+# ---------------- CRUD: Playlists ----------------
+# once sharding is enabled (python sharding.py enable N) playlist data lives in shard
+# files and these functions route through sharding.py instead of the catalog tables
+def add_playlist(playlist_title, user_id):
+    conn = get_conn()
+    if sharding.shard_count(conn):
+        sharding.add_playlist(conn, playlist_title, user_id)
+        conn.close()
+        return
+    cur = conn.cursor()
+    cur.execute("INSERT INTO Playlists (playlist_title, user_id, creation_date) VALUES (?, ?, ?)", (playlist_title, user_id, datetime.utcnow().isoformat()))
+    conn.commit()
+    conn.close()
+
+def delete_playlist(playlist_id):
+    conn = get_conn()
+    if sharding.shard_count(conn):
+        sharding.delete_playlist(conn, playlist_id)
+        conn.close()
+        return
+    cur = conn.cursor()
+    cur.execute("DELETE FROM Playlists WHERE playlist_id=?", (playlist_id,))
+    conn.commit()
+    conn.close()
+
+def add_track_to_playlist(playlist_id, track_id, position):
+    conn = get_conn()
+    if sharding.shard_count(conn):
+        sharding.add_track_to_playlist(conn, playlist_id, track_id, position)
+        conn.close()
+        return
+    cur = conn.cursor()
+    cur.execute("INSERT OR REPLACE INTO PlaylistTracks (playlist_id, track_id, position) VALUES (?, ?, ?)", (playlist_id, track_id, position))
+    conn.commit()
+    conn.close()
+
+def remove_track_from_playlist(playlist_id, track_id):
+    conn = get_conn()
+    if sharding.shard_count(conn):
+        sharding.remove_track_from_playlist(conn, playlist_id, track_id)
+        conn.close()
+        return
+    cur = conn.cursor()
+    cur.execute("DELETE FROM PlaylistTracks WHERE playlist_id=? AND track_id=?", (playlist_id, track_id))
+    conn.commit()
+    conn.close()
+
+# ---------------- JOINS / HELPERS ----------------
+def join_tracks_albums_artists(columnar=False):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("""
+    SELECT t.track_id, t.track_title, t.duration_seconds, t.track_genre,
+           a.album_id, a.title AS album_title, ar.artist_id, ar.name AS artist_name
+    FROM Tracks t
+    LEFT JOIN Albums a ON t.album_id = a.album_id
+    LEFT JOIN Artists ar ON a.artist_id = ar.artist_id
+    ORDER BY ar.name_key, a.release_year
+    """)
+    rows = _rows(cur, columnar)
+    conn.close()
+    return rows
+
+def get_all_playlists(columnar=False):
+    conn = get_conn()
+    if sharding.shard_count(conn):
+        rows = sharding.get_all_playlists(conn)
+        if columnar:
+            rows = ResultSet.from_rows(rows[0].keys() if rows else [], rows)
+    else:
+        rows = _rows(conn.execute("SELECT * FROM Playlists"), columnar)
+    conn.close()
+    return rows
+
+def get_playlists_for_user(user_id):
+    conn = get_conn()
+    if sharding.shard_count(conn):
+        rows = sharding.get_playlists_for_user(conn, user_id)
+        conn.close()
+        return rows
+    cur = conn.cursor()
+    cur.execute("SELECT * FROM Playlists WHERE user_id=?", (user_id,))
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+def get_tracks_in_playlist(playlist_id):
+    conn = get_conn()
+    if sharding.shard_count(conn):
+        rows = sharding.get_tracks_in_playlist(conn, playlist_id)
+        conn.close()
+        return rows
+    cur = conn.cursor()
+    cur.execute("""
+    SELECT pt.position, t.track_id, t.track_title, t.duration_seconds, t.track_genre,
+           a.title as album_title, ar.name as artist_name
+    FROM PlaylistTracks pt
+    JOIN Tracks t ON pt.track_id = t.track_id
+    LEFT JOIN Albums a ON t.album_id = a.album_id
+    LEFT JOIN Artists ar ON a.artist_id = ar.artist_id
+    WHERE pt.playlist_id = ?
+    ORDER BY pt.position
+    """, (playlist_id,))
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+# ---------------- DUPLICATE DETECTION ----------------
+def find_similar(kind, name, scope=None, exclude=None):
+    conn = get_conn()
+    matches = dedup.similar(conn, kind, name, scope=scope or None, exclude=exclude)
+    conn.close()
+    return matches
+
+def get_duplicate_report(kind):
+    conn = get_conn()
+    report = dedup.duplicate_report(conn, kind)
+    conn.close()
+    return report
+
+def merge_duplicates(kind, keep_id, merge_ids):
+    conn = get_conn()
+    # dedup.merge also re-points shard playlist entries and invalidates the mood index
+    moved = dedup.merge(conn, kind, keep_id, merge_ids)
+    conn.close()
+    return moved
@@ -0,0 +1,276 @@
+import math
+import re
+import sqlite3
+import sys
+import threading
+import unicodedata
+from array import array
+
+import indexcache
+import moodindex
+import sharding
+
+DEFAULT_THRESHOLD = 0.85
+
+# kind -> (table, id column, name column, scope column)
+# albums are only compared within one artist, tracks within one album
+KINDS = {
+    "artist": ("Artists", "artist_id", "name", None),
+    "album": ("Albums", "album_id", "title", "artist_id"),
+    "track": ("Tracks", "track_id", "track_title", "album_id"),
+}
+
+# ---------------- NORMALIZATION ----------------
+_PUNCT = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+
+def normalize(name):
+    # "Sezen  Aksu", "sezen aksu" and "Sézen Aksu!" all map to "sezen aksu"
+    s = unicodedata.normalize("NFKD", name or "")
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    s = s.replace("ı", "i").casefold()
+    s = _PUNCT.sub(" ", s)
+    return _SPACES.sub(" ", s).strip()
+
+def ngrams(key, n=3):
+    padded = f"  {key} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+# ---------------- FUZZY INDEX ----------------
+class NameIndex:
+    # exact normalized keys in a dict, plus trigram postings for fuzzy candidates.
+    # postings are blocked by gram count, and lookups only visit the sizes that can
+    # reach the threshold and, within each, only the rarest grams of the query
+    # (prefix filtering) -- enough to find every qualifying name.
+    def __init__(self, threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.entries = {}    # id -> (scope, key, name, gram count)
+        self.exact = {}      # (scope, key) -> set(ids)
+        self.postings = {}   # (scope, size, gram) -> array of ids (may hold stale ids)
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, id_, name, scope=None):
+        key = normalize(name)
+        with self.lock:
+            if id_ in self.entries:
+                self._remove(id_)
+            grams = ngrams(key)
+            size = len(grams)
+            self.entries[id_] = (scope, key, name, size)
+            self.exact.setdefault((scope, key), set()).add(id_)
+            for g in grams:
+                posting = self.postings.get((scope, size, g))
+                if posting is None:
+                    posting = self.postings[(scope, size, g)] = array("q")
+                posting.append(id_)
+
+    def add_many(self, rows):
+        for id_, name, scope in rows:
+            self.add(id_, name, scope)
+
+    def remove(self, id_):
+        with self.lock:
+            self._remove(id_)
+
+    def _remove(self, id_):
+        # postings are left as tombstones; candidates are verified against self.entries
+        entry = self.entries.pop(id_, None)
+        if entry is None:
+            return
+        scope, key = entry[0], entry[1]
+        ids = self.exact.get((scope, key))
+        if ids is not None:
+            ids.discard(id_)
+            if not ids:
+                del self.exact[(scope, key)]
+
+    def similar(self, name, scope=None, threshold=None, exclude=None, limit=10, extra_probes=2):
+        threshold = self.threshold if threshold is None else threshold
+        key = normalize(name)
+        if not key:
+            return []
+        grams = ngrams(key)
+        q = len(grams)
+        with self.lock:
+            exact_ids = self.exact.get((scope, key), set())
+            candidates = set(exact_ids)
+            # dice >= t bounds the other name's gram count to [q*t/(2-t), q*(2-t)/t]
+            for size in range(math.ceil(q * threshold / (2 - threshold)), math.floor(q * (2 - threshold) / threshold) + 1):
+                min_overlap = math.ceil(threshold * (q + size) / 2)
+                if min_overlap > min(q, size):
+                    continue
+                # probing the rarest q - min_overlap + 1 grams finds every qualifying name; each extra
+                # probe raises the number of probed grams a qualifying name must hit by one
+                probe = sorted(grams, key=lambda g: len(self.postings.get((scope, size, g), ())))
+                prefix = q - min_overlap + 1
+                extra = min(extra_probes, q - prefix)
+                hits = {}
+                for g in probe[:prefix + extra]:
+                    for cid in self.postings.get((scope, size, g), ()):
+                        hits[cid] = hits.get(cid, 0) + 1
+                candidates.update(cid for cid, n in hits.items() if n > extra)
+
+            matches = []
+            for cid in candidates:
+                entry = self.entries.get(cid)
+                if entry is None or cid == exclude or entry[0] != scope:
+                    continue
+                if cid in exact_ids:
+                    score = 1.0
+                else:
+                    # a trigram is in the candidate's gram set iff it is a substring of its padded key
+                    padded = f"  {entry[1]} "
+                    score = 2 * sum(1 for g in grams if g in padded) / (q + entry[3])
+                if score >= threshold:
+                    matches.append({"id": cid, "name": entry[2], "score": round(score, 3)})
+        matches.sort(key=lambda m: (-m["score"], m["id"]))
+        return matches[:limit]
+
+# ---------------- PER-DATABASE INDEXES ----------------
+def build_index(conn, kind, threshold=DEFAULT_THRESHOLD, batch_size=10000):
+    table, id_col, name_col, scope_col = KINDS[kind]
+    index = NameIndex(threshold)
+    cur = conn.cursor()
+    cur.execute(f"SELECT {id_col}, {name_col}, {scope_col or 'NULL'} FROM {table}")
+    while True:
+        rows = cur.fetchmany(batch_size)
+        if not rows:
+            break
+        index.add_many(tuple(r) for r in rows)
+    return index
+
+def get_index(conn, kind):
+    # built on first use and kept until the tables change behind its back (see indexcache.py)
+    return indexcache.get(conn, "dedup:" + kind, lambda c: build_index(c, kind))
+
+def drop_index(conn, kind):
+    indexcache.drop(conn, "dedup:" + kind)
+
+def similar(conn, kind, name, scope=None, exclude=None, threshold=None):
+    return get_index(conn, kind).similar(name, scope=scope, exclude=exclude, threshold=threshold)
+
+def on_insert(conn, kind, id_, name, scope=None):
+    indexcache.changed(conn, "dedup:" + kind, lambda index: index.add(id_, name, scope))
+
+def on_update(conn, kind, id_, name, scope=None):
+    indexcache.changed(conn, "dedup:" + kind, lambda index: index.add(id_, name, scope))
+
+def on_delete(conn, kind, id_):
+    indexcache.changed(conn, "dedup:" + kind, lambda index: index.remove(id_))
+
+def on_delete_many(conn, kind, ids):
+    # one version bump for a batch delete
+    def patch(index):
+        for id_ in ids:
+            index.remove(id_)
+    indexcache.changed(conn, "dedup:" + kind, patch)
+
+# ---------------- BATCH REPORT ----------------
+def duplicate_report(conn, kind, threshold=DEFAULT_THRESHOLD):
+    # clusters of likely duplicates (union-find over similar pairs), largest first
+    index = get_index(conn, kind)
+    parent = {}
+
+    def find(x):
+        while parent.get(x, x) != x:
+            parent[x] = parent.get(parent[x], parent[x])
+            x = parent[x]
+        return x
+
+    for id_, (scope, _, name, _) in list(index.entries.items()):
+        for m in index.similar(name, scope=scope, threshold=threshold, exclude=id_, limit=50):
+            a, b = find(id_), find(m["id"])
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+
+    clusters = {}
+    for id_ in parent:
+        clusters.setdefault(find(id_), set()).add(id_)
+    report = []
+    for root, ids in clusters.items():
+        ids = sorted(ids | {root})
+        report.append({
+            "keep_id": ids[0],
+            "scope": index.entries[ids[0]][0],
+            "names": [index.entries[i][2] for i in ids],
+            "ids": ids,
+        })
+    report.sort(key=lambda c: (-len(c["ids"]), c["keep_id"]))
+    return report
+
+# ---------------- MERGE ----------------
+def _repoint(conn, table, column, old_id, new_id, chunk_size):
+    # one short transaction per chunk so live readers/writers are not blocked for long
+    moved = 0
+    while True:
+        cur = conn.execute(
+            f"UPDATE {table} SET {column}=? WHERE rowid IN (SELECT rowid FROM {table} WHERE {column}=? LIMIT ?)",
+            (new_id, old_id, chunk_size))
+        conn.commit()
+        moved += cur.rowcount
+        if cur.rowcount < chunk_size:
+            return moved
+
+def merge(conn, kind, keep_id, merge_ids, chunk_size=1000):
+    table, id_col, _, _ = KINDS[kind]
+    # children that point at the merged rows
+    children = {
+        "artist": [("Albums", "artist_id"), ("ArtistSocialLinks", "artist_id")],
+        "album": [("Tracks", "album_id")],
+        "track": [("TrackMoods", "track_id"), ("PlaylistTracks", "track_id")],
+    }[kind]
+    moved = 0
+    for old_id in merge_ids:
+        if old_id == keep_id:
+            continue
+        if kind == "track":
+            # a playlist holding both tracks keeps only the kept one (PlaylistTracks key is playlist_id, track_id)
+            conn.execute("""
+                DELETE FROM PlaylistTracks WHERE track_id=?
+                AND playlist_id IN (SELECT playlist_id FROM PlaylistTracks WHERE track_id=?)
+            """, (old_id, keep_id))
+            # same for a mood both tracks carry (TrackMoods is unique on track_id, mood_ref)
+            conn.execute("""
+                DELETE FROM TrackMoods WHERE track_id=?
+                AND mood_ref IN (SELECT mood_ref FROM TrackMoods WHERE track_id=?)
+            """, (old_id, keep_id))
+        for child, column in children:
+            moved += _repoint(conn, child, column, old_id, keep_id, chunk_size)
+        conn.execute(f"DELETE FROM {table} WHERE {id_col}=?", (old_id,))
+        on_delete(conn, kind, old_id)
+        if kind == "track":
+            # TrackMoods rows moved to another track: other processes rebuild their bitmaps
+            moodindex.drop_index(conn)
+        conn.commit()
+        if kind == "track" and sharding.shard_count(conn):
+            # the catalog's PlaylistTracks were re-pointed above, the shards' are re-pointed here
+            sharding.repoint_track(conn, old_id, keep_id)
+    # re-pointed children now live under another scope, rebuild their index on next use
+    child_kind = {"artist": "album", "album": "track"}.get(kind)
+    if child_kind:
+        drop_index(conn, child_kind)
+    return moved
+
+# ---------------- CLI ----------------
+# python dedup.py report artist [db]
+# python dedup.py merge artist <keep_id> <merge_id> [<merge_id> ...] [--db path]
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    db = "music_streaming.db"
+    if "--db" in args:
+        i = args.index("--db")
+        db = args[i + 1]
+        del args[i:i + 2]
+    conn = sqlite3.connect(db)
+    if args[:1] == ["report"]:
+        for c in duplicate_report(conn, args[1]):
+            print(c["keep_id"], c["ids"], " | ".join(c["names"]))
+    elif args[:1] == ["merge"]:
+        moved = merge(conn, args[1], int(args[2]), [int(a) for a in args[3:]])
+        print(f"Re-pointed {moved} rows.")
+    else:
+        print("usage: dedup.py report <artist|album|track> | merge <kind> <keep_id> <merge_id>... [--db path]")
+    conn.close()
@@ -0,0 +1,67 @@
+import threading
+
+# in-memory indexes (dedup's name indexes, moodindex's mood bitmaps) are built once per
+# database file and name, then patched by the write hooks instead of being rebuilt.
+# IndexVersions keeps a counter per name that every hook bumps in the writer's
+# transaction. An index remembers the counter it matches: a value this process did not
+# produce means another process (or a raw SQL write) changed the tables, and the index
+# is rebuilt on its next use. The check is one primary-key lookup per use.
+
+_indexes = {}   # (db path, name) -> [version, index]
+_indexes_lock = threading.Lock()   # guards the dicts only, never held while building
+_build_locks = {}   # (db path, name) -> lock held by the one thread rebuilding that index
+
+def _key(conn, name):
+    return conn.execute("PRAGMA database_list").fetchone()[2], name
+
+def _version(conn, name):
+    row = conn.execute("SELECT version FROM IndexVersions WHERE name=?", (name,)).fetchone()
+    return row[0] if row else 0
+
+def get(conn, name, build):
+    # the index for this database, built with build(conn) on first use or when stale.
+    # The version is read before building, so a write that lands during the build only
+    # costs one extra rebuild later. A rebuild only holds up users of the same index
+    key = _key(conn, name)
+    version = _version(conn, name)
+    with _indexes_lock:
+        entry = _indexes.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        build_lock = _build_locks.setdefault(key, threading.Lock())
+    with build_lock:
+        with _indexes_lock:
+            entry = _indexes.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]   # built by another thread while this one waited
+        index = build(conn)
+        with _indexes_lock:
+            _indexes[key] = [version, index]
+    return index
+
+def changed(conn, name, patch=None):
+    # called by the write hooks before the writer commits, so the counter bump is part of
+    # the same transaction as the data; outside a transaction (drop after a migration)
+    # it commits on its own. Applies patch(index) if this process had seen every earlier
+    # change; otherwise, or without a patch, the index is dropped and rebuilt on next use
+    in_transaction = conn.in_transaction
+    version = conn.execute("""
+        INSERT INTO IndexVersions (name, version) VALUES (?, 1)
+        ON CONFLICT(name) DO UPDATE SET version = version + 1
+        RETURNING version
+    """, (name,)).fetchone()[0]
+    if not in_transaction:
+        conn.commit()
+    key = _key(conn, name)
+    with _indexes_lock:
+        entry = _indexes.get(key)
+        if entry is None:
+            return
+        if patch is not None and entry[0] == version - 1:
+            patch(entry[1])
+            entry[0] = version
+        else:
+            del _indexes[key]
+
+def drop(conn, name):
+    changed(conn, name)
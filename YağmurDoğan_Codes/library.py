@@ -0,0 +1,153 @@
+import heapq
+import sys
+
+import db
+import sharding
+
+BATCH_SIZE = 1000
+CHUNK_USERS = 500   # user ids per IN (...) list, well under SQLite's bound-parameter limit
+
+# a user's library used to be get_playlists_for_user() plus one get_tracks_in_playlist()
+# per playlist: a connection and a four-table join each, 301 round trips for 300
+# playlists. Here one query per shard file joins Playlists -> PlaylistTracks -> Tracks ->
+# Albums -> Artists for all requested users at once, ordered by (user_id, playlist_id,
+# position), and the cursor is cut into playlists as rows arrive.
+
+TRACK_COLUMNS = ("position", "track_id", "track_title", "duration_seconds", "track_genre", "album_title", "artist_name")
+PLAYLIST_COLUMNS = ("playlist_id", "playlist_title", "user_id", "creation_date", "track_count")
+
+# {c} is "catalog." on a shard connection, where the track tables live in the attached catalog.
+# Tracks are LEFT JOINed one by one (a parenthesized PlaylistTracks JOIN Tracks would be
+# materialized in full); rows whose track is gone come back with a NULL track_id and are
+# skipped while grouping.
+LIBRARY_SQL = """
+    SELECT p.playlist_id, p.playlist_title, p.user_id, p.creation_date, NULL AS track_count,
+           pt.position, t.track_id, t.track_title, t.duration_seconds, t.track_genre,
+           a.title AS album_title, ar.name AS artist_name
+    FROM main.Playlists p
+    LEFT JOIN main.PlaylistTracks pt ON pt.playlist_id = p.playlist_id
+    LEFT JOIN {c}Tracks t ON pt.track_id = t.track_id
+    LEFT JOIN {c}Albums a ON t.album_id = a.album_id
+    LEFT JOIN {c}Artists ar ON a.artist_id = ar.artist_id
+    WHERE p.user_id IN ({ids})
+    ORDER BY p.user_id, p.playlist_id, pt.position, pt.track_id
+"""
+
+# with a per-playlist limit, the position of each playlist's Nth live entry (in position,
+# track_id order) is looked up on idx_playlist_tracks_position first and becomes the upper
+# bound of the index range the join reads, so entries past the limit are never joined.
+# The result is the head of LIBRARY_SQL's: NULL positions sort first (an Nth entry without
+# a position leaves only the NULL range), entries whose track is gone are neither counted
+# nor returned, and ties at the bound are cut while grouping.
+LIMITED_SQL = """
+    WITH p AS MATERIALIZED (
+        SELECT p.playlist_id, p.playlist_title, p.user_id, p.creation_date,
+               (SELECT COUNT(*) FROM main.PlaylistTracks x JOIN {c}Tracks t ON t.track_id = x.track_id
+                WHERE x.playlist_id = p.playlist_id) AS track_count,
+               COALESCE((SELECT COALESCE(x.position, -9223372036854775808)
+                         FROM main.PlaylistTracks x JOIN {c}Tracks t ON t.track_id = x.track_id
+                         WHERE x.playlist_id = p.playlist_id
+                         ORDER BY x.position, x.track_id LIMIT 1 OFFSET ?), 9223372036854775807) AS last_position
+        FROM main.Playlists p
+        WHERE p.user_id IN ({ids})
+    )
+    SELECT p.playlist_id, p.playlist_title, p.user_id, p.creation_date, p.track_count,
+           pt.position, t.track_id, t.track_title, t.duration_seconds, t.track_genre,
+           a.title AS album_title, ar.name AS artist_name
+    FROM p
+    LEFT JOIN main.PlaylistTracks pt ON pt.playlist_id = p.playlist_id
+         AND (pt.position IS NULL OR pt.position <= p.last_position)
+    LEFT JOIN {c}Tracks t ON pt.track_id = t.track_id
+    LEFT JOIN {c}Albums a ON t.album_id = a.album_id
+    LEFT JOIN {c}Artists ar ON a.artist_id = ar.artist_id
+    ORDER BY p.user_id, p.playlist_id, pt.position, pt.track_id
+"""
+
+# ---------------- GROUPING ----------------
+def _finish(playlist):
+    if playlist["track_count"] is None:
+        playlist["track_count"] = len(playlist["tracks"])
+    return playlist
+
+def _playlists(conn, user_ids, track_limit, prefix, batch_size):
+    # one dict per playlist: PLAYLIST_COLUMNS plus "tracks", a list of TRACK_COLUMNS dicts
+    for i in range(0, len(user_ids), CHUNK_USERS):
+        chunk = user_ids[i:i + CHUNK_USERS]
+        ids = ",".join("?" * len(chunk))
+        if track_limit is None:
+            cur = conn.execute(LIBRARY_SQL.format(c=prefix, ids=ids), chunk)
+        else:
+            cur = conn.execute(LIMITED_SQL.format(c=prefix, ids=ids), [max(track_limit - 1, 0)] + chunk)
+        cur.row_factory = None
+        playlist = None
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            for r in rows:
+                if playlist is None or r[0] != playlist["playlist_id"]:
+                    if playlist is not None:
+                        yield _finish(playlist)
+                    playlist = dict(zip(PLAYLIST_COLUMNS, r[:5]), tracks=[])
+                if r[6] is not None and (track_limit is None or len(playlist["tracks"]) < track_limit):
+                    playlist["tracks"].append(dict(zip(TRACK_COLUMNS, r[5:])))
+        if playlist is not None:
+            yield _finish(playlist)
+
+def _shard_playlists(catalog, shard, user_ids, track_limit, batch_size):
+    sconn = sharding.connect_shard(catalog, shard)
+    try:
+        yield from _playlists(sconn, user_ids, track_limit, "catalog.", batch_size)
+    finally:
+        sconn.close()
+
+# ---------------- LIBRARY ----------------
+def get_library(user_ids, track_limit=None, batch_size=BATCH_SIZE):
+    # generator over the playlists of one user id or a list of them, in (user_id,
+    # playlist_id) order, each with its tracks in position order; track_limit keeps the
+    # first N tracks of every playlist. The connection stays open until the generator is
+    # exhausted or closed.
+    if isinstance(user_ids, int):
+        user_ids = [user_ids]
+    user_ids = sorted(set(user_ids))
+    if track_limit is not None and track_limit < 0:
+        raise ValueError("track_limit must be zero or more")
+    conn = db.get_conn()
+    try:
+        if not sharding.shard_count(conn):
+            yield from _playlists(conn, user_ids, track_limit, "", batch_size)
+            return
+        # a user's playlists sit in one shard, or two while a rebalance is moving them;
+        # the shards' ordered streams are merged back into one
+        shards = sorted({s for uid in user_ids for s in sharding.used_shards(conn, uid)})
+        catalog = sharding.catalog_path(conn)
+        streams = [_shard_playlists(catalog, s, user_ids, track_limit, batch_size) for s in shards]
+        try:
+            yield from heapq.merge(*streams, key=lambda p: (p["user_id"], p["playlist_id"]))
+        finally:
+            for stream in streams:
+                stream.close()
+    finally:
+        conn.close()
+
+# ---------------- CLI ----------------
+# python library.py <user_id> [<user_id> ...] [--limit N] [--db path]
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    limit = None
+    if "--db" in args:
+        i = args.index("--db")
+        db.DB_PATH = args[i + 1]
+        del args[i:i + 2]
+    if "--limit" in args:
+        i = args.index("--limit")
+        limit = int(args[i + 1])
+        del args[i:i + 2]
+    if not args:
+        print("usage: library.py <user_id> [<user_id> ...] [--limit N] [--db path]")
+        sys.exit(1)
+    db.init_db()
+    for p in get_library([int(a) for a in args], track_limit=limit):
+        print(f"user {p['user_id']} #{p['playlist_id']} {p['playlist_title']}: {len(p['tracks'])} of {p['track_count']} tracks")
+        for t in p["tracks"]:
+            print(f"    {t['position']:>4}  {t['track_title']} — {t['artist_name'] or 'Unknown artist'}")
@@ -0,0 +1,300 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+import db
+import library
+import sharding
+
+# ---------------- SESSION MIXES ----------------
+# each operation calls the same db functions the Streamlit pages use
+def _browse_tracks(rnd, ctx):
+    db.fetch_all("Tracks")
+
+def _browse_join(rnd, ctx):
+    db.join_tracks_albums_artists()
+
+def _open_playlist(rnd, ctx):
+    db.get_tracks_in_playlist(rnd.choice(ctx["playlists"]))
+
+def _user_playlists(rnd, ctx):
+    db.get_playlists_for_user(rnd.choice(ctx["users"])[0])
+
+def _user_library(rnd, ctx):
+    for _ in library.get_library(rnd.choice(ctx["users"])[0], track_limit=50):
+        pass
+
+def _add_track_to_playlist(rnd, ctx):
+    db.add_track_to_playlist(rnd.choice(ctx["playlists"]), rnd.choice(ctx["tracks"]), rnd.randint(1, 1000))
+
+def _remove_track_from_playlist(rnd, ctx):
+    db.remove_track_from_playlist(rnd.choice(ctx["playlists"]), rnd.choice(ctx["tracks"]))
+
+def _update_user(rnd, ctx):
+    # rewrite the user's current values so repeated runs leave the data unchanged
+    db.update_user(*rnd.choice(ctx["users"]))
+
+OPERATIONS = {
+    "browse_tracks": _browse_tracks,
+    "browse_join": _browse_join,
+    "open_playlist": _open_playlist,
+    "user_playlists": _user_playlists,
+    "user_library": _user_library,
+    "add_track_to_playlist": _add_track_to_playlist,
+    "remove_track_from_playlist": _remove_track_from_playlist,
+    "update_user": _update_user,
+}
+
+MIXES = {
+    "session": {"browse_tracks": 30, "open_playlist": 30, "user_playlists": 15,
+                "add_track_to_playlist": 10, "remove_track_from_playlist": 5, "update_user": 10},
+    "read_heavy": {"browse_tracks": 40, "browse_join": 20, "open_playlist": 30, "user_playlists": 10},
+    "write_heavy": {"add_track_to_playlist": 35, "remove_track_from_playlist": 25, "update_user": 20, "open_playlist": 20},
+}
+
+def parse_mix(text):
+    # a named mix, or "op=weight,op=weight"
+    if text in MIXES:
+        return dict(MIXES[text])
+    mix = {}
+    for part in text.split(","):
+        op, _, weight = part.partition("=")
+        if op.strip() not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {op.strip()}")
+        mix[op.strip()] = float(weight or 1)
+    return mix
+
+# ---------------- INSTRUMENTED CONNECTIONS ----------------
+# connections are opened with timeout=0 and retried here instead of inside SQLite,
+# so every SQLITE_BUSY and the time spent waiting for the lock can be counted.
+# the overall deadline matches get_conn()'s timeout=10.
+BUSY_TIMEOUT = 10.0
+_local = threading.local()
+
+def _retry(fn, *args):
+    deadline, backoff = None, 0.001
+    while True:
+        try:
+            return fn(*args)
+        except sqlite3.OperationalError as e:
+            msg = str(e)
+            if "locked" not in msg and "busy" not in msg:
+                raise
+            now = time.perf_counter()
+            deadline = deadline or now + BUSY_TIMEOUT
+            _local.busy += 1
+            if now >= deadline:
+                raise
+            pause = min(backoff, deadline - now)
+            time.sleep(pause)
+            _local.wait += pause
+            backoff = min(backoff * 2, 0.05)
+
+class InstrumentedCursor(sqlite3.Cursor):
+    def execute(self, sql, params=()):
+        return _retry(super().execute, sql, params)
+
+    def executemany(self, sql, seq):
+        return _retry(super().executemany, sql, seq)
+
+    def executescript(self, script):
+        return _retry(super().executescript, script)
+
+class InstrumentedConnection(sqlite3.Connection):
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq):
+        return self.cursor().executemany(sql, seq)
+
+    def commit(self):
+        return _retry(super().commit)
+
+def instrumented_get_conn():
+    conn = sqlite3.connect(db.DB_PATH, check_same_thread=False, timeout=0, factory=InstrumentedConnection)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+# ---------------- WORKERS ----------------
+def _load_context(path):
+    conn = sqlite3.connect(path)
+    ctx = {
+        "playlists": [r["playlist_id"] for r in db.get_all_playlists()],
+        "tracks": [r[0] for r in conn.execute("SELECT track_id FROM Tracks")],
+        "users": [tuple(r) for r in conn.execute("SELECT user_id, f_name, l_name, email FROM Users")],
+    }
+    conn.close()
+    if not all(ctx.values()):
+        raise SystemExit("Load test needs at least one playlist, track and user in the database.")
+    return ctx
+
+def _thread_worker(mix, ctx, seed, deadline, max_ops, samples):
+    rnd = random.Random(seed)
+    ops, weights = list(mix), list(mix.values())
+    done = 0
+    while time.perf_counter() < deadline and (max_ops is None or done < max_ops):
+        op = rnd.choices(ops, weights)[0]
+        _local.busy, _local.wait = 0, 0.0
+        error = None
+        start = time.perf_counter()
+        try:
+            OPERATIONS[op](rnd, ctx)
+        except sqlite3.Error as e:
+            error = type(e).__name__ + (": busy" if "locked" in str(e) or "busy" in str(e) else "")
+        samples.append((op, time.perf_counter() - start, _local.wait, _local.busy, error))
+        done += 1
+
+def _run_process(path, mix, threads, duration, max_ops, seed):
+    db.DB_PATH = path
+    db.get_conn = instrumented_get_conn
+    # _load_context goes through _retry on this thread before any worker starts
+    _local.busy, _local.wait = 0, 0.0
+    ctx = _load_context(path)
+    samples = []
+    deadline = time.perf_counter() + duration
+    workers = [threading.Thread(target=_thread_worker, args=(mix, ctx, seed * 1000 + i, deadline, max_ops, samples))
+               for i in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return samples
+
+# ---------------- REPORT ----------------
+def _percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+def summarize(samples, elapsed, config):
+    per_op = {}
+    for op, latency, wait, busy, error in samples:
+        per_op.setdefault(op, []).append((latency, wait, busy, error))
+    ops = {}
+    for op, rows in sorted(per_op.items()):
+        lat = sorted(r[0] for r in rows)
+        ops[op] = {
+            "count": len(rows),
+            "throughput": len(rows) / elapsed,
+            "p50_ms": _percentile(lat, 0.50) * 1e3,
+            "p95_ms": _percentile(lat, 0.95) * 1e3,
+            "p99_ms": _percentile(lat, 0.99) * 1e3,
+            "max_ms": lat[-1] * 1e3,
+            "lock_wait_ms_total": sum(r[1] for r in rows) * 1e3,
+            "lock_wait_ms_mean": sum(r[1] for r in rows) * 1e3 / len(rows),
+            "busy_retries": sum(r[2] for r in rows),
+            "busy_errors": sum(1 for r in rows if r[3] and r[3].endswith("busy")),
+            "errors": sum(1 for r in rows if r[3]),
+        }
+    return {
+        "config": config,
+        "environment": {"python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+                        "platform": platform.platform(), "cpus": os.cpu_count()},
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "elapsed_seconds": elapsed,
+        "total_ops": len(samples),
+        "throughput": len(samples) / elapsed,
+        "operations": ops,
+    }
+
+def print_report(report):
+    cfg = report["config"]
+    print(f"mix={cfg['mix_name']} processes={cfg['processes']} threads={cfg['threads']} "
+          f"elapsed={report['elapsed_seconds']:.1f}s ops={report['total_ops']} ({report['throughput']:.0f} ops/s)")
+    print(f"{'operation':<28} {'ops':>7} {'ops/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'wait ms':>9} {'busy':>6} {'errors':>6}")
+    for op, r in report["operations"].items():
+        print(f"{op:<28} {r['count']:>7} {r['throughput']:>8.1f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+              f"{r['p99_ms']:>8.2f} {r['lock_wait_ms_total']:>9.1f} {r['busy_retries']:>6} {r['errors']:>6}")
+
+def compare(before, after):
+    print(f"{'operation':<28} {'ops/s before':>12} {'after':>8} {'p95 before':>11} {'after':>8} {'errors':>13}")
+    for op in sorted(set(before["operations"]) | set(after["operations"])):
+        b = before["operations"].get(op)
+        a = after["operations"].get(op)
+        if b is None or a is None:
+            print(f"{op:<28} {'(only in one report)':>12}")
+            continue
+        print(f"{op:<28} {b['throughput']:>12.1f} {a['throughput']:>8.1f} {b['p95_ms']:>11.2f} {a['p95_ms']:>8.2f} "
+              f"{b['errors']:>6} -> {a['errors']:<4}")
+    print(f"{'total':<28} {before['throughput']:>12.1f} {after['throughput']:>8.1f}")
+
+# ---------------- CLI ----------------
+def run(args):
+    mix = parse_mix(args.mix)
+    path = args.db
+    workdir = None
+    if not args.in_place:
+        # writes go to a throwaway copy unless --in-place is given
+        workdir = tempfile.mkdtemp(prefix="loadtest_")
+        path = shutil.copy(args.db, os.path.join(workdir, os.path.basename(args.db)))
+    db.DB_PATH = path
+    db.init_db()
+    if workdir:
+        # the copy keeps ShardConfig/PlaylistShards, so its shard files have to come along
+        conn = db.get_conn()
+        for shard, shard_file in sharding.shard_files(conn, os.path.abspath(args.db)):
+            shutil.copy(shard_file, sharding.shard_path(path, shard))
+        conn.close()
+
+    config = {"db": args.db, "mix_name": args.mix, "mix": mix, "processes": args.processes, "threads": args.threads,
+              "duration": args.duration, "max_ops": args.ops, "seed": args.seed}
+    start = time.perf_counter()
+    if args.processes <= 1:
+        samples = _run_process(path, mix, args.threads, args.duration, args.ops, args.seed)
+    else:
+        with multiprocessing.Pool(args.processes) as pool:
+            parts = pool.starmap(_run_process, [(path, mix, args.threads, args.duration, args.ops, args.seed + p)
+                                                for p in range(args.processes)])
+        samples = [s for part in parts for s in part]
+    report = summarize(samples, time.perf_counter() - start, config)
+
+    print_report(report)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.out}")
+    if workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the music streaming DB layer.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_run = sub.add_parser("run", help="replay a session mix against the database")
+    p_run.add_argument("--db", default=db.DB_PATH)
+    p_run.add_argument("--mix", default="session", help=f"one of {', '.join(MIXES)} or 'op=weight,...'")
+    p_run.add_argument("--threads", type=int, default=8)
+    p_run.add_argument("--processes", type=int, default=1)
+    p_run.add_argument("--duration", type=float, default=10.0, help="seconds per worker")
+    p_run.add_argument("--ops", type=int, default=None, help="stop each thread after this many operations")
+    p_run.add_argument("--seed", type=int, default=1)
+    p_run.add_argument("--out", help="write the JSON report here")
+    p_run.add_argument("--in-place", action="store_true", help="run against --db itself instead of a copy")
+    p_cmp = sub.add_parser("compare", help="compare two JSON reports")
+    p_cmp.add_argument("before")
+    p_cmp.add_argument("after")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        run(args)
+    else:
+        with open(args.before, encoding="utf-8") as f:
+            before = json.load(f)
+        with open(args.after, encoding="utf-8") as f:
+            after = json.load(f)
+        compare(before, after)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+import glob
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+import sharding
+
+BACKUP_DIR = "backups"   # created next to the database file
+KEEP_BACKUPS = 7
+
+# seconds between runs of each task when the scheduler is on
+SCHEDULE = {
+    "quick_check": 6 * 3600,
+    "analyze": 24 * 3600,
+    "incremental_vacuum": 3600,
+    "backup": 24 * 3600,
+    "vacuum_into": 7 * 24 * 3600,
+}
+
+# ---------------- STATS ----------------
+def _db_file(conn):
+    return conn.execute("PRAGMA database_list").fetchone()[2]
+
+def db_stats(conn):
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    path = _db_file(conn)
+    return {
+        "file_size": os.path.getsize(path) if path and os.path.exists(path) else page_size * page_count,
+        "page_size": page_size,
+        "page_count": page_count,
+        "free_pages": free_pages,
+        "free_ratio": free_pages / page_count if page_count else 0.0,
+        "auto_vacuum": {0: "none", 1: "full", 2: "incremental"}[conn.execute("PRAGMA auto_vacuum").fetchone()[0]],
+    }
+
+def last_runs(conn):
+    return conn.execute("""
+        SELECT m.task, m.started_at, m.duration_seconds, m.status, m.detail
+        FROM MaintenanceLog m
+        JOIN (SELECT task, MAX(log_id) AS log_id FROM MaintenanceLog GROUP BY task) l ON m.log_id = l.log_id
+        ORDER BY m.task
+    """).fetchall()
+
+def _log(conn, task, started, duration, status, detail):
+    conn.execute("INSERT INTO MaintenanceLog (task, started_at, duration_seconds, status, detail) VALUES (?, ?, ?, ?, ?)",
+                 (task, started, duration, status, detail))
+    conn.commit()
+
+# ---------------- TASKS ----------------
+def _backup_dir(conn):
+    path = os.path.join(os.path.dirname(_db_file(conn)), BACKUP_DIR)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def _backup_name(conn, prefix):
+    return os.path.join(_backup_dir(conn), f"{prefix}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.db")
+
+def _prune(conn, prefix):
+    # a backup's shard files (backup-....shardN.db) are kept or removed together with it
+    folder = _backup_dir(conn)
+    files = sorted(f for f in os.listdir(folder)
+                   if f.startswith(prefix + "-") and f.endswith(".db") and ".shard" not in f)
+    for f in files[:-KEEP_BACKUPS]:
+        path = os.path.join(folder, f)
+        os.remove(path)
+        for shard_file in glob.glob(glob.escape(os.path.splitext(path)[0]) + ".shard*.db"):
+            os.remove(shard_file)
+
+class _BackupRestarted(Exception):
+    pass
+
+def _stepped_backup(source, dest, pages_per_step, pause, max_restarts):
+    # copies a few pages at a time and sleeps between steps, so writers on the live
+    # database are only ever blocked for one small step instead of the whole copy.
+    # A write from another connection sends the copy back to page 0; after max_restarts
+    # of those the rest is copied in one step, which holds the read lock until it is done.
+    target = sqlite3.connect(dest)
+    steps, restarts, last = [0], [0], [None]
+
+    def progress(status, remaining, total):
+        steps[0] += 1
+        if last[0] is not None and remaining > last[0]:
+            restarts[0] += 1
+            if restarts[0] > max_restarts:
+                raise _BackupRestarted
+        last[0] = remaining
+        if remaining:
+            time.sleep(pause)
+
+    one_step = False
+    try:
+        try:
+            source.backup(target, pages=pages_per_step, progress=progress)
+        except _BackupRestarted:
+            source.backup(target, pages=-1)
+            steps[0] += 1
+            one_step = True
+    finally:
+        target.close()
+    return steps[0], restarts[0], one_step
+
+def online_backup(conn, dest=None, pages_per_step=256, pause=0.005, max_restarts=3):
+    # the catalog and then each shard file, copied next to dest under the names
+    # sharding.shard_path gives them, so a restored backup finds its shards
+    dest = dest or _backup_name(conn, "backup")
+    steps, restarts, one_step = _stepped_backup(conn, dest, pages_per_step, pause, max_restarts)
+    shards = sharding.shard_files(conn)
+    for shard, path in shards:
+        sconn = sqlite3.connect(path)
+        try:
+            s, r, o = _stepped_backup(sconn, sharding.shard_path(dest, shard), pages_per_step, pause, max_restarts)
+        finally:
+            sconn.close()
+        steps, restarts, one_step = steps + s, restarts + r, one_step or o
+    _prune(conn, "backup")
+    detail = f"{dest} ({steps} steps, {restarts} restarts"
+    if shards:
+        detail += f", {len(shards)} shard files"
+    if one_step:
+        detail += ", rest copied in one step"
+    return detail + ")"
+
+def vacuum_into(conn, dest=None):
+    # compacted, defragmented copy of the live database and of each shard file
+    dest = dest or _backup_name(conn, "compact")
+    conn.execute("VACUUM INTO ?", (dest,))
+    for shard, path in sharding.shard_files(conn):
+        sconn = sqlite3.connect(path)
+        try:
+            sconn.execute("VACUUM INTO ?", (sharding.shard_path(dest, shard),))
+        finally:
+            sconn.close()
+    _prune(conn, "compact")
+    return dest
+
+def enable_incremental_vacuum(conn):
+    # one-off: auto_vacuum can only change on an empty database or through a full VACUUM
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    return "auto_vacuum=incremental"
+
+def incremental_vacuum(conn, pages_per_step=256, min_free_ratio=0.1):
+    stats = db_stats(conn)
+    if stats["auto_vacuum"] != "incremental":
+        return "skipped: auto_vacuum is not incremental (run enable_incremental_vacuum once)"
+    if stats["free_ratio"] < min_free_ratio:
+        return f"skipped: free ratio {stats['free_ratio']:.1%}"
+    # release free pages in small chunks, each its own short write transaction
+    released = 0
+    while True:
+        before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if not before:
+            break
+        conn.execute(f"PRAGMA incremental_vacuum({pages_per_step})").fetchall()
+        conn.commit()
+        released += before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return f"released {released} pages"
+
+def analyze(conn):
+    conn.execute("ANALYZE")
+    conn.commit()
+    return "ok"
+
+def quick_check(conn):
+    rows = [r[0] for r in conn.execute("PRAGMA quick_check").fetchall()]
+    if rows != ["ok"]:
+        raise sqlite3.DatabaseError("; ".join(rows[:5]))
+    return "ok"
+
+TASKS = {
+    "quick_check": quick_check,
+    "analyze": analyze,
+    "incremental_vacuum": incremental_vacuum,
+    "backup": online_backup,
+    "vacuum_into": vacuum_into,
+}
+
+def run_task(conn, task):
+    started = datetime.now().isoformat(timespec="seconds")
+    t0 = time.perf_counter()
+    try:
+        detail = TASKS[task](conn)
+        status = "skipped" if detail.startswith("skipped") else "ok"
+    except (sqlite3.Error, OSError) as e:
+        detail, status = str(e), "error"
+    _log(conn, task, started, time.perf_counter() - t0, status, detail)
+    return status, detail
+
+def due_tasks(conn, now=None):
+    now = now or datetime.now()
+    last = {r[0]: r[1] for r in last_runs(conn)}
+    return [task for task, interval in SCHEDULE.items()
+            if task not in last or (now - datetime.fromisoformat(last[task])).total_seconds() >= interval]
+
+def run_due(conn):
+    return {task: run_task(conn, task) for task in due_tasks(conn)}
+
+# ---------------- SCHEDULER ----------------
+# one background thread per process; the Streamlit app starts it on first run
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def _scheduler_loop(get_conn, poll_seconds, stop):
+    while not stop.wait(poll_seconds):
+        conn = get_conn()
+        try:
+            run_due(conn)
+        except sqlite3.Error:
+            pass  # the next poll tries again
+        finally:
+            conn.close()
+
+def start_scheduler(get_conn, poll_seconds=300):
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            stop = threading.Event()
+            thread = threading.Thread(target=_scheduler_loop, args=(get_conn, poll_seconds, stop),
+                                      name="db-maintenance", daemon=True)
+            thread.start()
+            _scheduler = (thread, stop)
+    return _scheduler
+
+def stop_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is not None:
+            _scheduler[1].set()
+            _scheduler = None
+
+# ---------------- CLI ----------------
+# python maintenance.py [stats | due | <task> | enable-incremental-vacuum] [--db path]
+if __name__ == "__main__":
+    import db
+    args = sys.argv[1:]
+    if "--db" in args:
+        i = args.index("--db")
+        db.DB_PATH = args[i + 1]
+        del args[i:i + 2]
+    db.init_db()
+    conn = db.get_conn()
+    command = args[0] if args else "stats"
+    if command == "stats":
+        for k, v in db_stats(conn).items():
+            print(f"{k}: {v}")
+        for r in last_runs(conn):
+            print(dict(r))
+    elif command == "due":
+        for task, (status, detail) in run_due(conn).items():
+            print(f"{task}: {status} {detail}")
+    elif command == "enable-incremental-vacuum":
+        print(enable_incremental_vacuum(conn))
+    elif command in TASKS:
+        print(*run_task(conn, command))
+    else:
+        print(f"usage: maintenance.py [stats | due | enable-incremental-vacuum | {' | '.join(TASKS)}] [--db path]")
+    conn.close()
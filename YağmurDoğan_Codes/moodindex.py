@@ -0,0 +1,407 @@
+import re
+import sys
+import threading
+
+import numpy as np
+
+import indexcache
+from resultset import ResultSet
+
+# moods are interned in the Moods dimension ("Dark", "dark " and "DARK" are one row) and
+# TrackMoods holds (track_id, mood_ref). For filtering, each mood's tracks are kept in a
+# compressed bitmap, so "Dark AND Hypnotic NOT Aggressive" is a few word-wise ANDs over
+# millions of tracks instead of one self-join per mood.
+
+# ---------------- INTERNING ----------------
+def normalize(name):
+    # trimmed, inner whitespace collapsed and case-folded. Dotted and dotless i fold together
+    # so "TRIPPY", "trippy" and Turkish "KARANLIK" / "karanlık" each stay one mood whichever
+    # keyboard typed them.
+    return " ".join(name.split()).replace("İ", "i").casefold().replace("ı", "i")
+
+def intern(conn, name):
+    # mood_ref for a mood name, adding it to Moods on first use; the first spelling is kept for display
+    name = " ".join(name.split())
+    norm = normalize(name)
+    row = conn.execute("SELECT mood_ref FROM Moods WHERE name_norm=?", (norm,)).fetchone()
+    if row is not None:
+        return row[0]
+    return conn.execute("INSERT INTO Moods (name, name_norm) VALUES (?, ?)", (name, norm)).lastrowid
+
+# ---------------- BITMAPS ----------------
+# roaring-style: track ids are split by their high 16 bits into chunks of 65536. A chunk
+# with up to 4096 members is a sorted uint16 array (2 bytes per track), a fuller one a
+# fixed 8 KB bitset. Empty chunks are not stored at all.
+ARRAY_MAX = 4096
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+def _dense(c):
+    if c.dtype == np.uint8:
+        return c
+    bits = np.zeros(65536, dtype=np.bool_)
+    bits[c] = True
+    return np.packbits(bits, bitorder="little")
+
+def _sparse(c):
+    if c.dtype == np.uint16:
+        return c
+    return np.flatnonzero(np.unpackbits(c, bitorder="little")).astype(np.uint16)
+
+def _card(c):
+    if c.dtype == np.uint16:
+        return len(c)
+    if hasattr(np, "bitwise_count"):   # NumPy 2
+        return int(np.bitwise_count(c.view(np.uint64)).sum())
+    return int(_POPCOUNT[c].sum(dtype=np.int64))
+
+def _test(bitset, low):
+    # bool mask: which of the sorted uint16 values are set in the bitset
+    return (bitset[low >> 3] >> (low & 7).astype(np.uint8)) & 1 == 1
+
+def _shrink(c):
+    # None for an empty result. A bitset result stays a bitset even when it gets sparse:
+    # query results are short-lived and converting costs more than the operation itself
+    return c if c.any() else None
+
+def _and(a, b):
+    if a.dtype == np.uint8 and b.dtype == np.uint8:
+        return _shrink(a & b)
+    if a.dtype == np.uint8:
+        a, b = b, a
+    if b.dtype == np.uint8:
+        return _shrink(a[_test(b, a)])
+    return _shrink(np.intersect1d(a, b, assume_unique=True))
+
+def _or(a, b):
+    if a.dtype == np.uint16 and b.dtype == np.uint16:
+        c = np.union1d(a, b)
+        return _dense(c) if len(c) > ARRAY_MAX else c
+    return _dense(a) | _dense(b)
+
+def _andnot(a, b):
+    if a.dtype == np.uint16:
+        if b.dtype == np.uint8:
+            return _shrink(a[~_test(b, a)])
+        return _shrink(np.setdiff1d(a, b, assume_unique=True))
+    return _shrink(a & ~_dense(b))
+
+class Bitmap:
+    __slots__ = ("chunks",)
+
+    def __init__(self, chunks=None):
+        self.chunks = chunks or {}   # high 16 bits -> container
+
+    @classmethod
+    def from_sorted(cls, ids):
+        # ids: sorted, unique, non-negative integers (a NumPy array or anything np.asarray takes)
+        ids = np.asarray(ids, dtype=np.int64)
+        chunks = {}
+        if len(ids):
+            high = ids >> 16
+            for part in np.split(ids, np.flatnonzero(np.diff(high)) + 1):
+                low = (part & 0xFFFF).astype(np.uint16)
+                chunks[int(part[0] >> 16)] = _dense(low) if len(low) > ARRAY_MAX else low
+        return cls(chunks)
+
+    def __len__(self):
+        return sum(_card(c) for c in self.chunks.values())
+
+    def __contains__(self, x):
+        c = self.chunks.get(x >> 16)
+        if c is None:
+            return False
+        low = x & 0xFFFF
+        if c.dtype == np.uint8:
+            return bool(c[low >> 3] >> (low & 7) & 1)
+        i = np.searchsorted(c, low)
+        return i < len(c) and c[i] == low
+
+    def add(self, x):
+        high, low = x >> 16, x & 0xFFFF
+        c = self.chunks.get(high)
+        if c is None:
+            self.chunks[high] = np.array([low], dtype=np.uint16)
+        elif c.dtype == np.uint8:
+            c = self.chunks[high] = c.copy()
+            c[low >> 3] |= 1 << (low & 7)
+        else:
+            i = np.searchsorted(c, low)
+            if i < len(c) and c[i] == low:
+                return
+            c = np.insert(c, i, low)
+            self.chunks[high] = _dense(c) if len(c) > ARRAY_MAX else c
+
+    def discard(self, x):
+        high, low = x >> 16, x & 0xFFFF
+        c = self.chunks.get(high)
+        if c is None:
+            return
+        if c.dtype == np.uint8:
+            c = self.chunks[high] = c.copy()
+            c[low >> 3] &= ~(1 << (low & 7)) & 0xFF
+            return
+        i = np.searchsorted(c, low)
+        if i < len(c) and c[i] == low:
+            c = np.delete(c, i)
+            if len(c):
+                self.chunks[high] = c
+            else:
+                del self.chunks[high]
+
+    def _merge(self, other, op, keep_left, keep_right):
+        chunks = {}
+        for high, c in self.chunks.items():
+            d = other.chunks.get(high)
+            if d is not None:
+                r = op(c, d)
+                if r is not None:
+                    chunks[high] = r
+            elif keep_left:
+                chunks[high] = c
+        if keep_right:
+            for high, d in other.chunks.items():
+                if high not in self.chunks:
+                    chunks[high] = d
+        # containers are shared with the operands, which is safe because add/discard never
+        # change a container in place
+        return Bitmap(chunks)
+
+    def __and__(self, other):
+        return self._merge(other, _and, False, False)
+
+    def __or__(self, other):
+        return self._merge(other, _or, True, True)
+
+    def __sub__(self, other):
+        return self._merge(other, _andnot, True, False)
+
+    def to_array(self):
+        # members in ascending order as int64
+        parts = []
+        for high in sorted(self.chunks):
+            low = _sparse(self.chunks[high]).astype(np.int64)
+            parts.append(low + (high << 16))
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def nbytes(self):
+        return sum(c.nbytes for c in self.chunks.values())
+
+# ---------------- QUERY PARSER ----------------
+# Dark AND Hypnotic NOT Aggressive  ->  (Dark & Hypnotic) - Aggressive
+# (Dark OR Trippy) AND NOT Calm     ->  (Dark | Trippy) - Calm
+# operators are upper-case AND / OR / NOT; other words, spaces included, name a mood
+# ("Feel Good AND Calm"). A NOT after an operand means AND NOT.
+_TOKENS = re.compile(r"\(|\)|[^\s()]+")
+_OPERATORS = ("AND", "OR", "NOT", "(", ")")
+
+def _tokenize(text):
+    tokens, words = [], []
+    for tok in _TOKENS.findall(text):
+        if tok in _OPERATORS:
+            if words:
+                tokens.append(("MOOD", " ".join(words)))
+                words = []
+            tokens.append((tok, None))
+        else:
+            words.append(tok)
+    if words:
+        tokens.append(("MOOD", " ".join(words)))
+    return tokens
+
+def parse(text):
+    # nested tuples: ("mood", name) | ("not", x) | ("and", a, b) | ("or", a, b)
+    tokens = _tokenize(text)
+    pos = [0]
+
+    def peek():
+        return tokens[pos[0]][0] if pos[0] < len(tokens) else None
+
+    def take(kind):
+        if peek() != kind:
+            found = tokens[pos[0]][1] or tokens[pos[0]][0] if pos[0] < len(tokens) else "end of query"
+            raise ValueError(f"expected {'a mood' if kind == 'MOOD' else kind}, found {found!r}")
+        pos[0] += 1
+        return tokens[pos[0] - 1][1]
+
+    def expr():
+        node = term()
+        while peek() == "OR":
+            take("OR")
+            node = ("or", node, term())
+        return node
+
+    def term():
+        node = factor()
+        while peek() in ("AND", "NOT", "(", "MOOD"):
+            if peek() == "AND":
+                take("AND")
+            node = ("and", node, factor())
+        return node
+
+    def factor():
+        if peek() == "NOT":
+            take("NOT")
+            return ("not", factor())
+        if peek() == "(":
+            take("(")
+            node = expr()
+            take(")")
+            return node
+        return ("mood", take("MOOD"))
+
+    if not tokens:
+        raise ValueError("empty mood query")
+    node = expr()
+    if pos[0] != len(tokens):
+        raise ValueError(f"unexpected {tokens[pos[0]][1] or tokens[pos[0]][0]!r}")
+    return node
+
+# ---------------- INDEX ----------------
+class MoodIndex:
+    def __init__(self):
+        self.refs = {}          # name_norm -> mood_ref
+        self.names = {}         # mood_ref -> display name
+        self.moods = {}         # mood_ref -> Bitmap of track_ids
+        self.tracks = Bitmap()  # every track; NOT is taken against it
+        self.lock = threading.Lock()
+
+    def add(self, track_id, mood_ref):
+        with self.lock:
+            bitmap = self.moods.get(mood_ref)
+            if bitmap is None:
+                bitmap = self.moods[mood_ref] = Bitmap()
+            bitmap.add(track_id)
+            self.tracks.add(track_id)
+
+    def remove(self, track_id, mood_ref):
+        with self.lock:
+            bitmap = self.moods.get(mood_ref)
+            if bitmap is not None:
+                bitmap.discard(track_id)
+
+    def add_track(self, track_id):
+        with self.lock:
+            self.tracks.add(track_id)
+
+    def delete_track(self, track_id):
+        with self.lock:
+            for bitmap in self.moods.values():
+                bitmap.discard(track_id)
+            self.tracks.discard(track_id)
+
+    def learn(self, mood_ref, name):
+        with self.lock:
+            self.refs[normalize(name)] = mood_ref
+            self.names.setdefault(mood_ref, name)
+
+    def bitmap(self, name):
+        # a snapshot of the chunk dict: a one-mood query hands this bitmap to callers that
+        # read it outside the lock while add/discard replace chunks in the live one
+        bitmap = self.moods.get(self.refs.get(normalize(name)))
+        return Bitmap(dict(bitmap.chunks)) if bitmap is not None else Bitmap()
+
+    def _eval(self, node):
+        op = node[0]
+        if op == "mood":
+            return self.bitmap(node[1])
+        if op == "not":
+            return self.tracks - self._eval(node[1])
+        if op == "or":
+            return self._eval(node[1]) | self._eval(node[2])
+        # a AND NOT b is one difference, without building the complement of b
+        left, right = node[1], node[2]
+        if right[0] == "not":
+            return self._eval(left) - self._eval(right[1])
+        if left[0] == "not":
+            return self._eval(right) - self._eval(left[1])
+        return self._eval(left) & self._eval(right)
+
+    def query(self, expression):
+        # Bitmap of the matching track_ids; expression is a query string or a parse() tree
+        node = parse(expression) if isinstance(expression, str) else expression
+        with self.lock:
+            return self._eval(node)
+
+    def counts(self):
+        with self.lock:
+            return {self.names.get(ref, ref): len(b) for ref, b in self.moods.items()}
+
+    def nbytes(self):
+        return self.tracks.nbytes() + sum(b.nbytes() for b in self.moods.values())
+
+def _int_columns(conn, sql):
+    # integer columns as int64 arrays over the fetch buffers, no per-row objects
+    rs = ResultSet.from_cursor(conn.execute(sql))
+    return list(rs.to_numpy().values()) if len(rs) else None
+
+def build_index(conn):
+    index = MoodIndex()
+    for r in conn.execute("SELECT mood_ref, name FROM Moods"):
+        index.learn(r[0], r[1])
+    tracks = _int_columns(conn, "SELECT track_id FROM Tracks ORDER BY track_id")
+    if tracks is not None:
+        index.tracks = Bitmap.from_sorted(tracks[0])
+    # deleted tracks can leave TrackMoods rows behind when foreign keys are off, hence the join
+    pairs = _int_columns(conn, """
+        SELECT m.mood_ref, m.track_id FROM TrackMoods m
+        JOIN Tracks t ON t.track_id = m.track_id
+        ORDER BY m.mood_ref, m.track_id
+    """)
+    if pairs is not None:
+        refs, track_ids = pairs
+        bounds = np.flatnonzero(np.diff(refs)) + 1
+        for start, end in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(refs)]))):
+            index.moods[int(refs[start])] = Bitmap.from_sorted(track_ids[start:end])
+    return index
+
+# ---------------- PER-DATABASE INDEXES ----------------
+def get_index(conn):
+    # built on first query and kept until the tables change behind its back (see indexcache.py)
+    return indexcache.get(conn, "moods", build_index)
+
+def drop_index(conn):
+    indexcache.drop(conn, "moods")
+
+# write hooks run inside the writer's transaction, before its commit, so the version bump
+# commits (or rolls back) with the data; they patch a built index, an unbuilt one is read
+# fresh from the tables
+def on_add(conn, track_id, mood_ref, name=None):
+    def patch(index):
+        if name is not None:
+            index.learn(mood_ref, name)
+        index.add(track_id, mood_ref)
+    indexcache.changed(conn, "moods", patch)
+
+def on_remove(conn, track_id, mood_ref):
+    indexcache.changed(conn, "moods", lambda index: index.remove(track_id, mood_ref))
+
+def on_add_track(conn, track_id):
+    indexcache.changed(conn, "moods", lambda index: index.add_track(track_id))
+
+def on_delete_tracks(conn, track_ids):
+    def patch(index):
+        for track_id in track_ids:
+            index.delete_track(track_id)
+    indexcache.changed(conn, "moods", patch)
+
+def query(conn, expression):
+    return get_index(conn).query(expression)
+
+# ---------------- CLI ----------------
+# python moodindex.py "Dark AND Hypnotic NOT Aggressive" [--db path]
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    import db
+    if "--db" in args:
+        i = args.index("--db")
+        db.DB_PATH = args[i + 1]
+        del args[i:i + 2]
+    if len(args) != 1:
+        print('usage: moodindex.py "<mood query>" [--db path]')
+        sys.exit(1)
+    db.init_db()
+    conn = db.get_conn()
+    index = get_index(conn)
+    ids = index.query(args[0]).to_array()
+    print(f"{len(ids)} tracks: {', '.join(str(t) for t in ids[:20])}{' ...' if len(ids) > 20 else ''}")
+    conn.close()
@@ -0,0 +1,337 @@
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import db
+import sharding
+
+PAGE_SIZE = 64
+PREFETCH = 5
+ANCHOR_STRIDE = 256
+REPEAT_MODES = ("off", "all", "one")
+
+# a queue never loads the whole playlist: it walks (position, track_id) keys a page at a
+# time through idx_playlist_tracks_position and joins Tracks/Albums/Artists only for the
+# current track and the few after it, which a background thread fetches ahead of time.
+# Shuffle and seeks jump to an ordinal through anchors, the key of every 256th track,
+# collected by hopping along the index up to the furthest ordinal asked for. The first
+# jump into a long playlist pays for that walk (15-20 ms at 100k tracks when it lands
+# near the end), each later one at most 256 index steps
+
+# ---------------- SHUFFLE ----------------
+# keyed Feistel network over the smallest 2^(2h) >= n, cycle-walked back into 0..n-1.
+# It is a bijection on the playlist's ordinals computed one index at a time, so a
+# shuffled order is a few integers of state however long the playlist is.
+def _mix(x, key):
+    x = (x ^ key) * 0x9E3779B1 & 0xFFFFFFFF
+    x ^= x >> 16
+    x = x * 0x85EBCA6B & 0xFFFFFFFF
+    return x ^ (x >> 13)
+
+class Permutation:
+    def __init__(self, n, seed, rounds=4):
+        self.n = n
+        self.half = max(1, ((n - 1).bit_length() + 1) // 2)
+        self.mask = (1 << self.half) - 1
+        rnd = random.Random(seed)
+        self.keys = [rnd.getrandbits(32) for _ in range(rounds)]
+
+    def __len__(self):
+        return self.n
+
+    def _forward(self, x):
+        left, right = x >> self.half, x & self.mask
+        for key in self.keys:
+            left, right = right, left ^ (_mix(right, key) & self.mask)
+        return left << self.half | right
+
+    def _backward(self, x):
+        left, right = x >> self.half, x & self.mask
+        for key in reversed(self.keys):
+            left, right = right ^ (_mix(left, key) & self.mask), left
+        return left << self.half | right
+
+    def __getitem__(self, i):
+        # shuffled ordinal -> ordinal in position order
+        if not 0 <= i < self.n:
+            raise IndexError(i)
+        x = self._forward(i)
+        while x >= self.n:
+            x = self._forward(x)
+        return x
+
+    def index(self, x):
+        # ordinal in position order -> shuffled ordinal
+        if not 0 <= x < self.n:
+            raise ValueError(x)
+        i = self._backward(x)
+        while i >= self.n:
+            i = self._backward(i)
+        return i
+
+# ---------------- KEYS ----------------
+class _Keys:
+    # (position, track_id) by 0-based ordinal in position order, one page cached. The
+    # connections open on first use and again after close(); the page and the anchors
+    # survive close(). share= reuses another _Keys' anchors, so the prefetch thread and
+    # the caller walk the index once between them
+    def __init__(self, playlist_id, page_size, share=None):
+        self.playlist_id = playlist_id
+        self.page_size = page_size
+        self._catalog = self._conn = None
+        self.start, self.page = 0, []
+        # key of ordinal i * ANCHOR_STRIDE, a prefix of the playlist; only grown under the lock
+        self.anchors, self._anchors_lock = (share.anchors, share._anchors_lock) if share else ([], threading.Lock())
+
+    def _connect(self):
+        if self._catalog is None:
+            self._catalog = db.get_conn()
+            shard = sharding.shard_of_playlist(self._catalog, self.playlist_id) if sharding.shard_count(self._catalog) else None
+            self._conn = self._catalog if shard is None else sharding.connect_shard(sharding.catalog_path(self._catalog), shard)
+
+    @property
+    def catalog(self):
+        self._connect()
+        return self._catalog
+
+    @property
+    def conn(self):
+        self._connect()
+        return self._conn
+
+    def close(self):
+        if self._catalog is None:
+            return
+        if self._conn is not self._catalog:
+            self._conn.close()
+        self._catalog.close()
+        self._catalog = self._conn = None
+
+    def count(self):
+        # called whenever the queue starts a pass, so anchors from an older version of
+        # the playlist are dropped here
+        with self._anchors_lock:
+            self.anchors.clear()
+        return self.conn.execute("SELECT COUNT(*) FROM main.PlaylistTracks WHERE playlist_id=?", (self.playlist_id,)).fetchone()[0]
+
+    def _fetch(self, where, order, params=(), offset=0):
+        rows = self.conn.execute(f"SELECT position, track_id FROM main.PlaylistTracks WHERE playlist_id=? {where} "
+                                 f"ORDER BY {order} LIMIT ? OFFSET ?", (self.playlist_id,) + params + (self.page_size, offset))
+        return [(r[0], r[1]) for r in rows]
+
+    def _anchor(self, n):
+        anchors = self.anchors
+        if n < len(anchors):
+            return anchors[n]
+        with self._anchors_lock:
+            if not anchors:
+                anchors.extend(self._fetch("", "position, track_id")[:1])
+            while anchors and len(anchors) <= n:
+                hop = self.conn.execute("SELECT position, track_id FROM main.PlaylistTracks WHERE playlist_id=? "
+                                        "AND (position, track_id) > (?, ?) ORDER BY position, track_id LIMIT 1 OFFSET ?",
+                                        (self.playlist_id,) + anchors[-1] + (ANCHOR_STRIDE - 1,)).fetchone()
+                if hop is None:
+                    return None
+                anchors.append((hop[0], hop[1]))
+            return anchors[n] if anchors else None
+
+    def at(self, ordinal):
+        end = self.start + len(self.page)
+        if not self.start <= ordinal < end:
+            if self.page and ordinal == end:
+                # sequential play: keyset scan after the last key, no OFFSET
+                page = self._fetch("AND (position, track_id) > (?, ?)", "position, track_id", self.page[-1])
+                start = end
+            elif self.page and ordinal == self.start - 1:
+                page = self._fetch("AND (position, track_id) < (?, ?)", "position DESC, track_id DESC", self.page[0])[::-1]
+                start = self.start - len(page)
+            else:
+                # shuffle and seeks: from the nearest anchor below the ordinal
+                anchor = self._anchor(ordinal // ANCHOR_STRIDE)
+                if anchor is None:
+                    return None
+                page = self._fetch("AND (position, track_id) >= (?, ?)", "position, track_id", anchor, offset=ordinal % ANCHOR_STRIDE)
+                start = ordinal
+            if not page:
+                return None
+            self.start, self.page = start, page
+        if not self.start <= ordinal < self.start + len(self.page):
+            return None
+        return self.page[ordinal - self.start]
+
+# ---------------- METADATA ----------------
+TRACK_SQL = """
+    SELECT t.track_id, t.track_title, t.duration_seconds, t.track_genre,
+           a.title AS album_title, ar.name AS artist_name
+    FROM Tracks t
+    LEFT JOIN Albums a ON t.album_id = a.album_id
+    LEFT JOIN Artists ar ON a.artist_id = ar.artist_id
+    WHERE t.track_id IN ({})
+"""
+
+def _track_rows(conn, track_ids):
+    sql = TRACK_SQL.format(",".join("?" * len(track_ids)))
+    return {r["track_id"]: dict(r) for r in conn.execute(sql, track_ids)}
+
+# ---------------- QUEUE ----------------
+class PlaybackQueue:
+    def __init__(self, playlist_id, shuffle=False, seed=None, repeat="off", prefetch=PREFETCH, page_size=PAGE_SIZE):
+        if repeat not in REPEAT_MODES:
+            raise ValueError(f"repeat must be one of {REPEAT_MODES}")
+        self.playlist_id = playlist_id
+        self.repeat = repeat
+        self.prefetch = prefetch
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.index = 0          # ordinal in the current play order
+        self.loop = 0           # passes completed under repeat="all"; each one reshuffles
+        self.order = None       # Permutation while shuffling
+        self._keys = _Keys(playlist_id, page_size)
+        self._cache = {}        # track_id -> joined row for the current and upcoming tracks
+        self._window = (None, 0, [])   # (order, first index, keys) resolved by the last prefetch
+        self._lock = threading.Lock()
+        self._pool = None          # the prefetch thread, started by _schedule
+        self._pending = None
+        self._worker_keys = None   # the prefetch thread's own connections
+        if shuffle:
+            self.order = Permutation(self._keys.count(), f"{self.seed}:0")
+        self._schedule()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        # releases the prefetch thread and every connection. Position, order and the
+        # prefetched rows are kept, so a closed queue can still be used: the next call
+        # reopens what it needs. The Streamlit player closes its queue after each run
+        if self._pool:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        self._pending = None
+        if self._worker_keys:
+            self._worker_keys.close()
+        self._keys.close()
+
+    # ---- position lookups ----
+    def _key(self, keys, order, i):
+        # a shuffled pass covers the tracks that were in the playlist when it started
+        if i < 0 or (order is not None and i >= len(order)):
+            return None
+        return keys.at(order[i] if order is not None else i)
+
+    def _lookup(self, i):
+        # keys the prefetch thread already resolved, else a query on this thread
+        with self._lock:
+            order, start, keys = self._window
+        if order is self.order and start <= i < start + len(keys):
+            return keys[i - start]
+        return self._key(self._keys, self.order, i)
+
+    def _track(self, key):
+        with self._lock:
+            row = self._cache.get(key[1])
+        if row is None:
+            row = _track_rows(self._keys.catalog, [key[1]]).get(key[1], {"track_id": key[1]})
+        return dict(row, position=key[0])
+
+    def current(self):
+        key = self._lookup(self.index)
+        return self._track(key) if key else None
+
+    def upcoming(self):
+        # the tracks after the current one, as prefetched
+        if self._pending is not None:
+            self._pending.result()
+        else:
+            self._prefetch(self._keys, self.order, self.index)
+        with self._lock:
+            order, start, keys = self._window
+        if order is not self.order or start != self.index:
+            return []
+        return [self._track(key) for key in keys[1:]]
+
+    # ---- moving ----
+    def next(self):
+        # the current track finished: repeat="one" plays it again
+        if self.repeat == "one":
+            return self.current()
+        return self.skip(1)
+
+    def previous(self):
+        return self.skip(-1)
+
+    def skip(self, n=1):
+        i = self.index + n
+        if self._lookup(i) is None:
+            count = len(self.order) if self.order is not None else self._keys.count()
+            if self.repeat == "all" and count:
+                if i >= count:
+                    self.loop += i // count
+                    self._reshuffle()
+                i %= count
+            else:
+                i = min(max(i, 0), count)   # stop at the first track or just past the last
+        self.index = i
+        self._schedule()
+        return self.current()
+
+    def seek(self, i):
+        self.index = i
+        self._schedule()
+        return self.current()
+
+    def set_shuffle(self, on, seed=None):
+        # keeps the current track and continues the new order from it
+        ordinal = self.order[self.index] if self.order is not None and self.index < len(self.order) else self.index
+        if seed is not None:
+            self.seed = seed
+        self.loop = 0
+        if on:
+            self.order = Permutation(self._keys.count(), f"{self.seed}:0")
+            self.index = self.order.index(ordinal) if ordinal < len(self.order) else 0
+        else:
+            self.order = None
+            self.index = ordinal
+        self._schedule()
+
+    def set_repeat(self, mode):
+        if mode not in REPEAT_MODES:
+            raise ValueError(f"repeat must be one of {REPEAT_MODES}")
+        self.repeat = mode
+
+    def _reshuffle(self):
+        if self.order is not None:
+            self.order = Permutation(self._keys.count(), f"{self.seed}:{self.loop}")
+
+    # ---- prefetch ----
+    def _schedule(self):
+        if not self.prefetch:
+            return
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(1, thread_name_prefix="playback-prefetch")
+        if self._pending is not None:
+            self._pending.cancel()
+        self._pending = self._pool.submit(self._prefetch, None, self.order, self.index)
+
+    def _prefetch(self, keys, order, index):
+        if keys is None:
+            if self._worker_keys is None:
+                self._worker_keys = _Keys(self.playlist_id, self._keys.page_size, share=self._keys)
+            keys = self._worker_keys
+        wanted = []
+        for i in range(index, index + self.prefetch + 1):
+            key = self._key(keys, order, i)
+            if key is None:
+                break
+            wanted.append(key)
+        with self._lock:
+            missing = [k[1] for k in wanted if k[1] not in self._cache]
+        rows = _track_rows(keys.catalog, missing) if missing else {}
+        with self._lock:
+            self._cache.update(rows)
+            keep = {k[1] for k in wanted}
+            for track_id in [t for t in self._cache if t not in keep]:
+                del self._cache[track_id]
+            self._window = (order, index, wanted)
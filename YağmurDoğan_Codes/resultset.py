@@ -0,0 +1,166 @@
+from array import array
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BATCH_SIZE = 4096
+
+# ---------------- COLUMN BUFFERS ----------------
+# INTEGER and REAL columns are appended straight into array.array buffers ('q' / 'd'),
+# which Arrow and NumPy wrap without copying. TEXT, BLOB and columns that mix storage
+# classes (SQLite allows that) keep a plain list. NULLs in numeric columns go to a byte
+# mask that is only allocated once the first NULL shows up.
+class Column:
+    __slots__ = ("name", "kind", "data", "nulls")
+
+    def __init__(self, name):
+        self.name = name
+        self.kind = None    # "int", "float" or "object"; None while only NULLs were seen
+        self.data = array("q")
+        self.nulls = None
+
+    def __len__(self):
+        return len(self.data)
+
+    def extend(self, values):
+        if self.kind == "object":
+            self.data.extend(values)
+            return
+        if self.kind is not None:
+            n = len(self.data)
+            try:
+                self.data.extend(values)   # C loop, no per-value Python work
+            except TypeError:
+                del self.data[n:]          # a NULL or another type: take the slow path
+            else:
+                if self.nulls is not None:
+                    self.nulls.extend(bytes(len(values)))
+                return
+        for v in values:
+            self.append(v)
+
+    def append(self, v):
+        if self.kind == "object":
+            self.data.append(v)
+            return
+        if v is None:
+            if self.nulls is None:
+                self.nulls = bytearray(len(self.data))
+            self.nulls.append(1)
+            self.data.append(0)
+            return
+        t = type(v)
+        if t is float and self.kind != "float":
+            self.data = array("d", self.data)
+            self.kind = "float"
+        elif t is int and self.kind is None:
+            self.kind = "int"
+        elif t is not int and t is not float:
+            self._to_object()
+            self.data.append(v)
+            return
+        if self.nulls is not None:
+            self.nulls.append(0)
+        self.data.append(v)
+
+    def _to_object(self):
+        values = self.data.tolist()
+        if self.nulls is not None:
+            values = [None if null else x for x, null in zip(values, self.nulls)]
+        self.data, self.nulls, self.kind = values, None, "object"
+
+    def to_list(self):
+        if self.kind == "object":
+            return self.data
+        if self.nulls is None:
+            return self.data.tolist()
+        return [None if null else x for x, null in zip(self.data.tolist(), self.nulls)]
+
+    def to_arrow(self):
+        n = len(self.data)
+        if self.kind is None:
+            return pa.nulls(n)
+        if self.kind == "object":
+            try:
+                return pa.array(self.data)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # mixed storage classes in one column: show everything as text
+                return pa.array([None if v is None else str(v) for v in self.data], pa.string())
+        validity = None
+        if self.nulls is not None:
+            mask = pa.Array.from_buffers(pa.uint8(), n, [None, pa.py_buffer(self.nulls)])
+            validity = pc.equal(mask, 0).buffers()[1]
+        typ = pa.int64() if self.kind == "int" else pa.float64()
+        return pa.Array.from_buffers(typ, n, [validity, pa.py_buffer(self.data)])
+
+    def to_numpy(self):
+        if self.kind == "object":
+            return np.array(self.data, dtype=object)
+        values = np.frombuffer(self.data, np.int64 if self.data.typecode == "q" else np.float64)
+        if self.nulls is None:
+            return values
+        return np.ma.masked_array(values, mask=np.frombuffer(self.nulls, np.bool_))
+
+# ---------------- RESULT SET ----------------
+class ResultSet:
+    def __init__(self, names):
+        self.names = list(names)
+        self.columns = [Column(name) for name in self.names]
+        self.rows = 0
+
+    @classmethod
+    def from_cursor(cls, cur, batch_size=BATCH_SIZE):
+        # plain tuples instead of sqlite3.Row, transposed a batch at a time
+        rs = cls([d[0] for d in cur.description or ()])
+        cur.row_factory = None
+        while True:
+            batch = cur.fetchmany(batch_size)
+            if not batch:
+                break
+            rs.extend(batch)
+        return rs
+
+    @classmethod
+    def from_rows(cls, names, rows):
+        rs = cls(names)
+        if rows:
+            rs.extend(rows)
+        return rs
+
+    def extend(self, rows):
+        for col, values in zip(self.columns, zip(*rows)):
+            col.extend(values)
+        self.rows += len(rows)
+
+    def __len__(self):
+        return self.rows
+
+    def __bool__(self):
+        return self.rows > 0
+
+    def column(self, name):
+        return self.columns[self.names.index(name)].to_list()
+
+    def to_pydict(self):
+        return {c.name: c.to_list() for c in self.columns}
+
+    def to_numpy(self):
+        return {c.name: c.to_numpy() for c in self.columns}
+
+    def to_arrow(self):
+        return pa.table([c.to_arrow() for c in self.columns], names=self.names)
+
+    def to_frame(self):
+        # the cheapest form st.dataframe accepts: Arrow, else NumPy columns, else lists
+        if pa is not None:
+            return self.to_arrow()
+        if np is not None:
+            return self.to_numpy()
+        return self.to_pydict()
@@ -0,0 +1,261 @@
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import collation
+import db
+import dedup
+import moodindex
+
+try:
+    import mutagen  # optional: tags and durations for mp3/flac/ogg/m4a/...
+except ImportError:
+    mutagen = None
+
+AUDIO_EXTENSIONS = {".wav", ".wave", ".mp3", ".flac", ".ogg", ".oga", ".opus", ".m4a", ".aac", ".aif", ".aiff", ".wma"}
+BATCH_SIZE = 500
+
+# ---------------- WALK ----------------
+def walk(root, errors=None):
+    # a folder (or file) that cannot be read is appended to errors as (path, message)
+    # and skipped, instead of ending the whole walk
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        try:
+            with os.scandir(folder) as entries:
+                for e in entries:
+                    try:
+                        if e.is_dir(follow_symlinks=False):
+                            stack.append(e.path)
+                        elif e.is_file() and os.path.splitext(e.name)[1].lower() in AUDIO_EXTENSIONS:
+                            st = e.stat()
+                            yield os.path.abspath(e.path), st.st_mtime, st.st_size
+                    except OSError as ex:
+                        if errors is None:
+                            raise
+                        errors.append((os.path.abspath(e.path), str(ex)))
+        except OSError as ex:
+            if errors is None:
+                raise
+            errors.append((os.path.abspath(folder), str(ex)))
+
+# ---------------- READERS (run in worker processes) ----------------
+_WAV_INFO = {b"INAM": "title", b"IART": "artist", b"IPRD": "album", b"IGNR": "genre"}
+
+def read_wav(path):
+    # walks the RIFF chunks: 'fmt ' gives the byte rate, 'data' the payload size and
+    # LIST/INFO the tags; works for any WAV codec, unlike wave.open which needs PCM
+    meta = {}
+    byte_rate = data_size = None
+    with open(path, "rb") as f:
+        riff, _, wave_id = struct.unpack("<4sI4s", f.read(12))
+        if riff != b"RIFF" or wave_id != b"WAVE":
+            raise ValueError("not a RIFF/WAVE file")
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                break
+            cid, size = struct.unpack("<4sI", header)
+            if cid == b"fmt ":
+                fmt = f.read(size)
+                byte_rate = struct.unpack("<I", fmt[8:12])[0]
+            elif cid == b"data":
+                data_size = size
+                f.seek(size, 1)
+            elif cid == b"LIST":
+                body = f.read(size)
+                if body[:4] == b"INFO":
+                    pos = 4
+                    while pos + 8 <= len(body):
+                        sub, sub_size = struct.unpack("<4sI", body[pos:pos + 8])
+                        value = body[pos + 8:pos + 8 + sub_size].split(b"\0", 1)[0]
+                        if sub in _WAV_INFO and value:
+                            meta[_WAV_INFO[sub]] = value.decode("utf-8", "replace").strip()
+                        pos += 8 + sub_size + (sub_size & 1)
+            else:
+                f.seek(size, 1)
+            if size & 1:
+                f.seek(1, 1)   # chunks are word aligned
+    if byte_rate and data_size is not None:
+        meta["duration"] = data_size / byte_rate
+    return meta
+
+def read_tagged(path):
+    audio = mutagen.File(path, easy=True)
+    if audio is None:
+        raise ValueError("unsupported format")
+    meta = {"duration": getattr(audio.info, "length", None)}
+    for key in ("title", "artist", "album", "genre"):
+        values = (audio.tags or {}).get(key)
+        if values:
+            meta[key] = str(values[0]).strip()
+    return meta
+
+def read_file(args):
+    path, mtime, size, root = args
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        if ext in (".wav", ".wave"):
+            meta = read_wav(path)
+        elif mutagen is not None:
+            meta = read_tagged(path)
+        else:
+            meta = {}   # no tag library: fall back to the folder layout, no duration
+    except (OSError, ValueError, struct.error) as e:
+        return {"path": path, "mtime": mtime, "size": size, "error": f"{type(e).__name__}: {e}"}
+    # an Artist/Album/Track.ext layout under the scanned folder fills in whatever the tags did not
+    parts = os.path.relpath(path, root).split(os.sep)
+    meta.setdefault("title", os.path.splitext(parts[-1])[0])
+    meta.setdefault("album", parts[-2] if len(parts) >= 2 else None)
+    meta.setdefault("artist", parts[-3] if len(parts) >= 3 else None)
+    return dict(meta, path=path, mtime=mtime, size=size)
+
+# ---------------- UPSERT ----------------
+def _artist_id(conn, cache, name, stats):
+    if not name:
+        return None
+    if name not in cache:
+        # reuse an artist whose normalized name matches instead of creating "sezen  aksu"
+        matches = dedup.similar(conn, "artist", name)
+        if matches and matches[0]["score"] == 1.0:
+            cache[name] = matches[0]["id"]
+        else:
+            if matches:
+                stats["flagged_duplicates"] += 1
+            cur = conn.execute("INSERT INTO Artists (name, name_key) VALUES (?, ?)", (name, collation.sort_key(name)))
+            cache[name] = cur.lastrowid
+            dedup.on_insert(conn, "artist", cur.lastrowid, name)
+    return cache[name]
+
+def _album_id(conn, cache, title, artist_id):
+    if not title:
+        return None
+    key = (title, artist_id)
+    if key not in cache:
+        matches = dedup.similar(conn, "album", title, scope=artist_id)
+        if matches and matches[0]["score"] == 1.0:
+            cache[key] = matches[0]["id"]
+        else:
+            cur = conn.execute("INSERT INTO Albums (title, artist_id, title_key) VALUES (?, ?, ?)", (title, artist_id, collation.sort_key(title)))
+            cache[key] = cur.lastrowid
+            dedup.on_insert(conn, "album", cur.lastrowid, title, artist_id)
+    return cache[key]
+
+def _write_batch(conn, batch, known, stats, artists, albums):
+    # one transaction per batch
+    for r in batch:
+        artist_id = _artist_id(conn, artists, r.get("artist"), stats)
+        album_id = _album_id(conn, albums, r.get("album"), artist_id)
+        duration = round(r["duration"]) if r.get("duration") else None
+        track_id = known.get(r["path"], (None, None, None))[2]
+        if track_id is not None and conn.execute("SELECT 1 FROM Tracks WHERE track_id=?", (track_id,)).fetchone():
+            conn.execute("UPDATE Tracks SET track_title=?, title_key=?, duration_seconds=?, album_id=?, track_genre=COALESCE(?, track_genre) WHERE track_id=?",
+                         (r["title"], collation.sort_key(r["title"]), duration, album_id, r.get("genre"), track_id))
+            dedup.on_update(conn, "track", track_id, r["title"], album_id)
+            stats["updated"] += 1
+        else:
+            cur = conn.execute("INSERT INTO Tracks (track_title, title_key, duration_seconds, album_id, track_genre) VALUES (?, ?, ?, ?, ?)",
+                               (r["title"], collation.sort_key(r["title"]), duration, album_id, r.get("genre")))
+            track_id = cur.lastrowid
+            dedup.on_insert(conn, "track", track_id, r["title"], album_id)
+            moodindex.on_add_track(conn, track_id)
+            stats["inserted"] += 1
+        conn.execute("INSERT OR REPLACE INTO ScannedFiles (path, mtime, size, track_id) VALUES (?, ?, ?, ?)",
+                     (r["path"], r["mtime"], r["size"], track_id))
+    conn.commit()
+
+# ---------------- SCAN ----------------
+def scan(root, workers=None, batch_size=BATCH_SIZE, prune=False, progress=None):
+    started = time.perf_counter()
+    stats = {"files": 0, "unchanged": 0, "scanned": 0, "inserted": 0, "updated": 0, "removed": 0,
+             "errors": 0, "flagged_duplicates": 0}
+    errors = []
+    conn = db.get_conn()
+    root = os.path.abspath(root)
+    # "root/" so that a scan of /music does not claim (and prune) files under /music2
+    prefix = os.path.join(root, "")
+    known = {r["path"]: (r["mtime"], r["size"], r["track_id"]) for r in
+             conn.execute("SELECT path, mtime, size, track_id FROM ScannedFiles WHERE substr(path, 1, ?) = ?", (len(prefix), prefix))}
+
+    # incremental: only files whose mtime or size changed are read again
+    seen, todo = set(), []
+    for path, mtime, size in walk(root, errors):
+        stats["files"] += 1
+        seen.add(path)
+        old = known.get(path)
+        if old is not None and old[0] == mtime and old[1] == size:
+            stats["unchanged"] += 1
+        else:
+            todo.append((path, mtime, size, root))
+    stats["errors"] += len(errors)
+    unreadable = [p for p, _ in errors]
+
+    artists, albums, batch = {}, {}, []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for r in pool.map(read_file, todo, chunksize=32):
+            stats["scanned"] += 1
+            if "error" in r:
+                # remembered like any other file, so it is only retried once it changes
+                stats["errors"] += 1
+                errors.append((r["path"], r["error"]))
+                conn.execute("INSERT OR REPLACE INTO ScannedFiles (path, mtime, size, track_id) VALUES (?, ?, ?, NULL)",
+                             (r["path"], r["mtime"], r["size"]))
+                continue
+            batch.append(r)
+            if len(batch) >= batch_size:
+                _write_batch(conn, batch, known, stats, artists, albums)
+                batch = []
+                if progress:
+                    progress(stats["scanned"], len(todo))
+    if batch:
+        _write_batch(conn, batch, known, stats, artists, albums)
+    conn.commit()   # error rows after the last batch
+
+    if prune:
+        # files that disappeared take their tracks with them; files under a folder that
+        # could not be read were not seen either, but are not gone
+        hidden = tuple(os.path.join(p, "") for p in unreadable)
+        gone = [(p, v[2]) for p, v in known.items()
+                if p not in seen and p not in unreadable and not p.startswith(hidden)]
+        for i in range(0, len(gone), batch_size):
+            chunk = gone[i:i + batch_size]
+            conn.executemany("DELETE FROM ScannedFiles WHERE path=?", [(p,) for p, _ in chunk])
+            db.delete_tracks(conn, [t for _, t in chunk if t is not None])
+            stats["removed"] += len(chunk)
+    conn.close()
+
+    stats["elapsed_seconds"] = time.perf_counter() - started
+    stats["files_per_second"] = stats["files"] / stats["elapsed_seconds"] if stats["elapsed_seconds"] else 0.0
+    stats["scanned_per_second"] = stats["scanned"] / stats["elapsed_seconds"] if stats["elapsed_seconds"] else 0.0
+    stats["error_samples"] = errors[:20]
+    return stats
+
+# ---------------- CLI ----------------
+# python scanner.py <music dir> [--db path] [--workers N] [--prune]
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    workers = None
+    if "--db" in args:
+        i = args.index("--db")
+        db.DB_PATH = args[i + 1]
+        del args[i:i + 2]
+    if "--workers" in args:
+        i = args.index("--workers")
+        workers = int(args[i + 1])
+        del args[i:i + 2]
+    prune = "--prune" in args
+    args = [a for a in args if a != "--prune"]
+    if not args:
+        print("usage: scanner.py <music dir> [--db path] [--workers N] [--prune]")
+        sys.exit(1)
+    db.init_db()
+    stats = scan(args[0], workers=workers, prune=prune,
+                 progress=lambda done, total: print(f"\r{done}/{total}", end="", flush=True))
+    print()
+    for path, err in stats.pop("error_samples"):
+        print(f"error: {path}: {err}")
+    for k, v in stats.items():
+        print(f"{k}: {v:.2f}" if isinstance(v, float) else f"{k}: {v}")
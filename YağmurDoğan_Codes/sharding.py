@@ -0,0 +1,306 @@
+import os
+import sqlite3
+import sys
+from datetime import datetime
+
+# user-owned data (Playlists, PlaylistTracks) lives in N shard files next to the catalog
+# database, placed by a hash of user_id. The catalog keeps only a small directory
+# (PlaylistShards: playlist_id -> user_id, shard) that allocates playlist ids and routes
+# every call, so a playlist is always found even while a rebalance is moving it.
+# Shard connections ATTACH the catalog read side as "catalog" for the track joins.
+
+SHARD_SCHEMA = """
+CREATE TABLE IF NOT EXISTS Playlists (
+    playlist_id INTEGER PRIMARY KEY,
+    playlist_title TEXT NOT NULL,
+    user_id INTEGER,
+    creation_date TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_playlists_user ON Playlists(user_id);
+
+CREATE TABLE IF NOT EXISTS PlaylistTracks (
+    playlist_id INTEGER,
+    track_id INTEGER,
+    position INTEGER,
+    PRIMARY KEY (playlist_id, track_id),
+    FOREIGN KEY (playlist_id) REFERENCES Playlists(playlist_id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_playlist_tracks_track ON PlaylistTracks(track_id);
+CREATE INDEX IF NOT EXISTS idx_playlist_tracks_position ON PlaylistTracks(playlist_id, position, track_id);
+"""
+
+# ---------------- ROUTING ----------------
+def catalog_path(conn):
+    return conn.execute("PRAGMA database_list").fetchone()[2]
+
+def shard_path(catalog, shard):
+    base, ext = os.path.splitext(catalog)
+    return f"{base}.shard{shard}{ext or '.db'}"
+
+def shard_count(conn):
+    row = conn.execute("SELECT value FROM ShardConfig WHERE key='shard_count'").fetchone()
+    return int(row[0]) if row else 0
+
+def shard_for_user(user_id, count):
+    # multiplicative hash so consecutive user ids spread over the shards
+    return (int(user_id or 0) * 2654435761 & 0xFFFFFFFF) % count
+
+def shard_of_playlist(conn, playlist_id):
+    row = conn.execute("SELECT shard FROM PlaylistShards WHERE playlist_id=?", (playlist_id,)).fetchone()
+    return row[0] if row else None
+
+def used_shards(conn, user_id=None):
+    if user_id is None:
+        return [r[0] for r in conn.execute("SELECT DISTINCT shard FROM PlaylistShards ORDER BY shard")]
+    return [r[0] for r in conn.execute("SELECT DISTINCT shard FROM PlaylistShards WHERE user_id=? ORDER BY shard", (user_id,))]
+
+def shard_files(conn, catalog=None):
+    # (shard, path) of every shard file that exists; catalog names another copy of the
+    # same catalog whose files are wanted (its directory rows are the same)
+    catalog = catalog or catalog_path(conn)
+    shards = sorted(set(range(shard_count(conn))) | set(used_shards(conn)))
+    return [(s, shard_path(catalog, s)) for s in shards if os.path.exists(shard_path(catalog, s))]
+
+def connect_shard(catalog, shard):
+    path = shard_path(catalog, shard)
+    conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+    conn.row_factory = sqlite3.Row
+    # run on every connect: a per-process "schema exists" cache goes wrong as soon as
+    # another process (a CLI rebalance) deletes and recreates the file
+    conn.executescript(SHARD_SCHEMA)
+    conn.execute("ATTACH DATABASE ? AS catalog", (catalog,))
+    return conn
+
+# ---------------- ROUTED OPERATIONS ----------------
+# each takes an open catalog connection
+def add_playlist(conn, playlist_title, user_id):
+    shard = shard_for_user(user_id, shard_count(conn))
+    sconn = connect_shard(catalog_path(conn), shard)
+    # directory row and playlist row commit together (one transaction over both files)
+    cur = sconn.execute("INSERT INTO catalog.PlaylistShards (user_id, shard) VALUES (?, ?)", (user_id, shard))
+    sconn.execute("INSERT INTO main.Playlists (playlist_id, playlist_title, user_id, creation_date) VALUES (?, ?, ?, ?)",
+                  (cur.lastrowid, playlist_title, user_id, datetime.utcnow().isoformat()))
+    sconn.commit()
+    sconn.close()
+    return cur.lastrowid
+
+def delete_playlist(conn, playlist_id):
+    shard = shard_of_playlist(conn, playlist_id)
+    if shard is None:
+        return
+    sconn = connect_shard(catalog_path(conn), shard)
+    sconn.execute("DELETE FROM main.PlaylistTracks WHERE playlist_id=?", (playlist_id,))
+    sconn.execute("DELETE FROM main.Playlists WHERE playlist_id=?", (playlist_id,))
+    sconn.execute("DELETE FROM catalog.PlaylistShards WHERE playlist_id=?", (playlist_id,))
+    sconn.commit()
+    sconn.close()
+
+def _write_playlist_tracks(conn, playlist_id, sql, params):
+    shard = shard_of_playlist(conn, playlist_id)
+    if shard is None:
+        raise sqlite3.IntegrityError(f"Unknown playlist {playlist_id}")
+    sconn = connect_shard(catalog_path(conn), shard)
+    sconn.execute(sql, params)
+    sconn.commit()
+    sconn.close()
+
+def add_track_to_playlist(conn, playlist_id, track_id, position):
+    _write_playlist_tracks(conn, playlist_id, "INSERT OR REPLACE INTO main.PlaylistTracks (playlist_id, track_id, position) VALUES (?, ?, ?)",
+                           (playlist_id, track_id, position))
+
+def remove_track_from_playlist(conn, playlist_id, track_id):
+    _write_playlist_tracks(conn, playlist_id, "DELETE FROM main.PlaylistTracks WHERE playlist_id=? AND track_id=?", (playlist_id, track_id))
+
+def _query_shards(conn, shards, sql, params=()):
+    catalog = catalog_path(conn)
+    rows = []
+    for shard in shards:
+        sconn = connect_shard(catalog, shard)
+        rows.extend(sconn.execute(sql, params).fetchall())
+        sconn.close()
+    return rows
+
+def get_playlists_for_user(conn, user_id):
+    return _query_shards(conn, used_shards(conn, user_id), "SELECT * FROM main.Playlists WHERE user_id=?", (user_id,))
+
+def get_all_playlists(conn):
+    rows = _query_shards(conn, used_shards(conn), "SELECT * FROM main.Playlists")
+    return sorted(rows, key=lambda r: r["playlist_id"])
+
+def get_tracks_in_playlist(conn, playlist_id):
+    shard = shard_of_playlist(conn, playlist_id)
+    if shard is None:
+        return []
+    return _query_shards(conn, [shard], """
+    SELECT pt.position, t.track_id, t.track_title, t.duration_seconds, t.track_genre,
+           a.title as album_title, ar.name as artist_name
+    FROM main.PlaylistTracks pt
+    JOIN catalog.Tracks t ON pt.track_id = t.track_id
+    LEFT JOIN catalog.Albums a ON t.album_id = a.album_id
+    LEFT JOIN catalog.Artists ar ON a.artist_id = ar.artist_id
+    WHERE pt.playlist_id = ?
+    ORDER BY pt.position
+    """, (playlist_id,))
+
+# cross-file clean-up the single-file foreign keys used to do
+def delete_user_playlists(conn, user_id):
+    for row in conn.execute("SELECT playlist_id FROM PlaylistShards WHERE user_id=?", (user_id,)).fetchall():
+        delete_playlist(conn, row[0])
+
+def delete_tracks_everywhere(conn, track_ids):
+    catalog = catalog_path(conn)
+    for shard in used_shards(conn):
+        sconn = connect_shard(catalog, shard)
+        sconn.executemany("DELETE FROM main.PlaylistTracks WHERE track_id=?", [(t,) for t in track_ids])
+        sconn.commit()
+        sconn.close()
+
+def repoint_track(conn, old_id, new_id):
+    catalog = catalog_path(conn)
+    for shard in used_shards(conn):
+        sconn = connect_shard(catalog, shard)
+        sconn.execute("""
+            DELETE FROM main.PlaylistTracks WHERE track_id=?
+            AND playlist_id IN (SELECT playlist_id FROM main.PlaylistTracks WHERE track_id=?)
+        """, (old_id, new_id))
+        sconn.execute("UPDATE main.PlaylistTracks SET track_id=? WHERE track_id=?", (new_id, old_id))
+        sconn.commit()
+        sconn.close()
+
+# ---------------- ENABLE / REBALANCE ----------------
+def _move_playlist(conn, playlist_id, src, dst):
+    # copy to the new shard, delete from the old one and update the directory in one
+    # transaction over three files; an interrupted rebalance leaves each playlist in
+    # exactly one place and can simply be run again
+    catalog = catalog_path(conn)
+    connect_shard(catalog, dst).close()   # creates the shard schema if the file is new
+    mconn = sqlite3.connect(catalog, timeout=10)
+    mconn.execute("ATTACH DATABASE ? AS src", (shard_path(catalog, src),))
+    mconn.execute("ATTACH DATABASE ? AS dst", (shard_path(catalog, dst),))
+    mconn.execute("INSERT OR REPLACE INTO dst.Playlists SELECT * FROM src.Playlists WHERE playlist_id=?", (playlist_id,))
+    mconn.execute("INSERT OR REPLACE INTO dst.PlaylistTracks SELECT * FROM src.PlaylistTracks WHERE playlist_id=?", (playlist_id,))
+    mconn.execute("DELETE FROM src.PlaylistTracks WHERE playlist_id=?", (playlist_id,))
+    mconn.execute("DELETE FROM src.Playlists WHERE playlist_id=?", (playlist_id,))
+    mconn.execute("UPDATE main.PlaylistShards SET shard=? WHERE playlist_id=?", (dst, playlist_id))
+    mconn.commit()
+    mconn.close()
+
+def _move_catalog_playlists(conn, count, chunk_size):
+    # moves the catalog's own Playlists/PlaylistTracks rows into the shard files. enable
+    # runs it first, and so does every rebalance, so an enable that was interrupted half
+    # way is finished by running enable (or rebalance) again
+    catalog = catalog_path(conn)
+    moved = 0
+    while True:
+        rows = conn.execute("SELECT playlist_id, user_id FROM Playlists ORDER BY playlist_id LIMIT ?", (chunk_size,)).fetchall()
+        if not rows:
+            break
+        for playlist_id, user_id in rows:
+            shard = shard_for_user(user_id, count)
+            sconn = connect_shard(catalog, shard)
+            sconn.execute("INSERT OR REPLACE INTO catalog.PlaylistShards (playlist_id, user_id, shard) VALUES (?, ?, ?)",
+                          (playlist_id, user_id, shard))
+            sconn.execute("INSERT OR REPLACE INTO main.Playlists SELECT * FROM catalog.Playlists WHERE playlist_id=?", (playlist_id,))
+            sconn.execute("INSERT OR REPLACE INTO main.PlaylistTracks SELECT * FROM catalog.PlaylistTracks WHERE playlist_id=?", (playlist_id,))
+            sconn.execute("DELETE FROM catalog.PlaylistTracks WHERE playlist_id=?", (playlist_id,))
+            sconn.execute("DELETE FROM catalog.Playlists WHERE playlist_id=?", (playlist_id,))
+            sconn.commit()
+            sconn.close()
+            moved += 1
+    return moved
+
+def _set_shard_count(conn, count):
+    # playlists added while the catalog rows are still moving get ids from PlaylistShards,
+    # so its sequence starts past every id the catalog has handed out
+    top = conn.execute("SELECT MAX(playlist_id) FROM Playlists").fetchone()[0] or 0
+    if not conn.execute("UPDATE sqlite_sequence SET seq=MAX(seq, ?) WHERE name='PlaylistShards'", (top,)).rowcount:
+        conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('PlaylistShards', ?)", (top,))
+    conn.execute("INSERT OR REPLACE INTO ShardConfig (key, value) VALUES ('shard_count', ?)", (str(count),))
+    conn.commit()
+
+def enable(conn, count, chunk_size=500):
+    # first-time split: moves the catalog's Playlists/PlaylistTracks rows into shard files
+    if count < 1:
+        raise ValueError("Shard count must be at least 1.")
+    if shard_count(conn):
+        return rebalance(conn, count, chunk_size)
+    _set_shard_count(conn, count)
+    return {"shard_count": count, "moved": _move_catalog_playlists(conn, count, chunk_size)}
+
+def rebalance(conn, count, chunk_size=500):
+    # new playlists use the new count right away; existing ones are moved one by one
+    if count < 1:
+        raise ValueError("Shard count must be at least 1.")
+    _set_shard_count(conn, count)
+    moved = _move_catalog_playlists(conn, count, chunk_size)
+    for playlist_id, user_id, shard in conn.execute("SELECT playlist_id, user_id, shard FROM PlaylistShards").fetchall():
+        target = shard_for_user(user_id, count)
+        if target != shard:
+            _move_playlist(conn, playlist_id, shard, target)
+            moved += 1
+    # a playlist added by a process that still routed with the old count, or one the
+    # directory snapshot above missed, is moved too before any file goes
+    for playlist_id, user_id, shard in conn.execute("SELECT playlist_id, user_id, shard FROM PlaylistShards WHERE shard >= ?",
+                                                    (count,)).fetchall():
+        _move_playlist(conn, playlist_id, shard, shard_for_user(user_id, count))
+        moved += 1
+    # shard files past the new count go only once both the directory and the file agree
+    # that they hold nothing; anything else is kept and reported
+    catalog = catalog_path(conn)
+    removed, kept = [], []
+    shard = count
+    while os.path.exists(shard_path(catalog, shard)):
+        path = shard_path(catalog, shard)
+        if _shard_is_empty(conn, shard, path):
+            for f in (path, path + "-journal", path + "-wal", path + "-shm"):
+                if os.path.exists(f):
+                    os.remove(f)
+            removed.append(path)
+        else:
+            kept.append(path)
+        shard += 1
+    return {"shard_count": count, "moved": moved, "removed_files": removed, "kept_files": kept}
+
+def _shard_is_empty(conn, shard, path):
+    if conn.execute("SELECT COUNT(*) FROM PlaylistShards WHERE shard=?", (shard,)).fetchone()[0]:
+        return False
+    sconn = sqlite3.connect(path, timeout=10)
+    try:
+        tables = {r[0] for r in sconn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        return all(not sconn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+                   for t in ("Playlists", "PlaylistTracks") if t in tables)
+    finally:
+        sconn.close()
+
+def status(conn):
+    catalog = catalog_path(conn)
+    out = []
+    for shard in range(max([shard_count(conn) - 1] + used_shards(conn)) + 1):
+        path = shard_path(catalog, shard)
+        n = conn.execute("SELECT COUNT(*) FROM PlaylistShards WHERE shard=?", (shard,)).fetchone()[0]
+        out.append({"shard": shard, "path": path, "playlists": n,
+                    "file_size": os.path.getsize(path) if os.path.exists(path) else 0})
+    return out
+
+# ---------------- CLI ----------------
+# python sharding.py status | enable <N> | rebalance <N>  [--db path]
+if __name__ == "__main__":
+    import db
+    args = sys.argv[1:]
+    if "--db" in args:
+        i = args.index("--db")
+        db.DB_PATH = args[i + 1]
+        del args[i:i + 2]
+    db.init_db()
+    conn = db.get_conn()
+    if args[:1] == ["enable"]:
+        print(enable(conn, int(args[1])))
+    elif args[:1] == ["rebalance"]:
+        print(rebalance(conn, int(args[1])))
+    elif args[:1] in (["status"], []):
+        print(f"shard_count: {shard_count(conn)}")
+        for s in status(conn):
+            print(s)
+    else:
+        print("usage: sharding.py status | enable <N> | rebalance <N> [--db path]")
+    conn.close()
@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db  # noqa: E402
+
+# every test gets its own seeded catalog in a temp folder; shard files land next to it
+@pytest.fixture
+def catalog(tmp_path, monkeypatch):
+    path = str(tmp_path / "music_streaming.db")
+    monkeypatch.setattr(db, "DB_PATH", path)
+    db.init_db()
+    return path
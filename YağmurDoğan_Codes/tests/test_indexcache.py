@@ -0,0 +1,65 @@
+import db
+import indexcache
+import moodindex
+
+def _counting_build():
+    builds = []
+    def build(conn):
+        builds.append(1)
+        return {"built": len(builds)}
+    return builds, build
+
+def _bump(conn, name):
+    # what another process's write hook leaves behind: a version this process never saw
+    conn.execute("INSERT INTO IndexVersions (name, version) VALUES (?, 1) "
+                 "ON CONFLICT(name) DO UPDATE SET version = version + 1", (name,))
+
+# ---------------- STALENESS ----------------
+def test_write_from_another_connection_rebuilds(catalog):
+    a, b = db.get_conn(), db.get_conn()
+    builds, build = _counting_build()
+    indexcache.get(a, "test", build)
+    indexcache.get(a, "test", build)
+    assert len(builds) == 1
+    _bump(b, "test")
+    b.commit()
+    assert indexcache.get(a, "test", build) == {"built": 2}
+    a.close()
+    b.close()
+
+def test_uncommitted_bump_is_not_seen(catalog):
+    a, b = db.get_conn(), db.get_conn()
+    builds, build = _counting_build()
+    indexcache.get(a, "test", build)
+    _bump(b, "test")
+    indexcache.get(a, "test", build)
+    assert len(builds) == 1
+    b.rollback()
+    a.close()
+    b.close()
+
+def test_mood_written_by_another_connection_is_found(catalog):
+    a, b = db.get_conn(), db.get_conn()
+    track_id = a.execute("SELECT MIN(track_id) FROM Tracks").fetchone()[0]
+    assert moodindex.query(a, moodindex.parse("Glacial")).to_array().tolist() == []
+    # raw SQL from the second connection, as another process's hook would write it
+    ref = moodindex.intern(b, "Glacial")
+    b.execute("INSERT INTO TrackMoods (track_id, mood_ref) VALUES (?, ?)", (track_id, ref))
+    _bump(b, "moods")
+    b.commit()
+    assert moodindex.query(a, moodindex.parse("Glacial")).to_array().tolist() == [track_id]
+    a.close()
+    b.close()
+
+def test_rolled_back_write_is_not_kept_in_the_index(catalog):
+    conn = db.get_conn()
+    track_id = conn.execute("SELECT MIN(track_id) FROM Tracks").fetchone()[0]
+    moodindex.get_index(conn)
+    ref = moodindex.intern(conn, "Glacial")
+    conn.execute("INSERT INTO TrackMoods (track_id, mood_ref) VALUES (?, ?)", (track_id, ref))
+    moodindex.on_add(conn, track_id, ref, "Glacial")   # patches the built index
+    conn.rollback()
+    other = db.get_conn()
+    assert moodindex.query(other, moodindex.parse("Glacial")).to_array().tolist() == []
+    conn.close()
+    other.close()
@@ -0,0 +1,65 @@
+import os
+import wave
+
+import db
+import scanner
+
+def _write_wav(path, seconds=1, rate=8000):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(1)
+        w.setframerate(rate)
+        w.writeframes(b"\x80" * rate * seconds)
+
+# ---------------- RESCAN ----------------
+def test_rescan_skips_unchanged_and_corrupt_files(catalog, tmp_path):
+    root = tmp_path / "music"
+    good = str(root / "Test Artist" / "Test Album" / "Good Song.wav")
+    bad = str(root / "Test Artist" / "Test Album" / "Broken.wav")
+    _write_wav(good)
+    with open(bad, "wb") as f:
+        f.write(b"not a wave file")
+
+    first = scanner.scan(str(root), workers=1)
+    assert (first["files"], first["scanned"], first["inserted"], first["errors"]) == (2, 2, 1, 1)
+
+    # the corrupt file is remembered without a track, so it is not read again
+    conn = db.get_conn()
+    rows = dict(conn.execute("SELECT path, track_id FROM ScannedFiles"))
+    conn.close()
+    assert rows[bad] is None and rows[good] is not None
+
+    second = scanner.scan(str(root), workers=1)
+    assert (second["files"], second["unchanged"], second["scanned"], second["errors"]) == (2, 2, 0, 0)
+
+    # once it changes it is read again and becomes a track
+    os.remove(bad)
+    _write_wav(bad, seconds=2)
+    third = scanner.scan(str(root), workers=1)
+    assert (third["unchanged"], third["scanned"], third["inserted"], third["errors"]) == (1, 1, 1, 0)
+    conn = db.get_conn()
+    track = conn.execute("SELECT t.track_title, t.duration_seconds FROM ScannedFiles s JOIN Tracks t ON s.track_id = t.track_id "
+                         "WHERE s.path=?", (bad,)).fetchone()
+    conn.close()
+    assert tuple(track) == ("Broken", 2)
+
+def test_unreadable_folder_is_reported_not_pruned(catalog, tmp_path, monkeypatch):
+    root = tmp_path / "music"
+    kept = str(root / "A" / "Album" / "Kept.wav")
+    hidden = str(root / "B" / "Album" / "Hidden.wav")
+    _write_wav(kept)
+    _write_wav(hidden)
+    scanner.scan(str(root), workers=1)
+
+    scandir = os.scandir
+    def failing_scandir(path):
+        if os.path.basename(path) == "B":
+            raise PermissionError(13, "Permission denied", path)
+        return scandir(path)
+    monkeypatch.setattr(scanner.os, "scandir", failing_scandir)
+    stats = scanner.scan(str(root), workers=1, prune=True)
+    assert (stats["files"], stats["errors"], stats["removed"]) == (1, 1, 0)
+    conn = db.get_conn()
+    assert conn.execute("SELECT COUNT(*) FROM ScannedFiles WHERE path=?", (hidden,)).fetchone()[0] == 1
+    conn.close()
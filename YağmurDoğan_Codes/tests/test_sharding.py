@@ -0,0 +1,75 @@
+import os
+import sqlite3
+
+import db
+import sharding
+
+def _users(n):
+    for i in range(n):
+        db.add_user(f"User{i}", "Test", f"user{i}@example.com")
+    conn = db.get_conn()
+    ids = [r[0] for r in conn.execute("SELECT user_id FROM Users ORDER BY user_id DESC LIMIT ?", (n,))]
+    conn.close()
+    return ids
+
+def _playlists():
+    # playlist_id -> (user_id, [track ids in position order]) as the routed reads see it
+    out = {}
+    for p in db.get_all_playlists():
+        out[p["playlist_id"]] = (p["user_id"], [t["track_id"] for t in db.get_tracks_in_playlist(p["playlist_id"])])
+    return out
+
+# ---------------- ROUTING / REBALANCE ----------------
+def test_routing_and_rebalance_round_trip(catalog):
+    before = _playlists()
+    conn = db.get_conn()
+    sharding.enable(conn, 2)
+    users = _users(6)
+    for i, user_id in enumerate(users):
+        db.add_playlist(f"Mix {i}", user_id)
+    added = [p for p in db.get_all_playlists() if p["playlist_id"] not in before]
+    for p in added:
+        db.add_track_to_playlist(p["playlist_id"], 1, 1)
+        db.add_track_to_playlist(p["playlist_id"], 2, 2)
+    expected = _playlists()
+    assert len(expected) == len(before) + len(users)
+
+    # the catalog keeps only the directory, each playlist sits in its user's shard
+    assert conn.execute("SELECT COUNT(*) FROM Playlists").fetchone()[0] == 0
+    for shard, user_id in conn.execute("SELECT shard, user_id FROM PlaylistShards"):
+        assert shard == sharding.shard_for_user(user_id, 2)
+
+    for count in (3, 1):
+        result = sharding.rebalance(conn, count)
+        assert result["kept_files"] == []
+        assert _playlists() == expected
+        assert {r[0] for r in conn.execute("SELECT DISTINCT shard FROM PlaylistShards")} <= set(range(count))
+    assert [s for s, _ in sharding.shard_files(conn)] == [0]
+    assert not os.path.exists(sharding.shard_path(catalog, 1))
+    conn.close()
+
+def test_rebalance_keeps_shard_file_with_rows(catalog):
+    conn = db.get_conn()
+    sharding.enable(conn, 2)
+    path = sharding.shard_path(catalog, 1)
+    # a playlist written by a process that bypassed the directory
+    stray = sqlite3.connect(path)
+    stray.execute("INSERT INTO Playlists (playlist_id, playlist_title, user_id) VALUES (9999, 'Stray', 1)")
+    stray.commit()
+    stray.close()
+    result = sharding.rebalance(conn, 1)
+    assert result["kept_files"] == [path]
+    assert os.path.exists(path)
+    conn.close()
+
+def test_recreated_shard_file_gets_its_schema(catalog):
+    conn = db.get_conn()
+    sharding.enable(conn, 1)
+    sharding.connect_shard(catalog, 0).close()
+    # another process removed the file after this one had connected to it
+    os.remove(sharding.shard_path(catalog, 0))
+    user_id = _users(1)[0]
+    db.add_playlist("After delete", user_id)
+    assert conn.execute("SELECT COUNT(*) FROM Playlists").fetchone()[0] == 0
+    assert [p["playlist_title"] for p in db.get_playlists_for_user(user_id)] == ["After delete"]
+    conn.close()
@@ -0,0 +1,133 @@
+import calendar
+import sys
+import time
+from datetime import date
+
+import db
+
+CHUNK_SIZE = 1000
+
+# every job below commits one chunk per transaction and only selects rows that still
+# need work (due renewals, users still in the source tier), so an interrupted run is
+# resumed by simply running it again
+
+# ---------------- HELPERS ----------------
+def add_months(day, months):
+    month = day.month - 1 + months
+    year = day.year + month // 12
+    month = month % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+def _report(job, processed, chunks, started):
+    elapsed = time.perf_counter() - started
+    return {"job": job, "processed": processed, "chunks": chunks, "elapsed_seconds": elapsed,
+            "rows_per_second": processed / elapsed if elapsed else 0.0}
+
+def _load_ids(conn, user_ids):
+    # large id lists go through a temp table instead of giant IN (...) lists
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS batch_users (user_id INTEGER PRIMARY KEY)")
+    conn.execute("DELETE FROM temp.batch_users")
+    conn.executemany("INSERT OR IGNORE INTO temp.batch_users (user_id) VALUES (?)", ((u,) for u in user_ids))
+    conn.commit()
+
+# ---------------- RENEWALS ----------------
+def due_renewals(conn, as_of, limit=-1):
+    # range scan on idx_premium_renewal_due
+    return conn.execute("SELECT user_id, renewal_due FROM Premium WHERE renewal_due <= ? ORDER BY renewal_due, user_id LIMIT ?",
+                        (as_of.isoformat(), limit)).fetchall()
+
+def renew_due(conn, as_of=None, months=1, chunk_size=CHUNK_SIZE, progress=None):
+    # pushes every renewal due on or before as_of forward by whole periods until it is after as_of
+    as_of = as_of or date.today()
+    started = time.perf_counter()
+    processed = chunks = 0
+    while True:
+        rows = due_renewals(conn, as_of, chunk_size)
+        if not rows:
+            break
+        updates = []
+        for user_id, due in rows:
+            day = date.fromisoformat(due)
+            while day <= as_of:
+                day = add_months(day, months)
+            updates.append((day.isoformat(), day.isoformat(), user_id, due))
+        # the renewal_due guard skips rows another writer changed since they were read
+        conn.executemany("UPDATE Premium SET renewal_date=?, renewal_due=? WHERE user_id=? AND renewal_due=?", updates)
+        conn.commit()
+        processed += len(rows)
+        chunks += 1
+        if progress:
+            progress(processed)
+    return _report("renew_due", processed, chunks, started)
+
+def unparsed_renewals(conn):
+    # rows whose free-form renewal_date could not be normalized are never picked up as due
+    return conn.execute("SELECT user_id, renewal_date FROM Premium WHERE renewal_due IS NULL AND renewal_date IS NOT NULL").fetchall()
+
+# ---------------- TIER TRANSITIONS ----------------
+def _move(conn, job, source, insert_sql, insert_args, user_ids, chunk_size, progress):
+    started = time.perf_counter()
+    if user_ids is not None:
+        _load_ids(conn, user_ids)
+        select = (f"SELECT s.user_id FROM {source} s JOIN temp.batch_users b ON s.user_id = b.user_id "
+                  "WHERE s.user_id > ? ORDER BY s.user_id LIMIT ?")
+    else:
+        select = f"SELECT user_id FROM {source} WHERE user_id > ? ORDER BY user_id LIMIT ?"
+    processed = chunks = 0
+    last = -1
+    while True:
+        ids = [r[0] for r in conn.execute(select, (last, chunk_size)).fetchall()]
+        if not ids:
+            break
+        marks = ",".join("?" * len(ids))
+        # insert into the target tier and delete from the source in one transaction
+        conn.executemany(insert_sql, [(u,) + insert_args for u in ids])
+        conn.execute(f"DELETE FROM {source} WHERE user_id IN ({marks})", ids)
+        conn.commit()
+        last = ids[-1]
+        processed += len(ids)
+        chunks += 1
+        if progress:
+            progress(processed)
+    if user_ids is not None:
+        conn.execute("DROP TABLE IF EXISTS temp.batch_users")
+    return _report(job, processed, chunks, started)
+
+def upgrade_to_premium(conn, user_ids=None, renewal_date=None, payment_method="Credit Card",
+                       chunk_size=CHUNK_SIZE, progress=None):
+    # Free -> Premium; user_ids=None moves every Free user
+    renewal = (renewal_date or add_months(date.today(), 1)).isoformat()
+    return _move(conn, "upgrade_to_premium", "Free",
+                 "INSERT OR REPLACE INTO Premium (user_id, renewal_date, renewal_due, payment_method) VALUES (?, ?, ?, ?)",
+                 (renewal, renewal, payment_method), user_ids, chunk_size, progress)
+
+def downgrade_to_free(conn, user_ids=None, ad_frequency=5, listening_limit=100,
+                      chunk_size=CHUNK_SIZE, progress=None):
+    # Premium -> Free; user_ids=None moves every Premium user
+    return _move(conn, "downgrade_to_free", "Premium",
+                 "INSERT OR REPLACE INTO Free (user_id, ad_frequency, listening_limit) VALUES (?, ?, ?)",
+                 (ad_frequency, listening_limit), user_ids, chunk_size, progress)
+
+# ---------------- CLI ----------------
+# python tiers.py renew [YYYY-MM-DD] | upgrade [user_id ...] | downgrade [user_id ...]  [--db path]
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if "--db" in args:
+        i = args.index("--db")
+        db.DB_PATH = args[i + 1]
+        del args[i:i + 2]
+    db.init_db()
+    conn = db.get_conn()
+    command, rest = (args[0], args[1:]) if args else ("", [])
+    if command == "renew":
+        result = renew_due(conn, date.fromisoformat(rest[0]) if rest else None)
+    elif command == "upgrade":
+        result = upgrade_to_premium(conn, [int(u) for u in rest] or None)
+    elif command == "downgrade":
+        result = downgrade_to_free(conn, [int(u) for u in rest] or None)
+    else:
+        print("usage: tiers.py renew [YYYY-MM-DD] | upgrade [user_id ...] | downgrade [user_id ...] [--db path]")
+        sys.exit(1)
+    print(f"{result['job']}: {result['processed']} users in {result['chunks']} chunks, "
+          f"{result['elapsed_seconds']:.2f}s ({result['rows_per_second']:.0f} rows/s)")
+    conn.close()
@@ -0,0 +1,18 @@
+# one module per menu entry, each exposing render(); imported only when its page is selected
+PAGES = {
+    "Dashboard": "views.dashboard",
+    "Artists": "views.artists",
+    "Artist Social Links": "views.artist_socials",
+    "Albums": "views.albums",
+    "Tracks": "views.tracks",
+    "Track Moods": "views.track_moods",
+    "Users": "views.users",
+    "Premium Users": "views.premium",
+    "Free Users": "views.free",
+    "Playlists": "views.playlists",
+    "Player": "views.player",
+    "JOIN: Tracks+Albums+Artists": "views.join",
+    "Analytics": "views.analytics",
+    "Duplicates": "views.duplicates",
+    "Library Scan": "views.library_scan",
+}
@@ -0,0 +1,54 @@
+from datetime import datetime
+import streamlit as st
+from db import add_album, delete_album, fetch_all, find_similar, get_conn, update_album
+from views.common import warn_similar
+
+# ------- ALBUMS (CRUD) -------
+def render():
+    st.header("Albums — Add / Update / Delete")
+    st.dataframe(fetch_all("Albums", columnar=True).to_frame(), hide_index=True)
+
+    conn = get_conn()
+    cur = conn.cursor()
+    artists = cur.execute("SELECT artist_id, name FROM Artists ORDER BY name_key").fetchall()
+
+    st.subheader("➕ Add Album")
+    with st.form("add_album"):
+        title = st.text_input("Title")
+        artist_choice = st.selectbox("Artist (or select None)", options=[(None, "— None / Compilation —")] + [(a["artist_id"], a["name"]) for a in artists], format_func=lambda x: x[1])
+        year = st.number_input("Release Year", min_value=1900, max_value=2100, value=datetime.now().year)
+        force = st.checkbox("Add even if a similar album exists")
+        if st.form_submit_button("Add Album"):
+            similar = find_similar("album", title.strip() or "Untitled", artist_choice[0])
+            if similar and not force:
+                warn_similar(similar)
+            else:
+                add_album(title.strip() or "Untitled", artist_choice[0], int(year))
+                st.success("Album added.")
+                st.rerun()
+    conn.close()
+
+    st.subheader("✏️ Update Album")
+    albums = fetch_all("Albums")
+    if albums:
+        sel = st.selectbox("Select Album", options=[(a["album_id"], a["title"]) for a in albums], format_func=lambda x: x[1])
+        album = [a for a in albums if a["album_id"] == sel[0]][0]
+        with st.form("update_album"):
+            new_title = st.text_input("Title", value=album["title"])
+            # choose artist by id/name
+            artists = fetch_all("Artists")
+            artist_choice = st.selectbox("Artist", options=[(None, "— None —")] + [(a["artist_id"], a["name"]) for a in artists], index=0, format_func=lambda x: x[1])
+            new_year = st.number_input("Release Year", min_value=1900, max_value=2100, value=album["release_year"] or datetime.now().year)
+            if st.form_submit_button("Update Album"):
+                update_album(album["album_id"], new_title.strip(), artist_choice[0], int(new_year))
+                st.success("Updated.")
+                st.rerun()
+
+    st.subheader("🗑️ Delete Album")
+    albums = fetch_all("Albums")
+    if albums:
+        del_choice = st.selectbox("Delete Album", options=[(a["album_id"], a["title"]) for a in albums], format_func=lambda x: x[1])
+        if st.button("Delete Selected Album"):
+            delete_album(del_choice[0])
+            st.success("Deleted.")
+            st.rerun()
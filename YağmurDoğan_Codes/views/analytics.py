@@ -0,0 +1,34 @@
+from datetime import datetime
+import streamlit as st
+import analytics
+from db import get_conn
+
+# ------- ANALYTICS (columnar snapshot) -------
+def render():
+    st.header("Analytics — Catalog Reports")
+    if st.button("Refresh Snapshot"):
+        conn = get_conn()
+        meta = analytics.export_snapshot(conn)
+        conn.close()
+        st.success(f"Snapshot exported in {meta['export_seconds']:.3f}s.")
+
+    if not analytics.snapshot_exists():
+        st.info("No snapshot yet. Click 'Refresh Snapshot' to export the catalog.")
+    else:
+        snap = analytics.Snapshot()
+        st.caption(f"Snapshot taken {datetime.fromtimestamp(snap.meta['created_at']).isoformat(timespec='seconds')} — "
+                   f"{snap.meta['rows']['tracks']} tracks, {snap.meta['rows']['moods']} mood rows")
+
+        st.subheader("Average Duration by Artist and Release Year")
+        st.table(analytics.avg_duration_by_artist_year(snap))
+
+        st.subheader("Track Count by Genre and Country")
+        st.table(analytics.track_count_by_genre_country(snap))
+
+        st.subheader("Mood Distribution by Artist")
+        artist = st.selectbox("Artist", options=[None] + snap.meta["vocab"]["artist"], format_func=lambda x: x or "— All —")
+        rows = analytics.mood_distribution_by_artist(snap, artist)
+        if rows:
+            st.table(rows)
+        else:
+            st.info("No moods for this artist.")
@@ -0,0 +1,50 @@
+import streamlit as st
+from db import add_artist_social, delete_artist_social, get_all_artist_socials, get_conn, update_artist_social
+
+# ------- ARTIST SOCIAL LINKS (CRUD) -------
+def render():
+    st.header("Artist Social Links — Add / Update / Delete")
+    st.dataframe(get_all_artist_socials(columnar=True).to_frame(), hide_index=True)
+
+    conn = get_conn()
+    cur = conn.cursor()
+    artists = cur.execute("SELECT artist_id, name FROM Artists ORDER BY name_key").fetchall()
+
+    st.subheader("➕ Add Social Link")
+    if artists:
+        with st.form("add_social"):
+            artist_choice = st.selectbox("Artist", options=[(a["artist_id"], a["name"]) for a in artists], format_func=lambda x: x[1])
+            platform = st.selectbox("Platform", ["Instagram", "Spotify", "YouTube", "Twitter", "Website", "Other"])
+            link = st.text_input("Link (handle or url)")
+            if st.form_submit_button("Add Social"):
+                if not link.strip():
+                    st.error("Link required.")
+                else:
+                    add_artist_social(artist_choice[0], platform, link.strip())
+                    st.success("Social link added.")
+                    st.rerun()
+    else:
+        st.info("Please add an artist first.")
+    conn.close()
+
+    st.subheader("✏️ Update Social Link")
+    socials = get_all_artist_socials()
+    if socials:
+        up_choice = st.selectbox("Select Social", options=[(s["social_id"], f"{s['artist_name']} — {s['platform']}") for s in socials], format_func=lambda x: x[1])
+        sel = [s for s in socials if s["social_id"] == up_choice[0]][0]
+        with st.form("update_social"):
+            new_platform = st.selectbox("Platform", ["Instagram", "Spotify", "YouTube", "Twitter", "Website", "Other"], index=0)
+            new_link = st.text_input("Link", value=sel["social_link"])
+            if st.form_submit_button("Update Social"):
+                update_artist_social(up_choice[0], new_platform, new_link.strip())
+                st.success("Updated.")
+                st.rerun()
+
+    st.subheader("🗑️ Delete Social Link")
+    socials = get_all_artist_socials()
+    if socials:
+        del_choice = st.selectbox("Select to Delete", options=[(s["social_id"], f"{s['artist_name']} — {s['platform']} — {s['social_link']}") for s in socials], format_func=lambda x: x[1])
+        if st.button("Delete Social"):
+            delete_artist_social(del_choice[0])
+            st.success("Deleted.")
+            st.rerun()
@@ -0,0 +1,55 @@
+import streamlit as st
+from db import add_artist, delete_artist, fetch_all, find_similar, get_conn, update_artist
+from views.common import warn_similar
+
+# ------- ARTISTS (CRUD) -------
+def render():
+    st.header("Artists — Add / Update / Delete")
+    st.dataframe(fetch_all("Artists", columnar=True).to_frame(), hide_index=True)
+
+    st.subheader("➕ Add New Artist")
+    conn = get_conn()
+    cur = conn.cursor()
+    with st.form("add_artist"):
+        name = st.text_input("Name")
+        country = st.text_input("Country")
+        genre = st.text_input("Genre")
+        force = st.checkbox("Add even if a similar artist exists")
+        if st.form_submit_button("Add"):
+            similar = find_similar("artist", name) if name.strip() else []
+            if not name.strip():
+                st.error("Name required.")
+            elif similar and not force:
+                warn_similar(similar)
+            else:
+                try:
+                    add_artist(name.strip(), country.strip() or None, genre.strip() or None)
+                    st.success("Artist added.")
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Error: {e}")
+    conn.close()
+
+    st.subheader("✏️ Update Artist")
+    artists = fetch_all("Artists")
+    if artists:
+        choice = st.selectbox("Select Artist", options=[(a["artist_id"], a["name"]) for a in artists], format_func=lambda x: x[1])
+        artist_id = choice[0]
+        orig = [a for a in artists if a["artist_id"] == artist_id][0]
+        with st.form("update_artist"):
+            new_name = st.text_input("Name", value=orig["name"])
+            new_country = st.text_input("Country", value=orig["country"] or "")
+            new_genre = st.text_input("Genre", value=orig["genre"] or "")
+            if st.form_submit_button("Update"):
+                update_artist(artist_id, new_name.strip(), new_country.strip() or None, new_genre.strip() or None)
+                st.success("Updated.")
+                st.rerun()
+
+    st.subheader("🗑️ Delete Artist")
+    artists = fetch_all("Artists")
+    if artists:
+        del_choice = st.selectbox("Delete Artist", options=[(a["artist_id"], a["name"]) for a in artists], format_func=lambda x: x[1])
+        if st.button("Delete Selected Artist"):
+            delete_artist(del_choice[0])
+            st.success("Deleted.")
+            st.rerun()
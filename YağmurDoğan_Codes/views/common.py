@@ -0,0 +1,5 @@
+import streamlit as st
+
+# ---------------- UI HELPERS ----------------
+def warn_similar(matches):
+    st.warning("Possible duplicates: " + ", ".join(f"{m['name']} (#{m['id']}, {m['score']:.0%})" for m in matches))
@@ -0,0 +1,46 @@
+import streamlit as st
+import maintenance
+from db import fetch_all, get_all_playlists, get_conn
+
+# ------- Dashboard -------
+def render():
+    st.header("Dashboard")
+    cols = st.columns(5)
+    with cols[0]:
+        st.metric("Artists", len(fetch_all("Artists")))
+    with cols[1]:
+        st.metric("Albums", len(fetch_all("Albums")))
+    with cols[2]:
+        st.metric("Tracks", len(fetch_all("Tracks")))
+    with cols[3]:
+        st.metric("Users", len(fetch_all("Users")))
+    with cols[4]:
+        st.metric("Playlists", len(get_all_playlists()))
+
+    st.subheader("Database Health")
+    conn = get_conn()
+    stats = maintenance.db_stats(conn)
+    runs = maintenance.last_runs(conn)
+    conn.close()
+    cols = st.columns(4)
+    with cols[0]:
+        st.metric("File Size", f"{stats['file_size'] / 1024:.0f} KB")
+    with cols[1]:
+        st.metric("Free Pages", f"{stats['free_pages']} / {stats['page_count']}")
+    with cols[2]:
+        st.metric("Free-Page Ratio", f"{stats['free_ratio']:.1%}")
+    with cols[3]:
+        st.metric("Auto Vacuum", stats["auto_vacuum"])
+    if stats["auto_vacuum"] != "incremental":
+        st.warning("auto_vacuum is not incremental, so incremental_vacuum never shrinks the file. "
+                   "Run `python maintenance.py enable-incremental-vacuum` once (it rewrites the whole database).")
+    if runs:
+        st.table([dict(r) for r in runs])
+    else:
+        st.info("No maintenance has run yet.")
+    task = st.selectbox("Maintenance Task", list(maintenance.TASKS))
+    if st.button("Run Now"):
+        conn = get_conn()
+        status, detail = maintenance.run_task(conn, task)
+        conn.close()
+        {"ok": st.success, "skipped": st.warning}.get(status, st.error)(f"{task}: {detail}")
@@ -0,0 +1,28 @@
+import streamlit as st
+from db import get_duplicate_report, merge_duplicates
+
+# ------- DUPLICATES (fuzzy report + merge) -------
+def render():
+    st.header("Duplicates — Report / Merge")
+    kind = st.selectbox("Entity", ["artist", "album", "track"], format_func=lambda x: x.title() + "s")
+    # the report compares every name against the index, so it only runs on request and is
+    # kept in the session (per entity) across reruns
+    reports = st.session_state.setdefault("duplicate_reports", {})
+    if st.button("Find Duplicates"):
+        reports[kind] = get_duplicate_report(kind)
+    report = reports.get(kind)
+    if report is None:
+        st.info("Press Find Duplicates to build the report.")
+        return
+    if not report:
+        st.info("No likely duplicates found.")
+    for i, cluster in enumerate(report):
+        cols = st.columns([4, 1])
+        with cols[0]:
+            st.write(" | ".join(f"{n} (#{c})" for n, c in zip(cluster["names"], cluster["ids"])))
+        with cols[1]:
+            if st.button(f"Merge into #{cluster['keep_id']}", key=f"merge_{kind}_{i}"):
+                moved = merge_duplicates(kind, cluster["keep_id"], cluster["ids"][1:])
+                report.pop(i)
+                st.success(f"Merged, {moved} rows re-pointed.")
+                st.rerun()
@@ -0,0 +1,42 @@
+import streamlit as st
+from db import add_free, delete_free, get_all_free, get_conn, update_free
+
+# ------- FREE USERS (CRUD) -------
+def render():
+    st.header("Free Users — View / Add / Update / Delete")
+    st.dataframe(get_all_free(columnar=True).to_frame(), hide_index=True)
+
+    conn = get_conn()
+    cur = conn.cursor()
+    eligible = cur.execute("SELECT user_id, f_name, l_name FROM Users WHERE user_id NOT IN (SELECT user_id FROM Free)").fetchall()
+    conn.close()
+
+    st.subheader("➕ Add Free")
+    if eligible:
+        with st.form("add_free"):
+            uchoice = st.selectbox("Select User", options=[(e["user_id"], f"{e['f_name']} {e['l_name']}") for e in eligible], format_func=lambda x: x[1])
+            ad_freq = st.number_input("Ad Frequency", min_value=0, max_value=100, value=5)
+            limit = st.number_input("Listening Limit", min_value=0, max_value=10000, value=100)
+            if st.form_submit_button("Add Free"):
+                add_free(uchoice[0], int(ad_freq), int(limit))
+                st.success("Free added.")
+                st.rerun()
+    else:
+        st.info("No eligible users for Free.")
+
+    st.subheader("✏️ Update / Delete Free")
+    frees = get_all_free()
+    if frees:
+        choice = st.selectbox("Select Free", options=[(f["user_id"], f"{f['f_name']} {f['l_name']}") for f in frees], format_func=lambda x: x[1])
+        sel = [f for f in frees if f["user_id"] == choice[0]][0]
+        with st.form("update_free"):
+            new_ad = st.number_input("Ad Frequency", min_value=0, max_value=100, value=sel["ad_frequency"])
+            new_limit = st.number_input("Listening Limit", min_value=0, max_value=10000, value=sel["listening_limit"])
+            if st.form_submit_button("Update Free"):
+                update_free(choice[0], int(new_ad), int(new_limit))
+                st.success("Updated.")
+                st.rerun()
+        if st.button("Delete Free"):
+            delete_free(choice[0])
+            st.success("Deleted.")
+            st.rerun()
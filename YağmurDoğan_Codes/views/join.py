@@ -0,0 +1,11 @@
+import streamlit as st
+from db import join_tracks_albums_artists
+
+# ------- JOIN: Tracks + Albums + Artists -------
+def render():
+    st.header("JOIN: Tracks — Albums — Artists")
+    rows = join_tracks_albums_artists(columnar=True)
+    if rows:
+        st.dataframe(rows.to_frame(), hide_index=True)
+    else:
+        st.info("No data available.")
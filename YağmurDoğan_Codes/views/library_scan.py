@@ -0,0 +1,28 @@
+import streamlit as st
+import scanner
+
+# ------- LIBRARY SCAN -------
+def render():
+    st.header("Library Scan — Import Tracks from Audio Files")
+    st.caption("WAV files are read with the standard library; MP3/FLAC/OGG/M4A need the optional 'mutagen' package"
+               + ("" if scanner.mutagen else " (not installed: those files get titles from their folder layout only)") + ".")
+    with st.form("scan_library"):
+        root = st.text_input("Music Folder")
+        prune = st.checkbox("Remove tracks whose files were deleted")
+        if st.form_submit_button("Scan"):
+            if not root.strip():
+                st.error("Folder required.")
+            else:
+                try:
+                    with st.spinner("Scanning..."):
+                        stats = scanner.scan(root.strip(), prune=prune)
+                except OSError as e:
+                    st.error(f"Error: {e}")
+                else:
+                    errors = stats.pop("error_samples")
+                    st.success(f"Scanned {stats['files']} files in {stats['elapsed_seconds']:.1f}s "
+                               f"({stats['files_per_second']:.0f} files/sec).")
+                    st.table([stats])
+                    if errors:
+                        st.warning("Unreadable files:")
+                        st.table([{"path": p, "error": e} for p, e in errors])
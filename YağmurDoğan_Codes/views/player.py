@@ -0,0 +1,49 @@
+import streamlit as st
+from db import get_all_playlists
+from playback import REPEAT_MODES, PlaybackQueue
+
+# ------- PLAYER (streaming playback queue) -------
+def render():
+    st.header("Player — Playback Queue")
+    playlists = get_all_playlists()
+    if not playlists:
+        st.info("Add playlists first.")
+        return
+    pl_choice = st.selectbox("Playlist", options=[(p["playlist_id"], p["playlist_title"]) for p in playlists], format_func=lambda x: x[1])
+
+    # one queue per browser session, kept across reruns. It is closed at the end of every
+    # run, so an idle or abandoned session holds no thread and no connection
+    queue = st.session_state.get("player_queue")
+    if queue is None or queue.playlist_id != pl_choice[0]:
+        queue = st.session_state["player_queue"] = PlaybackQueue(pl_choice[0])
+    try:
+        _controls(queue)
+    finally:
+        queue.close()
+
+def _controls(queue):
+    cols = st.columns(4)
+    with cols[0]:
+        if st.button("⏮ Previous"):
+            queue.previous()
+    with cols[1]:
+        if st.button("⏭ Next"):
+            queue.skip(1)
+    with cols[2]:
+        shuffle = st.toggle("Shuffle", value=queue.order is not None)
+        if shuffle != (queue.order is not None):
+            queue.set_shuffle(shuffle)
+    with cols[3]:
+        queue.set_repeat(st.selectbox("Repeat", REPEAT_MODES, index=REPEAT_MODES.index(queue.repeat)))
+
+    track = queue.current()
+    if track is None:
+        st.info("End of playlist." if queue.index else "This playlist has no tracks.")
+        return
+    st.subheader(f"▶ {track.get('track_title')}")
+    st.caption(f"{track.get('artist_name') or 'Unknown artist'} — {track.get('album_title') or 'Single'} — "
+               f"{track.get('duration_seconds') or 0}s")
+    upcoming = queue.upcoming()
+    if upcoming:
+        st.write("Up next:")
+        st.table(upcoming)
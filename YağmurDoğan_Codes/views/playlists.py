@@ -0,0 +1,62 @@
+import streamlit as st
+from db import add_playlist, add_track_to_playlist, get_all_playlists, get_conn, remove_track_from_playlist
+from library import get_library
+
+LIBRARY_TRACKS = 20   # tracks shown per playlist in a user's library
+
+# ------- PLAYLISTS -------
+def render():
+    st.header("Playlists — View / Create / Manage Tracks")
+    st.dataframe(get_all_playlists(columnar=True).to_frame(), hide_index=True)
+
+    conn = get_conn()
+    cur = conn.cursor()
+    users = cur.execute("SELECT user_id, f_name, l_name FROM Users ORDER BY name_key").fetchall()
+    tracks = cur.execute("SELECT track_id, track_title FROM Tracks ORDER BY title_key").fetchall()
+    conn.close()
+
+    st.subheader("📚 User Library")
+    if users:
+        lib_user = st.selectbox("Library of", options=[(u["user_id"], f"{u['f_name']} {u['l_name']}") for u in users], format_func=lambda x: x[1])
+        shown = 0
+        # one query for all of the user's playlists, drawn as each playlist arrives
+        for p in get_library(lib_user[0], track_limit=LIBRARY_TRACKS):
+            shown += 1
+            with st.expander(f"{p['playlist_title']} — {p['track_count']} tracks"):
+                if p["tracks"]:
+                    st.dataframe(p["tracks"], hide_index=True)
+                    if p["track_count"] > len(p["tracks"]):
+                        st.caption(f"First {len(p['tracks'])} of {p['track_count']} tracks.")
+                else:
+                    st.info("No tracks yet.")
+        if not shown:
+            st.info("This user has no playlists.")
+
+    st.subheader("➕ Create Playlist")
+    if users:
+        with st.form("create_playlist"):
+            title = st.text_input("Playlist Title")
+            user_choice = st.selectbox("User", options=[(u["user_id"], f"{u['f_name']} {u['l_name']}") for u in users], format_func=lambda x: x[1])
+            if st.form_submit_button("Create"):
+                add_playlist(title.strip() or "Untitled", user_choice[0])
+                st.success("Playlist created.")
+                st.rerun()
+    else:
+        st.info("Add users first.")
+
+    st.subheader("➕ Add / Remove Track to Playlist")
+    playlists = get_all_playlists()
+    if playlists and tracks:
+        pl_choice = st.selectbox("Select Playlist", options=[(p["playlist_id"], p["playlist_title"]) for p in playlists], format_func=lambda x: x[1])
+        t_choice = st.selectbox("Select Track", options=[(t["track_id"], t["track_title"]) for t in tracks], format_func=lambda x: x[1])
+        pos = st.number_input("Position", min_value=1, max_value=1000, value=1)
+        if st.button("Add Track to Playlist"):
+            add_track_to_playlist(pl_choice[0], t_choice[0], pos)
+            st.success("Added.")
+            st.rerun()
+        if st.button("Remove Track from Playlist"):
+            remove_track_from_playlist(pl_choice[0], t_choice[0])
+            st.success("Removed.")
+            st.rerun()
+    else:
+        st.info("Add playlists and tracks first.")
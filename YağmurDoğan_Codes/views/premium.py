@@ -0,0 +1,71 @@
+from datetime import datetime
+import streamlit as st
+import tiers
+from db import add_premium, delete_premium, get_all_premium, get_conn, update_premium
+
+# ------- PREMIUM USERS (CRUD) -------
+def render():
+    st.header("Premium Users — View / Add / Update / Delete")
+    st.dataframe(get_all_premium(columnar=True).to_frame(), hide_index=True)
+
+    conn = get_conn()
+    cur = conn.cursor()
+    # eligible users for Premium (not already Premium)
+    eligible = cur.execute("SELECT user_id, f_name, l_name FROM Users WHERE user_id NOT IN (SELECT user_id FROM Premium)").fetchall()
+    conn.close()
+
+    st.subheader("➕ Add Premium")
+    if eligible:
+        with st.form("add_premium"):
+            uchoice = st.selectbox("Select User", options=[(e["user_id"], f"{e['f_name']} {e['l_name']}") for e in eligible], format_func=lambda x: x[1])
+            renewal = st.date_input("Renewal Date")
+            payment = st.selectbox("Payment Method", ["Credit Card", "Debit Card", "PayPal", "Other"])
+            if st.form_submit_button("Add Premium"):
+                add_premium(uchoice[0], str(renewal), payment)
+                st.success("Premium added.")
+                st.rerun()
+    else:
+        st.info("No eligible users for Premium.")
+
+    st.subheader("✏️ Update / Delete Premium")
+    premiums = get_all_premium()
+    if premiums:
+        choice = st.selectbox("Select Premium", options=[(p["user_id"], f"{p['f_name']} {p['l_name']}") for p in premiums], format_func=lambda x: x[1])
+        sel = [p for p in premiums if p["user_id"] == choice[0]][0]
+        with st.form("update_premium"):
+            new_renewal = st.date_input("Renewal Date", value=datetime.fromisoformat(sel["renewal_due"]).date() if sel["renewal_due"] else datetime.utcnow().date())
+            new_payment = st.selectbox("Payment Method", ["Credit Card", "Debit Card", "PayPal", "Other"])
+            if st.form_submit_button("Update Premium"):
+                update_premium(choice[0], str(new_renewal), new_payment)
+                st.success("Updated.")
+                st.rerun()
+        if st.button("Delete Premium"):
+            delete_premium(choice[0])
+            st.success("Deleted.")
+            st.rerun()
+
+    st.subheader("🔁 Batch Renewals / Tier Changes")
+    conn = get_conn()
+    with st.form("renew_due"):
+        as_of = st.date_input("Renew everything due on or before")
+        if st.form_submit_button("Run Renewals"):
+            result = tiers.renew_due(conn, as_of)
+            st.success(f"Renewed {result['processed']} users ({result['rows_per_second']:.0f} rows/s).")
+    unparsed = tiers.unparsed_renewals(conn)
+    if unparsed:
+        st.warning(f"{len(unparsed)} renewal dates could not be read and are never renewed: "
+                   + ", ".join(f"#{r['user_id']} '{r['renewal_date']}'" for r in unparsed[:10]))
+    frees = conn.execute("SELECT f.user_id, u.f_name, u.l_name FROM Free f JOIN Users u ON f.user_id = u.user_id").fetchall()
+    premiums = conn.execute("SELECT p.user_id, u.f_name, u.l_name FROM Premium p JOIN Users u ON p.user_id = u.user_id").fetchall()
+    with st.form("upgrade_users"):
+        up = st.multiselect("Move Free users to Premium", options=[(f["user_id"], f"{f['f_name']} {f['l_name']}") for f in frees], format_func=lambda x: x[1])
+        up_all = st.checkbox("All Free users")
+        if st.form_submit_button("Upgrade"):
+            result = tiers.upgrade_to_premium(conn, None if up_all else [u[0] for u in up])
+            st.success(f"Moved {result['processed']} users to Premium.")
+    with st.form("downgrade_users"):
+        down = st.multiselect("Move Premium users to Free", options=[(p["user_id"], f"{p['f_name']} {p['l_name']}") for p in premiums], format_func=lambda x: x[1])
+        if st.form_submit_button("Downgrade"):
+            result = tiers.downgrade_to_free(conn, [u[0] for u in down])
+            st.success(f"Moved {result['processed']} users to Free.")
+    conn.close()
@@ -0,0 +1,63 @@
+import streamlit as st
+from db import add_track_mood, delete_track_mood, find_tracks_by_moods, get_all_track_moods, get_conn, get_moods, update_track_mood
+
+# ------- TRACK MOODS (CRUD) -------
+def render():
+    st.header("Track Moods — Add / Update / Delete")
+    st.dataframe(get_all_track_moods(columnar=True).to_frame(), hide_index=True)
+
+    conn = get_conn()
+    cur = conn.cursor()
+    tracks = cur.execute("SELECT track_id, track_title FROM Tracks ORDER BY title_key").fetchall()
+    conn.close()
+
+    st.subheader("🔎 Find Tracks by Mood")
+    moods = get_moods()
+    if moods:
+        st.caption("Moods: " + ", ".join(m["name"] for m in moods))
+    query = st.text_input("Mood query", placeholder="Dark AND Hypnotic NOT Aggressive")
+    if query.strip():
+        try:
+            total, found = find_tracks_by_moods(query, columnar=True)
+        except ValueError as e:
+            st.error(f"Invalid query: {e}")
+        else:
+            st.write(f"{total} matching tracks" + (f", first {len(found)} shown" if total > len(found) else ""))
+            if found:
+                st.dataframe(found.to_frame(), hide_index=True)
+
+    st.subheader("➕ Add Mood")
+    if tracks:
+        with st.form("add_mood"):
+            track_choice = st.selectbox("Track", options=[(t["track_id"], t["track_title"]) for t in tracks], format_func=lambda x: x[1])
+            mood = st.text_input("Mood")
+            if st.form_submit_button("Add Mood"):
+                if mood.strip():
+                    add_track_mood(track_choice[0], mood.strip())
+                    st.success("Mood added.")
+                    st.rerun()
+                else:
+                    st.error("Mood required.")
+    else:
+        st.info("Add a track first.")
+
+    st.subheader("✏️ Update Mood")
+    moods = get_all_track_moods()
+    if moods:
+        up_choice = st.selectbox("Select Mood", options=[(m["mood_id"], f"{m['track_title']} — {m['mood']}") for m in moods], format_func=lambda x: x[1])
+        sel = [m for m in moods if m["mood_id"] == up_choice[0]][0]
+        with st.form("update_mood"):
+            new_mood = st.text_input("New Mood", value=sel["mood"])
+            if st.form_submit_button("Update Mood"):
+                update_track_mood(up_choice[0], new_mood.strip() or sel["mood"])
+                st.success("Updated.")
+                st.rerun()
+
+    st.subheader("🗑️ Delete Mood")
+    moods = get_all_track_moods()
+    if moods:
+        del_choice = st.selectbox("Delete Mood", options=[(m["mood_id"], f"{m['track_title']} — {m['mood']}") for m in moods], format_func=lambda x: x[1])
+        if st.button("Delete Selected Mood"):
+            delete_track_mood(del_choice[0])
+            st.success("Deleted.")
+            st.rerun()
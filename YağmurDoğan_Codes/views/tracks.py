@@ -0,0 +1,54 @@
+import streamlit as st
+from db import add_track, delete_track, fetch_all, find_similar, get_conn, update_track
+from views.common import warn_similar
+
+# ------- TRACKS (CRUD) -------
+def render():
+    st.header("Tracks — Add / Update / Delete")
+    st.dataframe(fetch_all("Tracks", columnar=True).to_frame(), hide_index=True)
+
+    conn = get_conn()
+    cur = conn.cursor()
+    albums = cur.execute("SELECT album_id, title FROM Albums ORDER BY title_key").fetchall()
+
+    st.subheader("➕ Add Track")
+    with st.form("add_track"):
+        title = st.text_input("Title")
+        duration = st.number_input("Duration (seconds)", min_value=1, max_value=10000, value=180)
+        album_choice = st.selectbox("Album (or None)", options=[(None, "— None / Single —")] + [(a["album_id"], a["title"]) for a in albums], format_func=lambda x: x[1])
+        genre = st.text_input("Genre")
+        force = st.checkbox("Add even if a similar track exists")
+        if st.form_submit_button("Add Track"):
+            similar = find_similar("track", title.strip() or "Untitled", album_choice[0])
+            if similar and not force:
+                warn_similar(similar)
+            else:
+                add_track(title.strip() or "Untitled", int(duration), album_choice[0], genre.strip() or None)
+                st.success("Track added.")
+                st.rerun()
+    conn.close()
+
+    st.subheader("✏️ Update Track")
+    tracks = fetch_all("Tracks")
+    if tracks:
+        sel = st.selectbox("Select Track", options=[(t["track_id"], t["track_title"]) for t in tracks], format_func=lambda x: x[1])
+        track = [t for t in tracks if t["track_id"] == sel[0]][0]
+        with st.form("update_track"):
+            new_title = st.text_input("Title", value=track["track_title"])
+            new_dur = st.number_input("Duration (seconds)", min_value=1, max_value=10000, value=track["duration_seconds"] or 180)
+            albums = fetch_all("Albums")
+            album_choice = st.selectbox("Album", options=[(None, "— None —")] + [(a["album_id"], a["title"]) for a in albums], format_func=lambda x: x[1])
+            new_genre = st.text_input("Genre", value=track["track_genre"] or "")
+            if st.form_submit_button("Update Track"):
+                update_track(track["track_id"], new_title.strip(), int(new_dur), album_choice[0], new_genre.strip() or None)
+                st.success("Updated.")
+                st.rerun()
+
+    st.subheader("🗑️ Delete Track")
+    tracks = fetch_all("Tracks")
+    if tracks:
+        del_choice = st.selectbox("Delete Track", options=[(t["track_id"], t["track_title"]) for t in tracks], format_func=lambda x: x[1])
+        if st.button("Delete Selected Track"):
+            delete_track(del_choice[0])
+            st.success("Deleted.")
+            st.rerun()
@@ -0,0 +1,47 @@
+import streamlit as st
+from db import add_user, delete_user, get_all_users, get_conn, update_user
+
+# ------- USERS (CRUD) -------
+def render():
+    st.header("Users — Add / Update / Delete")
+    st.dataframe(get_all_users(columnar=True).to_frame(), hide_index=True)
+
+    conn = get_conn()
+    cur = conn.cursor()
+
+    st.subheader("➕ Add User")
+    with st.form("add_user"):
+        fn = st.text_input("First Name")
+        ln = st.text_input("Last Name")
+        em = st.text_input("Email")
+        if st.form_submit_button("Add User"):
+            if not fn.strip():
+                st.error("First name required.")
+            else:
+                add_user(fn.strip(), ln.strip() or None, em.strip() or None)
+                st.success("User added.")
+                st.rerun()
+
+    st.subheader("✏️ Update User")
+    users = get_all_users()
+    if users:
+        sel = st.selectbox("Select User", options=[(u["user_id"], f"{u['f_name']} {u['l_name'] or ''}") for u in users], format_func=lambda x: x[1])
+        u = [x for x in users if x["user_id"] == sel[0]][0]
+        with st.form("update_user"):
+            new_fn = st.text_input("First Name", value=u["f_name"])
+            new_ln = st.text_input("Last Name", value=u["l_name"] or "")
+            new_em = st.text_input("Email", value=u["email"] or "")
+            if st.form_submit_button("Update User"):
+                update_user(u["user_id"], new_fn.strip(), new_ln.strip() or None, new_em.strip() or None)
+                st.success("Updated.")
+                st.rerun()
+
+    st.subheader("🗑️ Delete User")
+    users = get_all_users()
+    if users:
+        del_choice = st.selectbox("Delete User", options=[(u["user_id"], f"{u['f_name']} {u['l_name'] or ''}") for u in users], format_func=lambda x: x[1])
+        if st.button("Delete Selected User"):
+            delete_user(del_choice[0])
+            st.success("Deleted.")
+            st.rerun()
+    conn.close()